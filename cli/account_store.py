@@ -0,0 +1,190 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from cli import config
+
+ACCOUNT_STORE_ENV = "GHMULTI_ACCOUNT_STORE"
+ACCOUNT_DB_ENV = "GHMULTI_ACCOUNT_DB"
+STORE_BACKENDS = ("json", "sqlite")
+OPTIONAL_FIELDS = ("gpg_key_id", "ssh_key_path")
+
+# `position` keeps `ghmulti list` in the order the JSON file would have had.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    name TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    gpg_key_id TEXT,
+    ssh_key_path TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS accounts_by_username ON accounts (username);
+CREATE INDEX IF NOT EXISTS accounts_by_position ON accounts (position);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS rules (
+    pattern TEXT NOT NULL,
+    account TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+"""
+SCHEMA_VERSION = 1
+_COLUMNS = "name, username, gpg_key_id, ssh_key_path, position"
+
+
+def account_store_path() -> Path:
+    override = os.environ.get(ACCOUNT_DB_ENV)
+    if override:
+        return Path(override)
+    config_path = Path(config.CONFIG_PATH)
+    return config_path.with_name(f"{config_path.stem}.sqlite3")
+
+
+def account_store_backend() -> str:
+    """The backend forced by GHMULTI_ACCOUNT_STORE, else "sqlite" once a database exists (i.e. after migrating)."""
+    forced = os.environ.get(ACCOUNT_STORE_ENV, "").strip().lower()
+    if forced in STORE_BACKENDS:
+        return forced
+    return "sqlite" if account_store_path().exists() else "json"
+
+
+def _row(account: dict[str, Any], position: int) -> tuple:
+    return (account["name"], account["username"], *(account.get(key) for key in OPTIONAL_FIELDS), position)
+
+
+def _account(row: tuple) -> dict[str, Any]:
+    account = {"name": row[0], "username": row[1]}
+    for key, value in zip(OPTIONAL_FIELDS, row[2:4]):
+        if value:
+            account[key] = value
+    return account
+
+
+class AccountStore:
+    """Accounts in SQLite, indexed by name and username; every write is one transaction."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or account_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=5)
+        # A rollback journal (not WAL) so each commit touches the database file itself,
+        # which is what the stat-based config cache watches.
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Only a new (or pre-versioning) database pays for the schema script.
+            self._connection.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "AccountStore":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def load(self) -> dict[str, Any]:
+        rows = self._connection.execute(f"SELECT {_COLUMNS} FROM accounts ORDER BY position").fetchall()
+        data = {"accounts": [_account(row) for row in rows], "active": self.active()}
+        rules = self.rules()
+        if rules:
+            data["rules"] = rules
+        return data
+
+    def active(self) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM settings WHERE key = 'active'").fetchone()
+        return row[0] if row else None
+
+    def get(self, name: str) -> Optional[dict[str, Any]]:
+        row = self._connection.execute(f"SELECT {_COLUMNS} FROM accounts WHERE name = ?", (name,)).fetchone()
+        return _account(row) if row else None
+
+    def get_by_username(self, username: str) -> Optional[dict[str, Any]]:
+        row = self._connection.execute(
+            f"SELECT {_COLUMNS} FROM accounts WHERE username = ? ORDER BY position LIMIT 1", (username,)
+        ).fetchone()
+        return _account(row) if row else None
+
+    def rules(self) -> list[dict[str, str]]:
+        rows = self._connection.execute("SELECT pattern, account FROM rules ORDER BY position").fetchall()
+        return [{"pattern": pattern, "account": account} for pattern, account in rows]
+
+    def count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+    def replace(self, data: dict[str, Any]) -> None:
+        """Make the store equal to a normalized config, writing only the rows that differ."""
+        existing = {row[0]: row for row in self._connection.execute(f"SELECT {_COLUMNS} FROM accounts")}
+        wanted = {account["name"]: _row(account, position) for position, account in enumerate(data["accounts"])}
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM accounts WHERE name = ?", [(name,) for name in existing.keys() - wanted.keys()]
+            )
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO accounts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                [row for name, row in wanted.items() if existing.get(name) != row]
+            )
+            self._set_active(data.get("active"))
+            # Rules are few and ordered, so they are rewritten as a whole when anything about them changed.
+            rules = data.get("rules", [])
+            if rules != self.rules():
+                self._connection.execute("DELETE FROM rules")
+                self._connection.executemany(
+                    "INSERT INTO rules (pattern, account, position) VALUES (?, ?, ?)",
+                    [(rule["pattern"], rule["account"], position) for position, rule in enumerate(rules)]
+                )
+
+    def _set_active(self, name: Optional[str]) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('active', ?)", (name,)
+        )
+
+
+def open_account_store() -> Optional[AccountStore]:
+    """The SQLite store when it is the configured backend; None means accounts live in the JSON file."""
+    if account_store_backend() != "sqlite":
+        return None
+    return AccountStore()
+
+
+def migrate_account_store(target: str) -> dict[str, Any]:
+    """Copy accounts into `target` ("json" or "sqlite") and retire the other file so the new backend is picked up.
+
+    Holds the config lock from read to rename, so a concurrent `add` or `use` lands before or after, never in between.
+    """
+    if target not in STORE_BACKENDS:
+        raise ValueError(f"Unknown account store '{target}'.")
+    json_path = Path(config.CONFIG_PATH)
+    db_path = account_store_path()
+
+    with config._config_lock():
+        source = account_store_backend()
+        data = config.load_config()
+        if target == "sqlite":
+            names = [account["name"] for account in data["accounts"]]
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            if duplicates:
+                # `name` is the table's primary key, so all but one of each would be dropped.
+                raise ValueError(f"Duplicate account names: {', '.join(duplicates)}. Rename or remove them first.")
+            with AccountStore(db_path) as store:
+                store.replace(data)
+            retired = json_path
+        else:
+            config.save_json_config(data)
+            retired = db_path
+
+        backup = retired.with_name(f"{retired.name}.migrated")
+        if source != target and retired.exists():
+            os.replace(retired, backup)
+        else:
+            backup = None
+    return {
+        "from": source,
+        "to": target,
+        "accounts": len(data["accounts"]),
+        "path": str(db_path if target == "sqlite" else json_path),
+        "backup": str(backup) if backup else None,
+    }
@@ -0,0 +1,93 @@
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+
+def _clean(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+class Account:
+    """One configured identity; `to_dict()` is exactly what `~/.ghmulti.json` and `--json` output hold."""
+
+    __slots__ = ("name", "username", "gpg_key_id", "ssh_key_path")
+
+    def __init__(self, name: str, username: str, gpg_key_id: Optional[str] = None, ssh_key_path: Optional[str] = None):
+        self.name = name
+        self.username = username
+        self.gpg_key_id = gpg_key_id
+        self.ssh_key_path = ssh_key_path
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> Optional["Account"]:
+        """Normalize one stored account; None when it lacks a usable name or username."""
+        if not isinstance(raw, dict):
+            return None
+        name = _clean(raw.get("name"))
+        username = _clean(raw.get("username"))
+        if name is None or username is None:
+            return None
+        return cls(name, username, _clean(raw.get("gpg_key_id")), _clean(raw.get("ssh_key_path")))
+
+    def to_dict(self) -> dict[str, Any]:
+        account = {"name": self.name, "username": self.username}
+        if self.gpg_key_id:
+            account["gpg_key_id"] = self.gpg_key_id
+        if self.ssh_key_path:
+            account["ssh_key_path"] = self.ssh_key_path
+        return account
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Account):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Account(name={self.name!r}, username={self.username!r})"
+
+
+class AccountIndex:
+    """Accounts in file order with O(1) lookup by name and username (the first entry wins, as a scan would)."""
+
+    __slots__ = ("accounts", "_by_name", "_by_username")
+
+    def __init__(self, accounts: Iterable[Account] = ()):
+        self.accounts = list(accounts)
+        self._by_name: dict[str, int] = {}
+        self._by_username: dict[str, int] = {}
+        for position, account in enumerate(self.accounts):
+            self._by_name.setdefault(account.name, position)
+            self._by_username.setdefault(account.username, position)
+
+    @classmethod
+    def from_dicts(cls, accounts: Any) -> "AccountIndex":
+        if not isinstance(accounts, list):
+            return cls()
+        return cls(account for account in map(Account.from_dict, accounts) if account is not None)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def __iter__(self) -> Iterator[Account]:
+        return iter(self.accounts)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def position(self, name: str) -> Optional[int]:
+        """Where `name` sits in the account list, so callers can edit the matching config dict in place."""
+        return self._by_name.get(name)
+
+    def by_name(self, name: Optional[str]) -> Optional[Account]:
+        position = self._by_name.get(name) if name else None
+        return self.accounts[position] if position is not None else None
+
+    def by_username(self, username: str) -> Optional[Account]:
+        position = self._by_username.get(username)
+        return self.accounts[position] if position is not None else None
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [account.to_dict() for account in self.accounts]
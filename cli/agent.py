@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from cli import config
+from cli.ipc import RpcError
+from cli.ipc import RpcHandler
+from cli.ipc import RpcUnavailable
+from cli.ipc import call
+
+AGENT_SOCKET_ENV = "GHMULTI_AGENT_SOCKET"
+DISABLE_AGENT_ENV = "GHMULTI_NO_AGENT"
+DEFAULT_IDLE_TIMEOUT_SECONDS = 900.0
+AGENT_PING_TIMEOUT_SECONDS = 0.5
+# A keyring miss inside the agent may wait on an unlock prompt; give the user time to answer it.
+AGENT_TOKEN_TIMEOUT_SECONDS = 60.0
+AGENT_LOCKED = -32001
+
+
+def agent_socket_path() -> Path:
+    override = os.environ.get(AGENT_SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "ghmulti" / "agent.sock"
+    return Path(config.STATE_DIR) / "agent.sock"
+
+
+def query_agent(method: str, params: Optional[dict[str, Any]] = None, timeout: float = AGENT_PING_TIMEOUT_SECONDS) -> Optional[Any]:
+    """Call the running agent; None when there is no agent, it is disabled, or it refused (e.g. locked)."""
+    if os.environ.get(DISABLE_AGENT_ENV):
+        return None
+    socket_path = agent_socket_path()
+    if not socket_path.exists():
+        return None
+    try:
+        return call(socket_path, method, params, timeout=timeout)
+    except (RpcUnavailable, RpcError):
+        return None
+
+
+class TokenAgent:
+    """Holds keyring tokens in memory; each token is dropped after `idle_timeout_seconds` without use."""
+
+    def __init__(
+        self,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.locked = False
+        self.keyring_reads = 0
+        self.stop_callback: Optional[Callable[[], None]] = None
+        self._clock = clock
+        self._tokens: dict[str, tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        stale = [username for username, (_, used_at) in self._tokens.items() if now - used_at >= self.idle_timeout_seconds]
+        for username in stale:
+            del self._tokens[username]
+
+    def sweep(self) -> None:
+        with self._lock:
+            self._expire(self._clock())
+
+    def _read_keyring(self, usernames: list[str]) -> dict[str, Optional[str]]:
+        import keyring
+
+        # Resolve the backend once so a batch costs one backend setup (and at most one unlock prompt).
+        backend = keyring.get_keyring()
+        tokens = {username: backend.get_password(config.KEYRING_SERVICE, username) for username in usernames}
+        self.keyring_reads += len(usernames)
+        return tokens
+
+    def _require_unlocked(self) -> None:
+        if self.locked:
+            raise RpcError(AGENT_LOCKED, "The ghmulti agent is locked.")
+
+    def handle_ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            self._expire(self._clock())
+            cached = len(self._tokens)
+        return {
+            "pid": os.getpid(),
+            "locked": self.locked,
+            "cached_tokens": cached,
+            "idle_timeout_seconds": self.idle_timeout_seconds,
+        }
+
+    def handle_get_token(self, params: dict[str, Any]) -> dict[str, Any]:
+        username = params.get("username")
+        if not isinstance(username, str) or not username:
+            raise RpcError(-32602, "'username' must be a non-empty string.")
+        self._require_unlocked()
+
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._tokens.get(username)
+            if entry is not None:
+                self._tokens[username] = (entry[0], now)
+                return {"token": entry[0], "cached": True}
+
+        token = self._read_keyring([username])[username]
+        with self._lock:
+            if not self.locked:
+                self._tokens[username] = (token, self._clock())
+        return {"token": token, "cached": False}
+
+    def handle_preload(self, params: dict[str, Any]) -> dict[str, Any]:
+        self._require_unlocked()
+        usernames = params.get("usernames")
+        if usernames is None:
+            usernames = [account["username"] for account in config.get_accounts()]
+        if not isinstance(usernames, list) or not all(isinstance(name, str) for name in usernames):
+            raise RpcError(-32602, "'usernames' must be a list of strings.")
+
+        tokens = self._read_keyring(usernames)
+        now = self._clock()
+        with self._lock:
+            if not self.locked:
+                for username, token in tokens.items():
+                    self._tokens[username] = (token, now)
+        return {"loaded": sorted(username for username, token in tokens.items() if token)}
+
+    def handle_forget(self, params: dict[str, Any]) -> dict[str, Any]:
+        username = params.get("username")
+        with self._lock:
+            removed = self._tokens.pop(username, None) is not None
+        return {"forgotten": removed}
+
+    def handle_flush(self, params: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            flushed = len(self._tokens)
+            self._tokens.clear()
+        return {"flushed": flushed}
+
+    def handle_lock(self, params: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            self.locked = True
+            self._tokens.clear()
+        return {"locked": True}
+
+    def handle_unlock(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.locked = False
+        return {"locked": False}
+
+    def handle_shutdown(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.handle_flush({})
+        if self.stop_callback:
+            self.stop_callback()
+        return {"stopping": True}
+
+    def handlers(self) -> dict[str, RpcHandler]:
+        return {
+            "ping": self.handle_ping,
+            "get_token": self.handle_get_token,
+            "preload": self.handle_preload,
+            "forget": self.handle_forget,
+            "flush": self.handle_flush,
+            "lock": self.handle_lock,
+            "unlock": self.handle_unlock,
+            "shutdown": self.handle_shutdown,
+        }
+
+
+def agent_token(username: str) -> tuple[bool, Optional[str]]:
+    """(answered, token) from the agent; answered is False when the caller should read the keyring itself."""
+    answer = query_agent("get_token", {"username": username}, timeout=AGENT_TOKEN_TIMEOUT_SECONDS)
+    if not isinstance(answer, dict):
+        return False, None
+    return True, answer.get("token")
+
+
+def forget_agent_token(username: str) -> None:
+    query_agent("forget", {"username": username})
@@ -1,59 +1,83 @@
+import importlib
+from typing import Optional
+
 import click
-from .list import list_accounts
-from .add import add_account
-from .use import use_account
-from .push import push
-from .remote import remote
-from .pull import pull_repo
-from .list_remote import list_remotes
-from .check_remote import check_remote
-from .link import link_account
-from .status import status
-from .clone import clone_repo
-from .remove import remove_account
-from .rename import rename_account
-from .update import update_account
-from .doctor import doctor
-from .unlink import unlink_account
-
-@click.group()
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a subcommand's module only when it is resolved."""
+
+    def __init__(self, *args, lazy_subcommands: Optional[dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps command name to "module.path:attribute".
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name):
+        module_name, attribute = self.lazy_subcommands[cmd_name].rsplit(":", 1)
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy command '{cmd_name}' did not resolve to a click command.")
+        return command
+
+
+# account subcommands mirror top-level commands for discoverability.
+ACCOUNT_SUBCOMMANDS = {
+    "add": "cli.commands.add:add_account",
+    "list": "cli.commands.list:list_accounts",
+    "use": "cli.commands.use:use_account",
+    "update": "cli.commands.update:update_account",
+    "remove": "cli.commands.remove:remove_account",
+    "rename": "cli.commands.rename:rename_account",
+}
+
+SUBCOMMANDS = {
+    **ACCOUNT_SUBCOMMANDS,
+    "push": "cli.commands.push:push",
+    "remote": "cli.commands.remote:remote",
+    "pull": "cli.commands.pull:pull_repo",
+    "list-remote": "cli.commands.list_remote:list_remotes",
+    "check-remote": "cli.commands.check_remote:check_remote",
+    "link": "cli.commands.link:link_account",
+    "status": "cli.commands.status:status",
+    "clone": "cli.commands.clone:clone_repo",
+    "doctor": "cli.commands.doctor:doctor",
+    "unlink": "cli.commands.unlink:unlink_account",
+    "serve": "cli.commands.serve:serve",
+    "whoami": "cli.commands.whoami:whoami",
+    "scan": "cli.commands.scan:scan",
+    "repos": "cli.commands.repos:list_repos",
+    "sync": "cli.commands.sync:sync",
+    "credential": "cli.commands.credential:credential",
+    "agent": "cli.commands.agent:agent",
+    "migrate-store": "cli.commands.migrate_store:migrate_store",
+    "identity": "cli.commands.identity:identity",
+    "rule": "cli.commands.rule:rule",
+    "which": "cli.commands.which:which",
+}
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 def cli():
     """ghmulti CLI – Manage multiple GitHub accounts."""
     pass
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=ACCOUNT_SUBCOMMANDS)
 def account():
     """Account management shortcuts."""
     pass
 
 
-# account subcommands mirror top-level commands for discoverability.
-account.add_command(add_account, name="add")
-account.add_command(list_accounts, name="list")
-account.add_command(use_account, name="use")
-account.add_command(update_account, name="update")
-account.add_command(remove_account, name="remove")
-account.add_command(rename_account, name="rename")
-
-# Add subcommands
-cli.add_command(add_account)
-cli.add_command(list_accounts)
-cli.add_command(use_account)
-cli.add_command(push, name="push")
-cli.add_command(remote, name="remote")
-cli.add_command(pull_repo)
-cli.add_command(list_remotes)
-cli.add_command(check_remote)
-cli.add_command(link_account)
-cli.add_command(status)
-cli.add_command(clone_repo)
-cli.add_command(remove_account)
-cli.add_command(rename_account)
-cli.add_command(update_account)
-cli.add_command(doctor)
 cli.add_command(account)
-cli.add_command(unlink_account)
+
 
 if __name__ == "__main__":
     cli()
@@ -1,7 +1,10 @@
 import click
-from cli.config import load_config
-from cli.config import save_config
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
+from cli.config import get_account_by_name
 from cli.config import set_token
+from cli.identity import sync_identities
 
 
 @click.command(name="add")
@@ -47,10 +50,8 @@ def add_account(name, username, token, gpg_key_id, ssh_key_path, set_active):
     if not token and not ssh_key_path:
         raise click.ClickException("Either a Personal Access Token or an SSH Key Path is required.")
 
-    config = load_config()
-
     # Check if account with same name exists
-    if any(a["name"] == name for a in config["accounts"]):
+    if get_account_by_name(name):
         click.echo(f"❌ Account '{name}' already exists.")
         return
 
@@ -63,16 +64,22 @@ def add_account(name, username, token, gpg_key_id, ssh_key_path, set_active):
     if ssh_key_path:
         new_account["ssh_key_path"] = ssh_key_path
 
-    config["accounts"].append(new_account)
+    with config_transaction() as config:
+        # Re-check under the lock: another process may have added it meanwhile.
+        if name in AccountIndex.from_dicts(config["accounts"]):
+            click.echo(f"❌ Account '{name}' already exists.")
+            return
+
+        config["accounts"].append(new_account)
+        if set_active or not config.get("active"):
+            config["active"] = name
+        with include_mode_errors("write the identity fragment"):
+            sync_identities(config["accounts"], config.get("active"))
 
+    # Only once the account is really ours; a concurrent add must not have its token overwritten.
     if token:
         set_token(username, token)
 
-    if set_active or not config.get("active"):
-        config["active"] = name
-
-    save_config(config)
-
     click.echo(f"✅ Added account '{name}' and saved.")
     if token:
         click.echo("🔐 Token saved to keyring.")
@@ -0,0 +1,97 @@
+import json
+import threading
+from pathlib import Path
+
+import click
+
+from cli.agent import DEFAULT_IDLE_TIMEOUT_SECONDS
+from cli.agent import TokenAgent
+from cli.agent import agent_socket_path
+from cli.ipc import RpcError
+from cli.ipc import RpcUnavailable
+from cli.ipc import call
+from cli.ipc import create_server
+
+# Client actions and the agent method each one calls.
+AGENT_ACTIONS = {
+    "stop": "shutdown",
+    "status": "ping",
+    "preload": "preload",
+    "flush": "flush",
+    "lock": "lock",
+    "unlock": "unlock",
+}
+
+
+def _run_agent(path: Path, idle_timeout: float) -> None:
+    agent = TokenAgent(idle_timeout_seconds=idle_timeout)
+    try:
+        server = create_server(path, agent.handlers())
+    except (RuntimeError, OSError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    agent.stop_callback = server.request_shutdown
+
+    stopped = threading.Event()
+
+    def sweep() -> None:
+        # Drop idle tokens from memory even when nobody asks for them.
+        while not stopped.wait(min(30.0, max(1.0, idle_timeout / 4))):
+            agent.sweep()
+
+    threading.Thread(target=sweep, daemon=True).start()
+    click.echo(f"🔐 ghmulti agent listening on {path} (idle timeout {idle_timeout:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        agent.handle_flush({})
+        server.server_close()
+    click.echo("👋 ghmulti agent stopped.")
+
+
+@click.command(name="agent")
+@click.argument("action", required=False, type=click.Choice(sorted(AGENT_ACTIONS)))
+@click.option("--socket", "socket_path", default=None, help="Unix socket path (default: per-user runtime directory).")
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=1),
+    default=DEFAULT_IDLE_TIMEOUT_SECONDS,
+    show_default=True,
+    help="Forget a token after this many seconds without use."
+)
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def agent(action, socket_path, idle_timeout, json_output):
+    """Keep account tokens in memory so commands skip the keyring.
+
+    Without ACTION, run the agent in the foreground. `preload` loads every account's token,
+    `flush` forgets them, `lock` forgets them and refuses to cache until `unlock`.
+    """
+    path = Path(socket_path) if socket_path else agent_socket_path()
+    if action is None:
+        _run_agent(path, idle_timeout)
+        return
+
+    try:
+        result = call(path, AGENT_ACTIONS[action], timeout=60.0 if action == "preload" else 2.0)
+    except RpcUnavailable as exc:
+        raise click.ClickException(f"No ghmulti agent is listening on {path}.") from exc
+    except RpcError as exc:
+        raise click.ClickException(exc.message) from exc
+
+    if json_output:
+        click.echo(json.dumps(result, indent=2))
+    elif action == "stop":
+        click.echo(f"✅ Stopped ghmulti agent on {path}.")
+    elif action == "status":
+        state = "locked" if result["locked"] else f"{result['cached_tokens']} token(s) cached"
+        click.echo(f"🔐 ghmulti agent (pid {result['pid']}) on {path}: {state}.")
+    elif action == "preload":
+        click.echo(f"✅ Loaded {len(result['loaded'])} token(s): {', '.join(result['loaded']) or 'none'}.")
+    elif action == "flush":
+        click.echo(f"🧹 Forgot {result['flushed']} cached token(s).")
+    elif action == "lock":
+        click.echo("🔒 Agent locked; tokens forgotten until `ghmulti agent unlock`.")
+    else:
+        click.echo("🔓 Agent unlocked.")
@@ -1,58 +1,88 @@
-import re
-import subprocess
+import json
 
 import click
 
+from cli.config import get_active_account
+from cli.config import get_token
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import is_git_repository
+from cli.remote_probe import DEFAULT_CONNECT_TIMEOUT_SECONDS
+from cli.remote_probe import DEFAULT_PROBE_DEADLINE_SECONDS
+from cli.remote_probe import DEFAULT_PROBES_PER_HOST
+from cli.remote_probe import DEFAULT_PROBE_WORKERS
+from cli.remote_probe import RemoteProbe
+from cli.remote_probe import probe_remotes
 
-def _parse_remotes() -> dict[str, str]:
+
+def _parse_remotes(repo_path: str = ".") -> dict[str, str]:
+    git_config = GitConfigSnapshot.load(repo_path)
     remotes: dict[str, str] = {}
-    try:
-        output = subprocess.check_output(["git", "remote", "-v"], text=True, stderr=subprocess.PIPE)
-    except subprocess.CalledProcessError as exc:
-        raise click.ClickException(f"Failed to list git remotes: {exc}") from exc
-
-    for line in output.strip().splitlines():
-        match = re.match(r"(\S+)\s+(\S+)\s+\((fetch|push)\)", line.strip())
-        if not match:
-            continue
-        name, url, _ = match.groups()
-        remotes[name] = url
+    for name in git_config.remote_names():
+        url = git_config.get(f"remote.{name}.url")
+        if url:
+            remotes[name] = url
     return remotes
 
 
-def _check_ssh_host(url: str) -> bool:
-    if "@" not in url or ":" not in url:
-        return False
-    host = url.split(":", 1)[0]
-    try:
-        result = subprocess.run(
-            ["ssh", "-T", host],
-            capture_output=True,
-            text=True
-        )
-        # GitHub commonly returns exit code 1 for successful auth without shell access.
-        return result.returncode in (0, 1)
-    except OSError:
-        return False
+def _describe(probe: RemoteProbe) -> str:
+    details = [f"{probe.latency_ms:.0f} ms"] if probe.latency_ms is not None else []
+    if probe.refs is not None:
+        details.append(f"{probe.refs} branches")
+    if probe.cached:
+        details.append("cached")
+    suffix = f" ({', '.join(details)})" if details else ""
+    label = probe.protocol.upper()
+    if probe.protocol in ("ssh", "https"):
+        if probe.reachable and probe.authenticated is not False:
+            return f"✅ {label} reachable{suffix}"
+        if probe.reachable:
+            return f"❌ {label} authentication failed{suffix}: {probe.message}"
+        return f"❌ {label} check failed: {probe.message}"
+    if probe.protocol == "http":
+        return "⚠️ Insecure HTTP configured"
+    return "❓ Unknown protocol"
 
 
 @click.command("check-remote")
-def check_remote():
+@click.option("--timeout", "connect_timeout", type=click.IntRange(min=1), default=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+              show_default=True, help="Connection timeout in seconds for each probe.")
+@click.option("--deadline", type=click.FloatRange(min=0.1), default=DEFAULT_PROBE_DEADLINE_SECONDS,
+              show_default=True, help="Overall time limit in seconds.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_PROBE_WORKERS, show_default=True)
+@click.option("--per-host", type=click.IntRange(min=1), default=DEFAULT_PROBES_PER_HOST, show_default=True,
+              help="Maximum concurrent probes against one host.")
+@click.option("--refresh", is_flag=True, help="Probe again even if a cached result is still fresh.")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def check_remote(connect_timeout, deadline, workers, per_host, refresh, json_output):
     """Check connection status for all Git remotes."""
-    click.echo("🔍 Checking connectivity to remotes...\n")
+    if not is_git_repository("."):
+        raise click.ClickException("This does not appear to be a git repository.")
+
     remotes = _parse_remotes()
-    if not remotes:
-        click.echo("ℹ️  No remotes configured.")
+    account = get_active_account()
+    needs_token = account and any(url.lower().startswith("https://") for url in remotes.values())
+    token = get_token(account["username"]) if needs_token else None
+    probes = probe_remotes(
+        remotes,
+        account=account,
+        token=token,
+        connect_timeout=connect_timeout,
+        deadline_seconds=deadline,
+        max_workers=workers,
+        per_host=per_host,
+        refresh=refresh
+    )
+
+    if json_output:
+        click.echo(json.dumps({
+            "account": account["name"] if account else None,
+            "remotes": [probe.to_dict() for probe in probes]
+        }, indent=2))
         return
 
-    for name, url in remotes.items():
-        if url.startswith("https://"):
-            status = "✅ HTTPS configured"
-        elif url.startswith("http://"):
-            status = "⚠️ Insecure HTTP configured"
-        elif url.startswith("git@"):
-            status = "✅ SSH reachable" if _check_ssh_host(url) else "❌ SSH check failed"
-        else:
-            status = "❓ Unknown protocol"
-
-        click.echo(f"• {name} → {url} [{status}]")
+    click.echo("🔍 Checking connectivity to remotes...\n")
+    if not probes:
+        click.echo("ℹ️  No remotes configured.")
+        return
+    for probe in probes:
+        click.echo(f"• {probe.name} → {probe.url} [{_describe(probe)}]")
@@ -2,11 +2,11 @@ import os
 import subprocess
 
 import click
-import inquirer
 
 from cli.config import get_account_by_name
 from cli.config import get_accounts
 from cli.config import get_token
+from cli.config import load_rule_trie
 from cli.git_utils import git_auth_env
 from cli.commands.link import link_account_logic
 
@@ -23,6 +23,8 @@ def _choose_account_interactively(prompt: str) -> str:
     if not accounts:
         raise click.ClickException("No accounts configured. Run `ghmulti add` first.")
 
+    import inquirer
+
     question = [
         inquirer.List(
             "account",
@@ -48,6 +50,15 @@ def clone_repo(repo_url, account_name, should_link):
     if account_name and not account_to_use:
         raise click.ClickException(f"Account '{account_name}' not found in ghmulti config.")
 
+    repo_dir = _derive_repo_directory(repo_url)
+    rule = None if account_name else load_rule_trie().match(os.path.abspath(repo_dir))
+    if rule:
+        account_to_use = get_account_by_name(rule.account)
+        if account_to_use:
+            click.echo(f"ℹ️  Using account '{rule.account}' from directory rule {rule.pattern}")
+        else:
+            rule = None
+
     token = get_token(account_to_use["username"]) if account_to_use else None
     if account_to_use and token:
         click.echo(f"ℹ️  Attempting to clone using token for {account_to_use['username']}")
@@ -58,12 +69,15 @@ def clone_repo(repo_url, account_name, should_link):
     except subprocess.CalledProcessError as exc:
         raise click.ClickException(f"Git clone failed: {exc}") from exc
 
-    repo_dir = _derive_repo_directory(repo_url)
     click.echo(f"✅ Successfully cloned {repo_url} into {repo_dir}/")
 
     if should_link is None:
         if account_name:
             should_link = True
+        elif rule:
+            # The rule already covers the new clone; an explicit --link still writes .ghmulti.
+            click.echo(f"🔗 Covered by directory rule {rule.pattern}; no link needed.")
+            return
         else:
             should_link = click.confirm("Do you want to link an account to this repository now?", default=False)
 
@@ -72,7 +86,7 @@ def clone_repo(repo_url, account_name, should_link):
         click.echo("    `ghmulti link <account_name>`")
         return
 
-    selected_account_name = account_name or _choose_account_interactively(
+    selected_account_name = account_name or (rule.account if rule else None) or _choose_account_interactively(
         "Select account to link to the cloned repository"
     )
     click.echo(f"🔗 Linking repository to account '{selected_account_name}'...")
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import click
+
+from cli.credential import format_credential
+from cli.credential import forget_credentials
+from cli.credential import lookup_credential
+from cli.credential import parse_credential_request
+
+
+@click.command(name="credential")
+@click.argument("operation")
+def credential(operation):
+    """Git credential helper: answers `get` with the linked account's token.
+
+    Enable it with `git config --global credential.https://github.com.helper '!ghmulti credential'`.
+    """
+    request = parse_credential_request(sys.stdin.read())
+    if operation == "get":
+        answer = lookup_credential(request, os.getcwd())
+        if answer:
+            click.echo(format_credential(answer), nl=False)
+    elif operation == "erase":
+        # Git rejected the token; drop cached answers but leave the keyring alone.
+        forget_credentials()
+    # "store" and operations added to the protocol later need no action: tokens live in the keyring.
@@ -6,7 +6,6 @@ from dataclasses import asdict
 from dataclasses import dataclass
 
 import click
-import keyring
 
 from cli.config import get_active_account_from_global_config
 from cli.config import get_linked_account
@@ -25,10 +24,7 @@ def _run_check(name: str, ok: bool, detail: str) -> DoctorCheck:
     return DoctorCheck(name=name, status="ok" if ok else "error", detail=detail)
 
 
-@click.command(name="doctor")
-@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
-def doctor(json_output):
-    """Run environment diagnostics for ghmulti."""
+def build_doctor_payload(repo_path: str = ".") -> dict:
     checks: list[DoctorCheck] = []
 
     checks.append(
@@ -65,23 +61,34 @@ def doctor(json_output):
     )
 
     try:
+        import keyring
+
         backend = keyring.get_keyring()
         checks.append(_run_check("keyring-backend", True, backend.__class__.__name__))
     except Exception as exc:
         checks.append(_run_check("keyring-backend", False, f"unavailable ({exc})"))
 
-    if is_git_repository():
-        linked = get_linked_account()
+    if is_git_repository(repo_path):
+        linked = get_linked_account(repo_path=repo_path)
         checks.append(_run_check("repo-link", True, f"linked={linked}" if linked else "repo not linked"))
     else:
         checks.append(_run_check("repo-link", True, "not in a git repository"))
 
     has_errors = any(check.status == "error" for check in checks)
-    payload = {
+    return {
         "ok": not has_errors,
         "checks": [asdict(check) for check in checks]
     }
 
+
+@click.command(name="doctor")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def doctor(json_output):
+    """Run environment diagnostics for ghmulti."""
+    payload = build_doctor_payload()
+    checks = [DoctorCheck(**check) for check in payload["checks"]]
+    has_errors = not payload["ok"]
+
     if json_output:
         click.echo(json.dumps(payload, indent=2))
     else:
@@ -0,0 +1,85 @@
+import json
+from contextlib import contextmanager
+from typing import Iterator
+
+import click
+
+from cli.config import load_config
+from cli.git_config import GitConfigError
+from cli.identity import disable_include_mode
+from cli.identity import enable_include_mode
+from cli.identity import fragment_path
+from cli.identity import global_gitconfig_path
+from cli.identity import identity_dir
+from cli.identity import read_identity_block
+
+
+@contextmanager
+def include_mode_errors(action: str) -> Iterator[None]:
+    """Report a failed gitconfig or fragment write as a ClickException.
+
+    Used inside a config transaction, the exception also discards the config change,
+    so ~/.ghmulti.json and the managed block never disagree.
+    """
+    try:
+        yield
+    except (GitConfigError, OSError) as exc:
+        raise click.ClickException(f"Failed to {action}: {exc}") from exc
+
+
+def _echo_block(block, json_output: bool) -> None:
+    if json_output:
+        click.echo(json.dumps({
+            "mode": "include" if block is not None else "per-repository",
+            "gitconfig": str(global_gitconfig_path()),
+            "fragments": str(identity_dir()),
+            **(block.to_dict() if block is not None else {"default_account": None, "rules": []}),
+        }, indent=2))
+        return
+    if block is None:
+        click.echo("ℹ️  Include mode is off; ghmulti writes identity settings into each repository.")
+        return
+    click.echo(f"🪪 Include mode is on ({global_gitconfig_path()}).")
+    if block.default_account:
+        click.echo(f"   default → {block.default_account} ({fragment_path(block.default_account)})")
+    for rule in block.rules:
+        click.echo(f"   {rule.directory}/ → {rule.account}")
+
+
+@click.group("identity")
+def identity():
+    """Resolve commit identity natively with git `includeIf` rules instead of per-repository writes."""
+    pass
+
+
+@identity.command("status")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def identity_status(json_output):
+    """Show whether include mode is on, and its rules."""
+    _echo_block(read_identity_block(), json_output)
+
+
+@identity.command("enable")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def identity_enable(json_output):
+    """Write one gitconfig fragment per account and a managed includeIf block into the global gitconfig."""
+    config = load_config()
+    with include_mode_errors("enable include mode"):
+        block = enable_include_mode(config["accounts"], config.get("active"))
+    if not json_output:
+        click.echo(f"✅ Wrote {len(config['accounts'])} identity fragments to {identity_dir()}.")
+    _echo_block(block, json_output)
+
+
+@identity.command("disable")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def identity_disable(json_output):
+    """Remove the managed block and the generated fragments."""
+    with include_mode_errors("disable include mode"):
+        removed = disable_include_mode()
+    if json_output:
+        click.echo(json.dumps({"disabled": removed}, indent=2))
+    elif removed:
+        click.echo("✅ Include mode is off. Run `ghmulti use` and `ghmulti link` again to write identities directly.")
+    else:
+        click.echo("ℹ️  Include mode was not enabled.")
@@ -1,14 +1,67 @@
 import json
 import os
-import subprocess
+from typing import Optional
 
 import click
-import inquirer
 
+from cli.commands.identity import include_mode_errors
+from cli.config import LINKED_GIT_CONFIG_KEY
 from cli.config import get_account_by_name
 from cli.config import get_accounts
 from cli.config import set_linked_account
-from cli.config import unset_git_config_value
+from cli.git_config import discover_repository
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import set_local_git_config_values
+from cli.identity import IncludeRule
+from cli.identity import account_identity
+from cli.identity import add_include_rule
+from cli.identity import include_mode_enabled
+from cli.linked_repos import DEFAULT_CASCADE_WORKERS
+from cli.linked_repos import link_repositories_under
+from cli.linked_repos import summarize_changes
+
+
+def _identity_changes(account: dict, git_config: GitConfigSnapshot) -> dict[str, Optional[str]]:
+    # Only keys that differ from what the repository already has locally.
+    changes: dict[str, Optional[str]] = {}
+    for key, value in account_identity(account).items():
+        if value is None:
+            if git_config.has(key, scope="--local"):
+                changes[key] = None
+        elif git_config.get(key, scope="--local") != value:
+            changes[key] = value
+    return changes
+
+
+def apply_account_identity(account: dict, repo_path: str = ".") -> None:
+    set_local_git_config_values(_identity_changes(account, GitConfigSnapshot.load(repo_path)), cwd=repo_path)
+
+
+def link_changes(account: dict, repo_path: str = ".", git_config: Optional[GitConfigSnapshot] = None) -> dict[str, Optional[str]]:
+    """Local git config writes still needed to link `account`; empty when git config is already in place."""
+    git_config = git_config or GitConfigSnapshot.load(repo_path)
+    changes = _identity_changes(account, git_config)
+    if git_config.get(LINKED_GIT_CONFIG_KEY, scope="--local") != account["name"]:
+        changes[LINKED_GIT_CONFIG_KEY] = account["name"]
+    return changes
+
+
+def link_repository(account: dict, repo_path: str = ".", git_config: Optional[GitConfigSnapshot] = None) -> None:
+    changes = link_changes(account, repo_path, git_config)
+    set_linked_account(account["name"], repo_path=repo_path, sync_git_config=False)
+    set_local_git_config_values(changes, cwd=repo_path)
+
+
+def link_by_include(account: dict, repo_path: str = ".") -> None:
+    """Include mode: one rule in the global gitconfig instead of local identity writes."""
+    add_include_rule(repo_path, account)
+    set_linked_account(account["name"], repo_path=repo_path, sync_git_config=False)
+    # Local values would shadow the included identity, so drop the ones ghmulti wrote earlier.
+    git_config = GitConfigSnapshot.load(repo_path)
+    set_local_git_config_values(
+        {key: None for key in [*account_identity(account), LINKED_GIT_CONFIG_KEY] if git_config.has(key, scope="--local")},
+        cwd=repo_path
+    )
 
 
 def link_account_logic(account_name: str, repo_path: str = ".") -> dict:
@@ -16,30 +69,16 @@ def link_account_logic(account_name: str, repo_path: str = ".") -> dict:
     if not target_account:
         raise click.ClickException(f"Account '{account_name}' not found in your ghmulti config.")
 
-    if not os.path.exists(os.path.join(repo_path, ".git")):
+    # Linking from a subdirectory links the repository that contains it.
+    repository = discover_repository(repo_path)
+    if repository is None or repository.work_tree is None:
         raise click.ClickException("This does not appear to be a git repository.")
 
-    set_linked_account(account_name, repo_path=repo_path)
-
-    # Set git config locally for this repository
-    subprocess.run(["git", "config", "--local", "user.name", target_account["username"]], check=True, cwd=repo_path)
-    subprocess.run(
-        ["git", "config", "--local", "user.email", f'{target_account["username"]}@users.noreply.github.com'],
-        check=True,
-        cwd=repo_path
-    )
-
-    if "gpg_key_id" in target_account:
-        subprocess.run(["git", "config", "--local", "user.signingkey", target_account["gpg_key_id"]], check=True, cwd=repo_path)
-    else:
-        unset_git_config_value("--local", "user.signingkey", cwd=repo_path)
-
-    if "ssh_key_path" in target_account:
-        expanded_key = os.path.expanduser(target_account["ssh_key_path"])
-        subprocess.run(["git", "config", "--local", "core.sshCommand", f"ssh -i {expanded_key}"], check=True, cwd=repo_path)
+    if include_mode_enabled():
+        with include_mode_errors("add the include rule"):
+            link_by_include(target_account, repo_path=str(repository.work_tree))
     else:
-        unset_git_config_value("--local", "core.sshCommand", cwd=repo_path)
-
+        link_repository(target_account, repo_path=str(repository.work_tree))
     return target_account
 
 
@@ -48,6 +87,8 @@ def _choose_account_interactively() -> str:
     if not accounts:
         raise click.ClickException("No accounts configured. Run `ghmulti add` first.")
 
+    import inquirer
+
     question = [
         inquirer.List(
             "account",
@@ -64,10 +105,32 @@ def _choose_account_interactively() -> str:
 
 @click.command(name="link")
 @click.argument("account_name", required=False)
+@click.option(
+    "--recursive",
+    "root",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Link every repository found under this directory instead of the current one."
+)
+@click.option(
+    "--owner",
+    "owners",
+    multiple=True,
+    help="With --recursive, only link repositories with a remote owned by this user or organization."
+)
+@click.option("--dry-run", is_flag=True, help="With --recursive, show what would be linked without changing anything.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_CASCADE_WORKERS, show_default=True)
 @click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
-def link_account(account_name, json_output):
-    """Link a GitHub account to the current repository."""
+def link_account(account_name, root, owners, dry_run, workers, json_output):
+    """Link a GitHub account to the current repository (or, with --recursive, to many)."""
+    if root is None and (owners or dry_run):
+        raise click.ClickException("--owner and --dry-run can only be used together with --recursive.")
+
     selected_name = account_name or _choose_account_interactively()
+    if root is not None:
+        _link_recursive(selected_name, root, owners, dry_run, workers, json_output)
+        return
+
     account = link_account_logic(selected_name)
 
     if json_output:
@@ -77,3 +140,61 @@ def link_account(account_name, json_output):
         }, indent=2))
     else:
         click.echo(f"✅ Successfully linked account '{selected_name}' to this repository.")
+
+
+def _link_recursive(account_name: str, root: str, owners: tuple[str, ...], dry_run: bool, workers: int, json_output: bool) -> None:
+    account = get_account_by_name(account_name)
+    if not account:
+        raise click.ClickException(f"Account '{account_name}' not found in your ghmulti config.")
+
+    if include_mode_enabled() and not owners:
+        _link_recursive_by_include(account, root, dry_run, json_output)
+        return
+
+    changes, filtered = link_repositories_under(root, account, owners=owners, dry_run=dry_run, workers=workers)
+    summary = summarize_changes(changes)
+
+    if json_output:
+        click.echo(json.dumps({
+            "account": account_name,
+            "root": os.path.abspath(root),
+            "owners": list(owners),
+            "dry_run": dry_run,
+            "summary": {**summary, "filtered": len(filtered)},
+            "repositories": [change.to_dict() for change in changes],
+            "filtered": filtered
+        }, indent=2))
+        return
+
+    for change in changes:
+        if change.status == "error":
+            click.echo(f"⚠️  Failed to link {change.path}: {change.error}")
+        elif change.status == "planned":
+            click.echo(f"   would link {change.path}")
+        elif change.status == "updated":
+            click.echo(f"🔗 {change.path}")
+    verb = "Would link" if dry_run else "Linked"
+    click.echo(
+        f"✅ {verb} {summary['planned'] if dry_run else summary['updated']} repositories to '{account_name}' "
+        f"({summary['skipped']} already linked, {len(filtered)} filtered out, {summary['error']} failed)."
+    )
+
+
+def _link_recursive_by_include(account: dict, root: str, dry_run: bool, json_output: bool) -> None:
+    # One includeIf rule covers every repository under ROOT, including ones cloned later.
+    if dry_run:
+        rule = IncludeRule(os.path.realpath(root), account["name"])
+    else:
+        with include_mode_errors("add the include rule"):
+            rule = add_include_rule(root, account)
+    if json_output:
+        click.echo(json.dumps({
+            "account": account["name"],
+            "root": os.path.abspath(root),
+            "mode": "include",
+            "dry_run": dry_run,
+            "rule": rule.to_dict()
+        }, indent=2))
+        return
+    verb = "Would add" if dry_run else "Added"
+    click.echo(f"✅ {verb} an include rule: repositories under {rule.directory}/ use '{account['name']}'.")
@@ -2,13 +2,16 @@ import json
 import click
 
 from cli.config import load_config
+from cli.daemon import query_daemon
 
 
 @click.command(name="list")
 @click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
 def list_accounts(json_output):
     """List all configured GitHub accounts."""
-    config = load_config()
+    config = query_daemon("list")
+    if config is None:
+        config = load_config()
     accounts = config.get("accounts", [])
     active = config.get("active")
 
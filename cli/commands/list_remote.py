@@ -1,36 +1,109 @@
+import json
 import subprocess
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+
 import click
-import os
-import re
 
-def get_current_branch():
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import is_git_repository
+
+# One NUL-separated record per branch; git forbids newlines and control characters in ref names.
+# Neither field asks git for ahead/behind counts, so the listing stays cheap with thousands of branches.
+BRANCH_TRACKING_FORMAT = "%(HEAD)%00%(refname)%00%(upstream:remotename)%00%(upstream)"
+
+
+@dataclass
+class BranchTracking:
+    name: str
+    current: bool
+    remote: Optional[str]
+    upstream: Optional[str]
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def get_current_branch(cwd: str | Path = "."):
     """Get the name of the currently checked-out Git branch."""
     try:
         return subprocess.check_output(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            text=True
+            cwd=str(cwd),
+            text=True,
+            stderr=subprocess.DEVNULL
         ).strip()
     except subprocess.CalledProcessError:
         return None
 
-def get_branch_remotes():
+
+def _parse_branch_record(line: bytes) -> Optional[BranchTracking]:
+    fields = line.rstrip(b"\n").decode("utf-8", errors="replace").split("\0")
+    if len(fields) != 4 or not fields[1].startswith("refs/heads/"):
+        return None
+    head, refname, remote, upstream = fields
+    return BranchTracking(refname[len("refs/heads/"):], head == "*", remote or None, upstream or None)
+
+
+def iter_branch_tracking(cwd: str | Path = ".", patterns: tuple[str, ...] = ()) -> Iterator[BranchTracking]:
+    """Yield local branches and their upstreams as `git for-each-ref` produces them."""
+    refs = [f"refs/heads/{pattern}" for pattern in patterns] or ["refs/heads"]
+    process = subprocess.Popen(
+        ["git", "for-each-ref", f"--format={BRANCH_TRACKING_FORMAT}", *refs],
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        for line in process.stdout:
+            branch = _parse_branch_record(line)
+            if branch is not None:
+                yield branch
+    finally:
+        # The caller may stop early (e.g. a closed pager); don't leave git blocked on a full pipe.
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+def ahead_behind(branch: BranchTracking, cwd: str | Path = ".") -> tuple[Optional[int], Optional[int]]:
+    """Commits on `branch` but not its upstream, and the reverse; (None, None) without a usable upstream."""
+    if not branch.upstream:
+        return None, None
+    result = subprocess.run(
+        ["git", "rev-list", "--left-right", "--count", f"refs/heads/{branch.name}...{branch.upstream}"],
+        cwd=str(cwd),
+        capture_output=True,
+        text=True
+    )
+    counts = result.stdout.split()
+    if result.returncode != 0 or len(counts) != 2:
+        return None, None
+    return int(counts[0]), int(counts[1])
+
+
+def get_branch_remotes(cwd: str | Path = "."):
     """
     Returns a dictionary mapping each local branch to its tracking remote.
     Example: { "main": "origin" }
     """
-    try:
-        output = subprocess.check_output(["git", "branch", "-vv"], text=True).strip().splitlines()
-    except subprocess.CalledProcessError:
-        return {}
+    return {branch.name: branch.remote for branch in iter_branch_tracking(cwd) if branch.remote}
+
+
+def _remote_urls(git_config: GitConfigSnapshot) -> list[tuple[str, str]]:
+    remotes = []
+    for name in git_config.remote_names():
+        for url in git_config.get_all(f"remote.{name}.url") + git_config.get_all(f"remote.{name}.pushurl"):
+            if (name, url) not in remotes:
+                remotes.append((name, url))
+    return remotes
 
-    tracking = {}
-    for line in output:
-        match = re.match(r"[\*\s]+\s*(\S+)\s+[a-f0-9]+\s+\[([^\]]+)\]", line)
-        if match:
-            branch, remote_ref = match.groups()
-            remote = remote_ref.split("/")[0]
-            tracking[branch] = remote
-    return tracking
 
 def detect_remote_type(url):
     """Return an emoji describing the remote type."""
@@ -42,51 +115,74 @@ def detect_remote_type(url):
         return "⚠️ Insecure HTTP"
     return "❓ Unknown"
 
+
+def _remote_type(url):
+    if url.startswith("git@") or url.startswith("ssh://"):
+        return "ssh"
+    if url.startswith("https://"):
+        return "https"
+    if url.startswith("http://"):
+        return "http"
+    return "unknown"
+
+
 @click.command(name="list-remote")
 @click.option("--all-branches", is_flag=True, help="Show tracking remotes for all branches.")
-def list_remotes(all_branches):
+@click.option("--branch", "patterns", multiple=True, help="Only show branches matching this pattern (implies --all-branches).")
+@click.option("--ahead-behind", "count_ahead_behind", is_flag=True,
+              help="Count commits ahead of and behind the upstream for the branches shown.")
+@click.option("--json", "json_output", is_flag=True, help="Stream one JSON object per remote and branch (NDJSON).")
+def list_remotes(all_branches, patterns, count_ahead_behind, json_output):
     """
     List Git remotes and their type.
     Use --all-branches to show tracked remotes for all local branches.
     """
-    if not os.path.exists(".git"):
+    if not is_git_repository("."):
         click.echo("❌ Not a Git repository.")
         return
 
+    git_config = GitConfigSnapshot.load(".")
     current_branch = get_current_branch()
-    tracking_map = get_branch_remotes()
+    default_remote = git_config.get(f"branch.{current_branch}.remote") if current_branch else None
+    remotes = _remote_urls(git_config)
 
-    try:
-        remotes_output = subprocess.check_output(["git", "remote", "-v"], text=True).strip().splitlines()
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Failed to list remotes: {e}")
-        return
-
-    if not remotes_output:
+    if json_output:
+        click.echo(json.dumps({"event": "repository", "current_branch": current_branch}))
+    elif not remotes:
         click.echo("ℹ️  No remotes configured.")
-        return
+    else:
+        click.echo(f"🔗 Git Remotes (current branch: {current_branch})\n")
 
-    click.echo(f"🔗 Git Remotes (current branch: {current_branch})\n")
+    for name, url in remotes:
+        is_default = name == default_remote
+        if json_output:
+            click.echo(json.dumps({
+                "event": "remote", "name": name, "url": url, "type": _remote_type(url), "default": is_default
+            }))
+        else:
+            default_marker = "✔ current branch default" if is_default else ""
+            click.echo(f"• {name} → {url} [{detect_remote_type(url)}] {default_marker}")
 
-    seen = set()
-    for line in remotes_output:
-        match = re.match(r"(\S+)\s+(\S+)\s+\((fetch|push)\)", line)
-        if not match:
-            continue
-        name, url, _ = match.groups()
+    if all_branches or patterns:
+        if not json_output:
+            click.echo("\n📦 Tracked Remotes for All Branches:")
+        branches = iter_branch_tracking(".", patterns)
+    elif current_branch and (json_output or count_ahead_behind):
+        # JSON always reports the current branch; nothing else is listed (or counted) unless asked for.
+        if not json_output:
+            click.echo("\n📦 Current Branch:")
+        branches = (branch for branch in iter_branch_tracking(".", (current_branch,)) if branch.current)
+    else:
+        return
 
-        if (name, url) in seen:
+    for branch in branches:
+        if count_ahead_behind:
+            branch.ahead, branch.behind = ahead_behind(branch)
+        if json_output:
+            click.echo(json.dumps({"event": "branch", **branch.to_dict()}))
             continue
-        seen.add((name, url))
-
-        remote_type = detect_remote_type(url)
-        is_default = name == tracking_map.get(current_branch)
-        default_marker = "✔ current branch default" if is_default else ""
-
-        click.echo(f"• {name} → {url} [{remote_type}] {default_marker}")
-
-    if all_branches:
-        click.echo("\n📦 Tracked Remotes for All Branches:")
-        for branch, remote in tracking_map.items():
-            marker = "← current" if branch == current_branch else ""
-            click.echo(f"• {branch} → {remote} {marker}")
+        if not branch.remote:
+            continue
+        marker = "← current" if branch.current else ""
+        counts = f"(+{branch.ahead}/-{branch.behind}) " if branch.ahead is not None else ""
+        click.echo(f"• {branch.name} → {branch.remote} {counts}{marker}")
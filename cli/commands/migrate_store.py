@@ -0,0 +1,41 @@
+import json
+import sqlite3
+
+import click
+
+from cli.account_store import STORE_BACKENDS
+from cli.account_store import account_store_backend
+from cli.account_store import migrate_account_store
+
+
+@click.command(name="migrate-store")
+@click.argument("target", required=False, type=click.Choice(STORE_BACKENDS))
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def migrate_store(target, json_output):
+    """Move accounts between the JSON file and the SQLite store.
+
+    Without TARGET, print which store is in use. The file that is no longer
+    used is kept next to the new one with a `.migrated` suffix.
+    """
+    if target is None:
+        backend = account_store_backend()
+        if json_output:
+            click.echo(json.dumps({"backend": backend}, indent=2))
+        else:
+            click.echo(f"🗄️  Accounts are stored in {backend}.")
+        return
+
+    try:
+        report = migrate_account_store(target)
+    except (sqlite3.Error, OSError, ValueError) as exc:
+        raise click.ClickException(f"Migration failed: {exc}") from exc
+
+    if json_output:
+        click.echo(json.dumps(report, indent=2))
+        return
+    if report["from"] == target:
+        click.echo(f"ℹ️  Accounts already use the {target} store ({report['path']}).")
+        return
+    click.echo(f"✅ Migrated {report['accounts']} accounts from {report['from']} to {target}: {report['path']}")
+    if report["backup"]:
+        click.echo(f"📦 Previous store kept at {report['backup']}")
@@ -1,6 +1,6 @@
 import subprocess
 import click
-from cli.config import get_active_account, get_token, get_linked_account
+from cli.config import get_token, get_linked_account, resolve_account
 from cli.git_utils import choose_remote
 from cli.git_utils import git_auth_env
 
@@ -9,7 +9,8 @@ from cli.git_utils import git_auth_env
 @click.option("--remote", default=None, help="Remote name (default: auto-detected or 'origin')")
 def pull_repo(branch, remote):
     """Pull from GitHub using the active account."""
-    account = get_active_account()
+    resolution = resolve_account()
+    account = resolution.account
 
     if not account:
         raise click.ClickException("No active account found. Use `ghmulti use ACCOUNT_NAME`.")
@@ -18,7 +19,10 @@ def pull_repo(branch, remote):
     token = get_token(username)
 
     # Determine the remote to use
-    linked_account_name = get_linked_account()
+    # A directory rule picks the per-account remote the same way an explicit link does.
+    linked_account_name = get_linked_account() or (resolution.rule.account if resolution.rule else None)
+    if resolution.rule:
+        click.echo(f"ℹ️  Account '{account['name']}' selected by directory rule {resolution.rule.pattern}")
     actual_remote = choose_remote(linked_account_name, remote)
     if linked_account_name and actual_remote == f"origin-{linked_account_name}":
         click.echo(f"ℹ️  Using linked account remote: {actual_remote}")
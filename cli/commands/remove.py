@@ -1,37 +1,72 @@
+import json
+
 import click
 
-from cli.config import clear_linked_account
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
 from cli.config import delete_token
-from cli.config import get_linked_account
-from cli.config import load_config
-from cli.config import save_config
+from cli.config import get_account_by_name
+from cli.identity import sync_identities
+from cli.linked_repos import DEFAULT_CASCADE_WORKERS
+from cli.linked_repos import repositories_linked_to
+from cli.linked_repos import summarize_changes
+from cli.linked_repos import unlink_repositories
 
 
 @click.command(name="remove")
 @click.argument("account_name")
 @click.option("--yes", is_flag=True, help="Skip confirmation prompt.")
-def remove_account(account_name, yes):
-    """Remove an account from ghmulti config."""
-    data = load_config()
-    accounts = data.get("accounts", [])
-    target = next((account for account in accounts if account["name"] == account_name), None)
+@click.option("--dry-run", is_flag=True, help="Show which repositories would be unlinked without changing anything.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_CASCADE_WORKERS, show_default=True)
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def remove_account(account_name, yes, dry_run, workers, json_output):
+    """Remove an account from ghmulti config and unlink every repository that uses it."""
+    target = get_account_by_name(account_name)
     if not target:
         raise click.ClickException(f"Account '{account_name}' not found.")
 
-    if not yes and not click.confirm(f"Remove account '{account_name}'?"):
+    if not dry_run and not yes and not click.confirm(f"Remove account '{account_name}'?"):
         click.echo("Cancelled.")
         return
 
-    data["accounts"] = [account for account in accounts if account["name"] != account_name]
+    if not dry_run:
+        with config_transaction() as data:
+            # The account may have changed (or gone) while the prompt was open.
+            position = AccountIndex.from_dicts(data["accounts"]).position(account_name)
+            if position is None:
+                raise click.ClickException(f"Account '{account_name}' not found.")
+            target = data["accounts"].pop(position)
+            if data.get("active") == account_name:
+                data["active"] = data["accounts"][0]["name"] if data["accounts"] else None
+            if "rules" in data:
+                data["rules"] = [rule for rule in data["rules"] if rule["account"] != account_name]
+            with include_mode_errors("remove the identity fragment"):
+                sync_identities(data["accounts"], data.get("active"))
+        delete_token(target["username"])
 
-    if data.get("active") == account_name:
-        data["active"] = data["accounts"][0]["name"] if data["accounts"] else None
+    changes = unlink_repositories(repositories_linked_to(account_name), target, dry_run=dry_run, workers=workers)
+    summary = summarize_changes(changes)
 
-    save_config(data)
-    delete_token(target["username"])
+    if json_output:
+        click.echo(json.dumps({
+            "account": account_name,
+            "dry_run": dry_run,
+            "summary": summary,
+            "repositories": [change.to_dict() for change in changes]
+        }, indent=2))
+        return
 
-    if get_linked_account() == account_name:
-        clear_linked_account()
-        click.echo("ℹ️  Current repository was linked to the removed account and has been unlinked.")
+    if dry_run:
+        click.echo(f"ℹ️  Dry run: would remove account '{account_name}'.")
+        for change in changes:
+            if change.status == "planned":
+                click.echo(f"   would unlink {change.path}")
+        return
 
+    for change in changes:
+        if change.status == "error":
+            click.echo(f"⚠️  Failed to unlink {change.path}: {change.error}")
+    if summary["updated"]:
+        click.echo(f"ℹ️  Unlinked {summary['updated']} repositories that were linked to the removed account.")
     click.echo(f"✅ Removed account '{account_name}'.")
@@ -1,34 +1,72 @@
+import json
+
 import click
 
-from cli.config import get_linked_account
-from cli.config import load_config
-from cli.config import save_config
-from cli.config import set_linked_account
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
+from cli.identity import sync_identities
+from cli.linked_repos import DEFAULT_CASCADE_WORKERS
+from cli.linked_repos import relink_repositories
+from cli.linked_repos import repositories_linked_to
+from cli.linked_repos import summarize_changes
 
 
 @click.command(name="rename")
 @click.argument("old_name")
 @click.argument("new_name")
-def rename_account(old_name, new_name):
-    """Rename an account alias."""
+@click.option("--dry-run", is_flag=True, help="Show which repositories would be relinked without changing anything.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_CASCADE_WORKERS, show_default=True)
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def rename_account(old_name, new_name, dry_run, workers, json_output):
+    """Rename an account alias and relink every repository that uses it."""
     if old_name == new_name:
         raise click.ClickException("Old and new account names are the same.")
 
-    data = load_config()
-    accounts = data.get("accounts", [])
-    target = next((account for account in accounts if account["name"] == old_name), None)
-    if not target:
-        raise click.ClickException(f"Account '{old_name}' not found.")
+    with config_transaction() as data:
+        index = AccountIndex.from_dicts(data["accounts"])
+        position = index.position(old_name)
+        if position is None:
+            raise click.ClickException(f"Account '{old_name}' not found.")
+        target = data["accounts"][position]
+
+        if new_name in index:
+            raise click.ClickException(f"Account '{new_name}' already exists.")
+
+        if not dry_run:
+            target["name"] = new_name
+            if data.get("active") == old_name:
+                data["active"] = new_name
+            for rule in data.get("rules", []):
+                if rule["account"] == old_name:
+                    rule["account"] = new_name
+            with include_mode_errors("rename the identity fragment"):
+                sync_identities(data["accounts"], data.get("active"), renamed={old_name: new_name})
+    renamed = {**target, "name": new_name}
 
-    if any(account["name"] == new_name for account in accounts):
-        raise click.ClickException(f"Account '{new_name}' already exists.")
+    changes = relink_repositories(repositories_linked_to(old_name), old_name, renamed, dry_run=dry_run, workers=workers)
+    summary = summarize_changes(changes)
 
-    target["name"] = new_name
-    if data.get("active") == old_name:
-        data["active"] = new_name
-    save_config(data)
+    if json_output:
+        click.echo(json.dumps({
+            "old_name": old_name,
+            "new_name": new_name,
+            "dry_run": dry_run,
+            "summary": summary,
+            "repositories": [change.to_dict() for change in changes]
+        }, indent=2))
+        return
 
-    if get_linked_account() == old_name:
-        set_linked_account(new_name)
+    if dry_run:
+        click.echo(f"ℹ️  Dry run: would rename account '{old_name}' to '{new_name}'.")
+        for change in changes:
+            if change.status == "planned":
+                click.echo(f"   would relink {change.path}")
+        return
 
+    for change in changes:
+        if change.status == "error":
+            click.echo(f"⚠️  Failed to relink {change.path}: {change.error}")
     click.echo(f"✅ Renamed account '{old_name}' to '{new_name}'.")
+    if summary["updated"]:
+        click.echo(f"🔗 Relinked {summary['updated']} repositories.")
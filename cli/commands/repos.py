@@ -0,0 +1,45 @@
+import json
+
+import click
+
+from cli.registry import RepoRegistry
+
+
+@click.command(name="repos")
+@click.option("--account", "account_name", default=None, help="Only list repositories linked to this account.")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+@click.option("--repair", is_flag=True, help="Drop stale entries and follow links that changed on disk.")
+@click.option(
+    "--scan",
+    "scan_roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="With --repair, also register linked repositories found under this directory."
+)
+def list_repos(account_name, json_output, repair, scan_roots):
+    """List repositories linked to ghmulti accounts."""
+    if scan_roots and not repair:
+        raise click.ClickException("--scan can only be used together with --repair.")
+
+    with RepoRegistry() as registry:
+        report = registry.repair(scan_roots) if repair else None
+        repos = registry.repos_for(account_name) if account_name else registry.all()
+
+    if json_output:
+        payload = {"repos": [{"path": repo.path, "account": repo.account} for repo in repos]}
+        if report is not None:
+            payload["repair"] = report.to_dict()
+        click.echo(json.dumps(payload, indent=2))
+        return
+
+    if report is not None:
+        click.echo(
+            f"🧹 Repair: {len(report.removed)} removed, {len(report.updated)} updated, {len(report.added)} added."
+        )
+
+    if not repos:
+        click.echo("ℹ️  No linked repositories registered.")
+        return
+
+    for repo in repos:
+        click.echo(f"🔗 {repo.path} → '{repo.account}'")
@@ -0,0 +1,105 @@
+import json
+import os
+
+import click
+
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
+from cli.config import load_config
+from cli.identity import add_include_rule
+from cli.identity import include_mode_enabled
+from cli.identity import remove_include_rule
+from cli.rules import RECURSIVE_SUFFIX
+from cli.rules import WILDCARD
+from cli.rules import compile_pattern
+
+
+def _compile(pattern: str) -> tuple[tuple[str, ...], bool]:
+    try:
+        return compile_pattern(pattern)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+def _include_directory(pattern: str) -> str | None:
+    # Only plain `DIR/**` rules map one-to-one onto an includeIf "gitdir:DIR/" rule.
+    parts, recursive = _compile(pattern)
+    if not recursive or WILDCARD in parts:
+        return None
+    return os.path.join(*parts)
+
+
+@click.group("rule")
+def rule():
+    """Choose accounts by directory: `ghmulti rule add '~/clients/acme/**' acme`."""
+    pass
+
+
+@rule.command("add")
+@click.argument("pattern")
+@click.argument("account_name")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def rule_add(pattern, account_name, json_output):
+    """Use ACCOUNT_NAME for repositories matching PATTERN (DIR/** for a whole tree, * for one directory level)."""
+    key = _compile(pattern)
+    directory = _include_directory(pattern)
+    new_rule = {"pattern": pattern.strip(), "account": account_name}
+    with config_transaction() as data:
+        position = AccountIndex.from_dicts(data["accounts"]).position(account_name)
+        if position is None:
+            raise click.ClickException(f"Account '{account_name}' not found in your ghmulti config.")
+        rules = data.setdefault("rules", [])
+        # Re-adding a pattern (however it is spelled) moves it to the new account.
+        positions = [position for position, existing in enumerate(rules) if compile_pattern(existing["pattern"]) == key]
+        replaced = bool(positions)
+        if replaced:
+            rules[positions[0]] = new_rule
+        else:
+            rules.append(new_rule)
+        if directory and include_mode_enabled():
+            with include_mode_errors("add the include rule"):
+                add_include_rule(directory, data["accounts"][position])
+
+    if json_output:
+        click.echo(json.dumps({"rule": new_rule, "replaced": replaced}, indent=2))
+    else:
+        click.echo(f"✅ Repositories matching {new_rule['pattern']} now use '{account_name}'.")
+
+
+@rule.command("remove")
+@click.argument("pattern")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def rule_remove(pattern, json_output):
+    """Remove the rule for PATTERN."""
+    key = _compile(pattern)
+    directory = _include_directory(pattern)
+    with config_transaction() as data:
+        rules = data.get("rules", [])
+        kept = [existing for existing in rules if compile_pattern(existing["pattern"]) != key]
+        if len(kept) == len(rules):
+            raise click.ClickException(f"No rule for '{pattern}'.")
+        data["rules"] = kept
+        if directory:
+            with include_mode_errors("remove the include rule"):
+                remove_include_rule(directory)
+
+    if json_output:
+        click.echo(json.dumps({"removed": pattern.strip()}, indent=2))
+    else:
+        click.echo(f"✅ Removed the rule for {pattern.strip()}.")
+
+
+@rule.command("list")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def rule_list(json_output):
+    """List directory rules in the order they were added."""
+    rules = load_config().get("rules", [])
+    if json_output:
+        click.echo(json.dumps(rules, indent=2))
+        return
+    if not rules:
+        click.echo(f"ℹ️  No directory rules. Add one with `ghmulti rule add 'DIR/{RECURSIVE_SUFFIX}' ACCOUNT`.")
+        return
+    for entry in rules:
+        click.echo(f"{entry['pattern']} → {entry['account']}")
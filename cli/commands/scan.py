@@ -0,0 +1,42 @@
+import json
+import os
+
+import click
+
+from cli.scanner import DEFAULT_SCAN_WORKERS
+from cli.scanner import scan_repositories
+
+
+@click.command(name="scan")
+@click.argument("root", type=click.Path(exists=True, file_okay=False), default=".")
+@click.option("--json", "json_output", is_flag=True, help="Stream one JSON object per repository (NDJSON).")
+@click.option("--linked-only", is_flag=True, help="Only report repositories linked to an account.")
+@click.option("--max-depth", type=click.IntRange(min=0), default=None, help="Do not descend deeper than this.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_SCAN_WORKERS, show_default=True)
+def scan(root, json_output, linked_only, max_depth, workers):
+    """Find git repositories under ROOT and show which account each is linked to."""
+    found = 0
+    for repository in scan_repositories(root, workers=workers, max_depth=max_depth):
+        if repository.error:
+            if json_output:
+                click.echo(json.dumps(repository.to_dict()))
+            else:
+                click.echo(f"⚠️  {os.path.relpath(repository.path, root)}: {repository.error}", err=True)
+            continue
+        if linked_only and not repository.account:
+            continue
+        found += 1
+        if json_output:
+            click.echo(json.dumps(repository.to_dict()))
+            continue
+
+        path = os.path.relpath(repository.path, root)
+        if repository.linked_account:
+            click.echo(f"🔗 {path} → '{repository.linked_account}'")
+        elif repository.linked_account_from_git_config:
+            click.echo(f"🔗 {path} → '{repository.linked_account_from_git_config}' (git config only)")
+        else:
+            click.echo(f"   {path} (not linked)")
+
+    if not json_output and not found:
+        click.echo("ℹ️  No repositories found.")
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import click
+
+from cli.daemon import DaemonService
+from cli.daemon import default_socket_path
+from cli.ipc import RpcUnavailable
+from cli.ipc import call
+from cli.ipc import create_server
+
+
+@click.command(name="serve")
+@click.option("--socket", "socket_path", default=None, help="Unix socket path (default: per-user runtime directory).")
+@click.option("--stop", is_flag=True, help="Stop the daemon listening on the socket.")
+def serve(socket_path, stop):
+    """Run a resident daemon answering status/list/whoami/doctor queries over a local socket."""
+    path = Path(socket_path) if socket_path else default_socket_path()
+
+    if stop:
+        try:
+            call(path, "shutdown")
+        except RpcUnavailable as exc:
+            raise click.ClickException(f"No ghmulti daemon is listening on {path}.") from exc
+        click.echo(f"✅ Stopped ghmulti daemon on {path}.")
+        return
+
+    service = DaemonService()
+    try:
+        server = create_server(path, service.handlers())
+    except (RuntimeError, OSError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    service.stop_callback = server.request_shutdown
+
+    click.echo(f"🛰️  ghmulti daemon listening on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    click.echo("👋 ghmulti daemon stopped.")
@@ -1,41 +1,58 @@
 import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from typing import Any
 from typing import Optional
 
 import click
 
 from cli.config import LINKED_GIT_CONFIG_KEY
-from cli.config import get_active_account
 from cli.config import get_active_account_from_global_config
-from cli.config import get_git_config_value
 from cli.config import get_linked_account
 from cli.config import get_token
+from cli.config import load_config
+from cli.config import resolve_account
+from cli.daemon import query_daemon
+from cli.git_utils import GitConfigSnapshot
+from cli.github_api import MAX_RETRY_WAIT_SECONDS
+from cli.github_api import GitHubApiClient
 from cli.github_auth import validate_github_token
 
 
-def _collect_git_identity(scope: str, repo_path: str = ".") -> dict[str, Optional[str]]:
+def _collect_git_identity(scope: str, git_config: GitConfigSnapshot) -> dict[str, Optional[str]]:
     return {
-        "user_name": get_git_config_value(scope, "user.name", cwd=repo_path),
-        "user_email": get_git_config_value(scope, "user.email", cwd=repo_path),
-        "user_signingkey": get_git_config_value(scope, "user.signingkey", cwd=repo_path),
-        "core_ssh_command": get_git_config_value(scope, "core.sshCommand", cwd=repo_path),
+        "user_name": git_config.get("user.name", scope=scope),
+        "user_email": git_config.get("user.email", scope=scope),
+        "user_signingkey": git_config.get("user.signingkey", scope=scope),
+        "core_ssh_command": git_config.get("core.sshCommand", scope=scope),
     }
 
 
-def build_status_payload(repo_path: str = ".", skip_token_check: bool = False) -> dict[str, Any]:
+def build_status_payload(
+    repo_path: str = ".",
+    skip_token_check: bool = False,
+    refresh_token_check: bool = False
+) -> dict[str, Any]:
+    git_config = GitConfigSnapshot.load(repo_path)
     linked_account_name = get_linked_account(repo_path=repo_path)
-    linked_git_config = get_git_config_value("--local", LINKED_GIT_CONFIG_KEY, cwd=repo_path)
+    linked_git_config = git_config.get(LINKED_GIT_CONFIG_KEY, scope="--local")
     global_active_account = get_active_account_from_global_config()
-    effective_active_account = get_active_account(repo_path=repo_path)
-    local_git = _collect_git_identity("--local", repo_path=repo_path)
-    global_git = _collect_git_identity("--global", repo_path=repo_path)
+    resolution = resolve_account(repo_path=repo_path)
+    effective_active_account = resolution.account
+    local_git = _collect_git_identity("--local", git_config)
+    global_git = _collect_git_identity("--global", git_config)
 
     warnings: list[str] = []
     token_details = {
         "present": False,
         "valid": None,
         "message": "No active account to validate token for.",
-        "status_code": None
+        "status_code": None,
+        "source": None,
+        "age_seconds": None,
+        "reason": None
     }
 
     if linked_account_name and linked_git_config and linked_account_name != linked_git_config:
@@ -50,10 +67,13 @@ def build_status_payload(repo_path: str = ".", skip_token_check: bool = False) -
             if skip_token_check:
                 token_details["message"] = "Token check skipped."
             else:
-                validation = validate_github_token(token)
+                validation = validate_github_token(token, ttl_seconds=0 if refresh_token_check else None)
                 token_details["valid"] = validation.valid
                 token_details["message"] = validation.message
                 token_details["status_code"] = validation.status_code
+                token_details["source"] = validation.source
+                token_details["age_seconds"] = validation.age_seconds
+                token_details["reason"] = validation.reason
         else:
             token_details["message"] = "Token not found in keyring for effective account."
 
@@ -77,6 +97,8 @@ def build_status_payload(repo_path: str = ".", skip_token_check: bool = False) -
         "linked_account_from_git_config": linked_git_config,
         "global_active_account": global_active_account,
         "effective_active_account": effective_active_account,
+        "effective_account_source": resolution.source,
+        "matched_rule": resolution.rule.to_dict() if resolution.rule else None,
         "local_git": local_git,
         "global_git": global_git,
         "token": token_details,
@@ -84,6 +106,107 @@ def build_status_payload(repo_path: str = ".", skip_token_check: bool = False) -
     }
 
 
+def _account_token_entry(account: dict[str, Any], token: Optional[str]) -> dict[str, Any]:
+    return {
+        "account": account["name"],
+        "username": account["username"],
+        "present": bool(token),
+        "valid": None,
+        "message": "Token not found in keyring.",
+        "status_code": None,
+        "latency_ms": None,
+        "rate_limit": {"limit": None, "remaining": None, "reset": None},
+        "source": None,
+        "age_seconds": None,
+        "reason": None,
+    }
+
+
+def _validate_account_token(
+    account: dict[str, Any],
+    token: Optional[str],
+    client: GitHubApiClient,
+    timeout: float,
+    refresh: bool
+) -> dict[str, Any]:
+    entry = _account_token_entry(account, token)
+    if not token:
+        return entry
+
+    validation = validate_github_token(token, timeout_seconds=timeout, ttl_seconds=0 if refresh else None, client=client)
+    entry.update({
+        "valid": validation.valid,
+        "message": validation.message,
+        "status_code": validation.status_code,
+        "latency_ms": validation.latency_ms,
+        "rate_limit": {
+            "limit": validation.rate_limit_limit,
+            "remaining": validation.rate_limit_remaining,
+            "reset": validation.rate_limit_reset,
+        },
+        "source": validation.source,
+        "age_seconds": validation.age_seconds,
+        "reason": validation.reason,
+    })
+    return entry
+
+
+def build_all_accounts_payload(
+    deadline_seconds: float = 10.0,
+    max_workers: int = 8,
+    refresh_token_check: bool = False
+) -> list[dict[str, Any]]:
+    accounts = load_config().get("accounts", [])
+    if not accounts:
+        return []
+
+    # Keyring backends are not guaranteed to be thread-safe, so look tokens up before fanning out.
+    tokens = [get_token(account["username"]) for account in accounts]
+    workers = max(1, min(max_workers, len(accounts)))
+    request_timeout = max(0.1, min(5.0, deadline_seconds))
+
+    client = GitHubApiClient(
+        pool_maxsize=workers,
+        max_retry_wait_seconds=min(MAX_RETRY_WAIT_SECONDS, deadline_seconds),
+        deadline_seconds=deadline_seconds
+    )
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ghmulti-validate")
+    started = time.monotonic()
+    try:
+        futures = [
+            executor.submit(_validate_account_token, account, token, client, request_timeout, refresh_token_check)
+            for account, token in zip(accounts, tokens)
+        ]
+        wait(futures, timeout=max(0.0, deadline_seconds - (time.monotonic() - started)))
+        results = []
+        for account, token, future in zip(accounts, tokens, futures):
+            if future.done() and not future.cancelled():
+                results.append(future.result())
+                continue
+            entry = _account_token_entry(account, token)
+            entry["message"] = f"Validation did not finish within the {deadline_seconds:g}s deadline."
+            results.append(entry)
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        client.close()
+
+
+def _echo_all_accounts(results: list[dict[str, Any]]) -> None:
+    if not results:
+        click.echo("No accounts configured.")
+        return
+    for entry in results:
+        prefix = "✅" if entry["valid"] is True else ("❌" if entry["valid"] is False else "ℹ️ ")
+        details = []
+        if entry["latency_ms"] is not None:
+            details.append(f"{entry['latency_ms']:.0f} ms")
+        if entry["rate_limit"]["remaining"] is not None:
+            details.append(f"{entry['rate_limit']['remaining']}/{entry['rate_limit']['limit']} requests left")
+        suffix = f" ({', '.join(details)})" if details else ""
+        click.echo(f"{prefix} {entry['account']} ({entry['username']}): {entry['message']}{suffix}")
+
+
 def _echo_identity(label: str, identity: dict[str, Optional[str]]) -> None:
     if any(identity.values()):
         click.echo(
@@ -100,9 +223,32 @@ def _echo_identity(label: str, identity: dict[str, Optional[str]]) -> None:
 @click.command(name="status")
 @click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
 @click.option("--skip-token-check", is_flag=True, help="Skip online GitHub token validation.")
-def status(json_output: bool, skip_token_check: bool):
+@click.option("--refresh-token-check", is_flag=True, help="Revalidate the token even if a cached result is still fresh.")
+@click.option("--all-accounts", is_flag=True, help="Validate the tokens of every configured account concurrently.")
+@click.option("--deadline", type=click.FloatRange(min=0.1), default=10.0, show_default=True, help="Overall time limit in seconds for --all-accounts.")
+@click.option("--workers", type=click.IntRange(min=1), default=8, show_default=True, help="Concurrent validations for --all-accounts.")
+def status(
+    json_output: bool,
+    skip_token_check: bool,
+    refresh_token_check: bool,
+    all_accounts: bool,
+    deadline: float,
+    workers: int
+):
     """Show the current ghmulti status and active account."""
-    payload = build_status_payload(skip_token_check=skip_token_check)
+    if all_accounts:
+        results = build_all_accounts_payload(deadline, workers, refresh_token_check)
+        if json_output:
+            click.echo(json.dumps(results, indent=2))
+        else:
+            _echo_all_accounts(results)
+        return
+
+    payload = None
+    if not refresh_token_check:
+        payload = query_daemon("status", {"cwd": os.getcwd(), "skip_token_check": skip_token_check})
+    if payload is None:
+        payload = build_status_payload(skip_token_check=skip_token_check, refresh_token_check=refresh_token_check)
 
     if json_output:
         click.echo(json.dumps(payload, indent=2))
@@ -130,6 +276,9 @@ def status(json_output: bool, skip_token_check: bool):
             f"✨ Effective active account for this repository: '{effective_active_account['name']}' "
             f"({effective_active_account['username']})"
         )
+        matched_rule = payload.get("matched_rule")
+        if matched_rule:
+            click.echo(f"📁 Selected by directory rule: {matched_rule['pattern']}")
     else:
         click.echo("❌ No effective active account found for this repository.")
 
@@ -144,6 +293,8 @@ def status(json_output: bool, skip_token_check: bool):
     if token["present"]:
         prefix = "✅" if token["valid"] is True else ("❌" if token["valid"] is False else "ℹ️ ")
         click.echo(f"{prefix} {token['message']}")
+        if token["source"] == "cache":
+            click.echo(f"   (cached result, {token['age_seconds']:.0f}s old)")
     else:
         click.echo(f"ℹ️  {token['message']}")
 
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+
+import click
+
+from cli.registry import RepoRegistry
+from cli.registry import normalize_repo_path
+from cli.scanner import scan_repositories
+from cli.sync import DEFAULT_PER_HOST
+from cli.sync import DEFAULT_SYNC_TIMEOUT_SECONDS
+from cli.sync import DEFAULT_SYNC_WORKERS
+from cli.sync import plan_sync
+from cli.sync import sync_repositories
+
+
+def _collect_paths(paths, scan_roots, from_stdin, account_name) -> list[str]:
+    collected = [normalize_repo_path(path) for path in paths]
+    for root in scan_roots:
+        found = [repository.path for repository in scan_repositories(root) if not repository.error]
+        collected.extend(sorted(found))
+    if from_stdin:
+        collected.extend(normalize_repo_path(line.strip()) for line in sys.stdin if line.strip())
+    if not paths and not scan_roots and not from_stdin:
+        with RepoRegistry() as registry:
+            entries = registry.repos_for(account_name) if account_name else registry.all()
+        collected.extend(entry.path for entry in entries)
+    return [path for path in collected if os.path.isdir(path)]
+
+
+@click.command(name="sync")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, file_okay=False))
+@click.option("--scan", "scan_roots", multiple=True, type=click.Path(exists=True, file_okay=False),
+              help="Sync every repository found under this directory.")
+@click.option("--stdin", "from_stdin", is_flag=True, help="Read repository paths from standard input, one per line.")
+@click.option("--account", "account_name", default=None, help="Only sync repositories that use this account.")
+@click.option("--remote", default=None, help="Remote to sync (default: the linked account remote or 'origin').")
+@click.option("--pull", is_flag=True, help="Fast-forward the current branch instead of only fetching.")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_SYNC_WORKERS, show_default=True)
+@click.option("--per-host", type=click.IntRange(min=1), default=DEFAULT_PER_HOST, show_default=True,
+              help="Maximum concurrent operations against one host.")
+@click.option("--timeout", "timeout_seconds", type=click.FloatRange(min=1), default=DEFAULT_SYNC_TIMEOUT_SECONDS,
+              show_default=True, help="Per-repository timeout in seconds.")
+@click.option("--json", "json_output", is_flag=True, help="Stream one JSON object per repository (NDJSON), then a summary.")
+def sync(paths, scan_roots, from_stdin, account_name, remote, pull, workers, per_host, timeout_seconds, json_output):
+    """Fetch (or pull) many repositories concurrently, each with its linked account's credentials.
+
+    Without PATHS, --scan or --stdin, every repository in the registry is synced.
+    """
+    targets = plan_sync(_collect_paths(paths, scan_roots, from_stdin, account_name), account_name, remote)
+    if not targets:
+        if json_output:
+            click.echo(json.dumps({"event": "summary", "total": 0, "ok": 0, "error": 0, "bytes_received": 0}))
+        else:
+            click.echo("ℹ️  No repositories to sync.")
+        return
+
+    ok = failed = received = 0
+    for result in sync_repositories(
+        targets, pull=pull, workers=workers, per_host=per_host, timeout_seconds=timeout_seconds
+    ):
+        if result.status == "ok":
+            ok += 1
+        else:
+            failed += 1
+        received += result.bytes_received or 0
+        if json_output:
+            click.echo(json.dumps({"event": "repository", **result.to_dict()}))
+        elif result.status == "ok":
+            click.echo(f"✅ {result.path} ({result.remote}, {result.duration_ms:.0f} ms, {result.bytes_received or 0} bytes)")
+        else:
+            click.echo(f"❌ {result.path} ({result.remote}): {result.error}")
+
+    if json_output:
+        click.echo(json.dumps({
+            "event": "summary", "total": len(targets), "ok": ok, "error": failed, "bytes_received": received
+        }))
+    else:
+        click.echo(f"🔄 Synced {ok}/{len(targets)} repositories ({received} bytes received).")
+    if failed:
+        raise SystemExit(1)
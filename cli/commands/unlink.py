@@ -1,11 +1,11 @@
 import json
-import os
 
 import click
 
 from cli.config import clear_linked_account
 from cli.config import get_linked_account
 from cli.config import unset_git_config_value
+from cli.git_config import discover_repository
 
 
 @click.command(name="unlink")
@@ -17,9 +17,10 @@ from cli.config import unset_git_config_value
 )
 def unlink_account(json_output, reset_local_git):
     """Unlink the current repository from a ghmulti account."""
-    repo_path = "."
-    if not os.path.exists(os.path.join(repo_path, ".git")):
+    repository = discover_repository(".")
+    if repository is None or repository.work_tree is None:
         raise click.ClickException("This does not appear to be a git repository.")
+    repo_path = str(repository.work_tree)
 
     linked_account = get_linked_account(repo_path=repo_path)
     clear_linked_account(repo_path=repo_path)
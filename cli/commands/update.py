@@ -1,10 +1,12 @@
 import click
 
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
 from cli.config import delete_token
 from cli.config import get_token
-from cli.config import load_config
-from cli.config import save_config
 from cli.config import set_token
+from cli.identity import sync_identities
 
 
 @click.command(name="update")
@@ -20,57 +22,61 @@ def update_account(account_name, username, gpg_key_id, ssh_key_path, token, clea
     if token and clear_token:
         raise click.ClickException("Use either --token or --clear-token, not both.")
 
-    data = load_config()
-    target = next((account for account in data.get("accounts", []) if account["name"] == account_name), None)
-    if not target:
-        raise click.ClickException(f"Account '{account_name}' not found.")
+    with config_transaction() as data:
+        position = AccountIndex.from_dicts(data["accounts"]).position(account_name)
+        if position is None:
+            raise click.ClickException(f"Account '{account_name}' not found.")
+        target = data["accounts"][position]
 
-    old_username = target["username"]
-    changed = False
+        old_username = target["username"]
+        changed = False
 
-    if username:
-        target["username"] = username.strip()
-        changed = True
+        if username:
+            target["username"] = username.strip()
+            changed = True
 
-    if gpg_key_id is not None:
-        clean_gpg = gpg_key_id.strip()
-        if clean_gpg:
-            target["gpg_key_id"] = clean_gpg
-        else:
-            target.pop("gpg_key_id", None)
-        changed = True
+        if gpg_key_id is not None:
+            clean_gpg = gpg_key_id.strip()
+            if clean_gpg:
+                target["gpg_key_id"] = clean_gpg
+            else:
+                target.pop("gpg_key_id", None)
+            changed = True
 
-    if ssh_key_path is not None:
-        clean_ssh = ssh_key_path.strip()
-        if clean_ssh:
-            target["ssh_key_path"] = clean_ssh
-        else:
-            target.pop("ssh_key_path", None)
-        changed = True
+        if ssh_key_path is not None:
+            clean_ssh = ssh_key_path.strip()
+            if clean_ssh:
+                target["ssh_key_path"] = clean_ssh
+            else:
+                target.pop("ssh_key_path", None)
+            changed = True
 
-    if set_active:
-        data["active"] = target["name"]
-        changed = True
+        if set_active:
+            data["active"] = target["name"]
+            changed = True
+        new_username = target["username"]
+        with include_mode_errors("update the identity fragment"):
+            sync_identities(data["accounts"], data.get("active"))
 
-    if old_username != target["username"]:
+    # Keyring calls can block on an unlock prompt, so they run after the config lock is released.
+    if old_username != new_username:
         existing_old_token = get_token(old_username)
         if existing_old_token and token is None and not clear_token:
-            set_token(target["username"], existing_old_token)
+            set_token(new_username, existing_old_token)
         delete_token(old_username)
 
     if token is not None:
         token_value = token.strip()
         if token_value:
-            set_token(target["username"], token_value)
+            set_token(new_username, token_value)
             changed = True
 
     if clear_token:
-        delete_token(target["username"])
+        delete_token(new_username)
         changed = True
 
     if not changed:
         click.echo("No changes requested.")
         return
 
-    save_config(data)
     click.echo(f"✅ Updated account '{account_name}'.")
@@ -2,37 +2,56 @@ import os
 import json
 import click
 import subprocess
-import inquirer
-from cli.config import get_account_by_name
+from cli.accounts import AccountIndex
+from cli.commands.identity import include_mode_errors
+from cli.config import config_transaction
 from cli.config import load_config
-from cli.config import save_config
+from cli.git_utils import GitConfigSnapshot
+from cli.identity import fragment_path
+from cli.identity import sync_identities
 
 
-def switch_account_logic(account_name):
-    config = load_config()
-    match = get_account_by_name(account_name)
+def _set_global_value(git_config: GitConfigSnapshot, key: str, value: str) -> None:
+    if git_config.get(key, scope="--global") != value:
+        subprocess.run(["git", "config", "--global", key, value], check=True)
+
+
+def _unset_global_value(git_config: GitConfigSnapshot, key: str) -> None:
+    if git_config.has(key, scope="--global"):
+        subprocess.run(["git", "config", "--global", "--unset-all", key], check=False)
 
-    if not match:
-        raise click.ClickException(f"No account named '{account_name}' found.")
 
-    config["active"] = account_name
-    save_config(config)
+def switch_account_logic(account_name):
+    with config_transaction() as config:
+        position = AccountIndex.from_dicts(config["accounts"]).position(account_name)
+        if position is None:
+            raise click.ClickException(f"No account named '{account_name}' found.")
+        match = config["accounts"][position]
+        config["active"] = account_name
+        # Include mode: the managed block's default include switches identity in one write.
+        with include_mode_errors("switch the default identity"):
+            block = sync_identities(config["accounts"], account_name)
+
+    if block is not None:
+        click.echo(f"✅ Default git identity now comes from: {fragment_path(account_name)}")
+        return match
 
+    git_config = GitConfigSnapshot.load()
     try:
         # Configure git user globally
-        subprocess.run(["git", "config", "--global", "user.name", match["username"]], check=True)
-        subprocess.run(["git", "config", "--global", "user.email", f'{match["username"]}@users.noreply.github.com'], check=True)
+        _set_global_value(git_config, "user.name", match["username"])
+        _set_global_value(git_config, "user.email", f'{match["username"]}@users.noreply.github.com')
     except subprocess.CalledProcessError as exc:
         raise click.ClickException(f"Failed to set global git identity: {exc}") from exc
 
     # Configure GPG signing key if provided
     gpg_key_id = match.get("gpg_key_id")
     if gpg_key_id:
-        subprocess.run(["git", "config", "--global", "user.signingkey", gpg_key_id], check=True)
+        _set_global_value(git_config, "user.signingkey", gpg_key_id)
         click.echo(f"✅ Global Git GPG signing key set to: {gpg_key_id}")
     else:
         # Unset if not provided
-        subprocess.run(["git", "config", "--global", "--unset-all", "user.signingkey"], check=False)
+        _unset_global_value(git_config, "user.signingkey")
         click.echo("ℹ️  Global Git GPG signing key unset.")
 
     # Configure SSH command if SSH key path is provided
@@ -40,11 +59,11 @@ def switch_account_logic(account_name):
     if ssh_key_path:
         # Use ssh-agent for better security and management
         ssh_command = f"ssh -i {os.path.expanduser(ssh_key_path)}"
-        subprocess.run(["git", "config", "--global", "core.sshCommand", ssh_command], check=True)
+        _set_global_value(git_config, "core.sshCommand", ssh_command)
         click.echo(f"✅ Global Git SSH command set to: {ssh_command}")
     else:
         # Unset if not provided
-        subprocess.run(["git", "config", "--global", "--unset-all", "core.sshCommand"], check=False)
+        _unset_global_value(git_config, "core.sshCommand")
         click.echo("ℹ️  Global Git SSH command unset.")
 
     return match
@@ -72,6 +91,8 @@ def use_account(account_name, json_output):
 
         account_choices = [acc["name"] for acc in accounts]
 
+        import inquirer
+
         questions = [
             inquirer.List(
                 "account",
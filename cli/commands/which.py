@@ -0,0 +1,28 @@
+import json
+import os
+
+import click
+
+from cli.config import project_root
+from cli.config import resolve_account
+
+
+@click.command(name="which")
+@click.argument("path", required=False, default=".", type=click.Path())
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def which(path, json_output):
+    """Show which account applies at PATH and why; cheap enough to run from a shell prompt."""
+    resolution = resolve_account(repo_path=path)
+    if json_output:
+        click.echo(json.dumps({
+            "path": os.path.abspath(path),
+            "root": os.path.abspath(project_root(path)),
+            **resolution.to_dict()
+        }))
+        return
+
+    account = resolution.account
+    if not account:
+        raise click.ClickException(f"No account applies at {path}.")
+    reason = f"rule {resolution.rule.pattern}" if resolution.rule else resolution.source
+    click.echo(f"{account['name']} ({account['username']}) [{reason}]")
@@ -0,0 +1,31 @@
+import json
+import os
+from typing import Any
+
+import click
+
+from cli.config import resolve_account
+from cli.daemon import query_daemon
+
+
+def build_whoami_payload(repo_path: str = ".") -> dict[str, Any]:
+    return resolve_account(repo_path=repo_path).to_dict()
+
+
+@click.command(name="whoami")
+@click.option("--json", "json_output", is_flag=True, help="Output machine-readable JSON.")
+def whoami(json_output):
+    """Show the effective account for the current repository."""
+    payload = query_daemon("whoami", {"cwd": os.getcwd()})
+    if payload is None:
+        payload = build_whoami_payload()
+
+    if json_output:
+        click.echo(json.dumps(payload, indent=2))
+        return
+
+    account = payload["account"]
+    if not account:
+        click.echo("❌ No effective active account found.")
+        return
+    click.echo(f"{account['name']} ({account['username']}) [{payload['source']}]")
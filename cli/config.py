@@ -1,18 +1,54 @@
+import errno
 import json
 import os
 import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from copy import deepcopy
+from dataclasses import dataclass
 from pathlib import Path
+from pathlib import PurePath
 from typing import Any
+from typing import BinaryIO
+from typing import Iterator
 from typing import Optional
 
-import keyring
+from cli.accounts import Account
+from cli.accounts import AccountIndex
+from cli.rules import DirectoryRule
+from cli.rules import RuleTrie
+from cli.rules import compile_pattern
+from cli.rules import normalize_rules
 
 KEYRING_SERVICE = "ghmulti"
 LINKED_GIT_CONFIG_KEY = "ghmulti.linkedaccount"
 CONFIG_PATH = Path.home() / ".ghmulti.json"
 PROJECT_CONFIG_FILE = ".ghmulti"
+STATE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ghmulti"
+# What cannot be rebuilt for free (the linked-repository registry) stays out of the cache directory.
+DATA_DIR = Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state") / "ghmulti"
 DEFAULT_CONFIG = {"accounts": [], "active": None}
+# Files modified this close to being cached may change again without a visible
+# (mtime, size, inode) difference on coarse-timestamp filesystems.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class _CachedConfig:
+    signature: tuple[int, int, int]
+    raw: bytes
+    config: dict[str, Any]
+    index: AccountIndex
+    verified_at_ns: int
+
+
+_config_cache: dict[Path, _CachedConfig] = {}
+_config_cache_lock = threading.Lock()
+_config_parse_count = 0
+# Lock depth and open config_transaction() on this thread; only the outermost level takes the file lock.
+_transaction_state = threading.local()
 
 
 def _as_path(value: str | Path) -> Path:
@@ -26,67 +62,367 @@ def _project_config_path(repo_path: str | Path = ".") -> Path:
     return _as_path(repo_path) / project_config
 
 
-def _normalize_config(raw: Any) -> dict[str, Any]:
+def project_root(repo_path: str | Path = ".") -> Path:
+    """The repository (or `.ghmulti`-linked directory) enclosing `repo_path`; `repo_path` itself outside one."""
+    from cli.git_config import find_project_root
+
+    project_config = _as_path(PROJECT_CONFIG_FILE)
+    root = find_project_root(repo_path, marker=project_config.name)
+    return root if root is not None else _as_path(repo_path)
+
+
+def _normalize(raw: Any) -> tuple[dict[str, Any], AccountIndex]:
     if not isinstance(raw, dict):
-        return deepcopy(DEFAULT_CONFIG)
-
-    accounts = raw.get("accounts", [])
-    normalized_accounts = []
-    if isinstance(accounts, list):
-        for account in accounts:
-            if not isinstance(account, dict):
-                continue
-            name = account.get("name")
-            username = account.get("username")
-            if not isinstance(name, str) or not name.strip():
-                continue
-            if not isinstance(username, str) or not username.strip():
-                continue
-            normalized_account = {
-                "name": name.strip(),
-                "username": username.strip()
-            }
-            gpg_key_id = account.get("gpg_key_id")
-            if isinstance(gpg_key_id, str) and gpg_key_id.strip():
-                normalized_account["gpg_key_id"] = gpg_key_id.strip()
-
-            ssh_key_path = account.get("ssh_key_path")
-            if isinstance(ssh_key_path, str) and ssh_key_path.strip():
-                normalized_account["ssh_key_path"] = ssh_key_path.strip()
-
-            normalized_accounts.append(normalized_account)
+        return deepcopy(DEFAULT_CONFIG), AccountIndex()
 
+    index = AccountIndex.from_dicts(raw.get("accounts", []))
     active = raw.get("active")
     if not isinstance(active, str) or not active.strip():
         active = None
     else:
         active = active.strip()
 
-    if active and active not in {account["name"] for account in normalized_accounts}:
+    if active and active not in index:
         active = None
 
-    return {"accounts": normalized_accounts, "active": active}
+    config = {"accounts": index.to_dicts(), "active": active}
+    # Only written when present, so configs without directory rules keep their original shape.
+    rules = normalize_rules(raw.get("rules"))
+    if rules:
+        config["rules"] = rules
+    return config, index
 
 
-def load_config() -> dict[str, Any]:
+def _normalize_config(raw: Any) -> dict[str, Any]:
+    return _normalize(raw)[0]
+
+
+def _copy_config(config: dict[str, Any]) -> dict[str, Any]:
+    # Normalized accounts and rules only hold strings, so copying each dict is a full copy.
+    copied = {"accounts": [dict(account) for account in config["accounts"]], "active": config["active"]}
+    if "rules" in config:
+        copied["rules"] = [dict(rule) for rule in config["rules"]]
+    return copied
+
+
+def _stat_signature(stat_result: os.stat_result) -> tuple[int, int, int]:
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+def _parse_config(raw: bytes) -> tuple[dict[str, Any], AccountIndex]:
+    global _config_parse_count
+    _config_parse_count += 1
+    try:
+        return _normalize(json.loads(raw.decode("utf-8")))
+    except ValueError:
+        return deepcopy(DEFAULT_CONFIG), AccountIndex()
+
+
+def config_parse_count() -> int:
+    return _config_parse_count
+
+
+def clear_config_cache() -> None:
+    with _config_cache_lock:
+        _config_cache.clear()
+
+
+def _load_json_shared() -> tuple[dict[str, Any], AccountIndex]:
+    """The cached config and its index; callers must not modify either."""
     config_path = _as_path(CONFIG_PATH)
-    if not config_path.exists():
-        return deepcopy(DEFAULT_CONFIG)
+    try:
+        signature = _stat_signature(config_path.stat())
+    except OSError:
+        return DEFAULT_CONFIG, AccountIndex()
+
+    checked_at_ns = time.time_ns()
+    with _config_cache_lock:
+        cached = _config_cache.get(config_path)
+    if cached and cached.signature == signature and signature[0] < cached.verified_at_ns - RACY_WINDOW_NS:
+        return cached.config, cached.index
 
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        return _normalize_config(raw)
-    except (json.JSONDecodeError, OSError):
-        return deepcopy(DEFAULT_CONFIG)
+        raw = config_path.read_bytes()
+    except OSError:
+        return DEFAULT_CONFIG, AccountIndex()
 
+    if cached and cached.signature == signature and cached.raw == raw:
+        cached.verified_at_ns = checked_at_ns
+        return cached.config, cached.index
 
-def save_config(data: dict[str, Any]) -> None:
+    config, index = _parse_config(raw)
+    with _config_cache_lock:
+        _config_cache[config_path] = _CachedConfig(signature, raw, config, index, checked_at_ns)
+    return config, index
+
+
+def load_json_config() -> dict[str, Any]:
+    return _copy_config(_load_json_shared()[0])
+
+
+def _write_atomically(path: Path, raw: bytes) -> None:
+    # Readers see either the old file or the new one, never a truncated mix (even after a crash).
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if os.name != "nt":
+        directory_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+def load_json_file(path: Path) -> dict[str, Any]:
+    """The JSON object stored at `path`; {} when it is missing, unreadable or not an object."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomically(path: Path, data: Any) -> None:
+    # Serialized before anything touches the disk, so a value json cannot encode leaves no temp file behind.
+    raw = json.dumps(data, indent=2).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomically(path, raw)
+
+
+def save_json_config(data: dict[str, Any]) -> None:
     config_path = _as_path(CONFIG_PATH)
-    normalized = _normalize_config(data)
+    normalized, index = _normalize(data)
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(normalized, f, indent=2)
+    raw = json.dumps(normalized, indent=2).encode("utf-8")
+    written_at_ns = time.time_ns()
+    with _config_cache_lock:
+        _config_cache.pop(config_path, None)
+    _write_atomically(config_path, raw)
+
+    # Seed the cache with what was just written so the next load skips the parse.
+    signature = _stat_signature(config_path.stat())
+    with _config_cache_lock:
+        _config_cache[config_path] = _CachedConfig(signature, raw, normalized, index, written_at_ns)
+
+
+def _config_lock_path() -> Path:
+    config_path = _as_path(CONFIG_PATH)
+    return config_path.with_name(f"{config_path.name}.lock")
+
+
+def _lock_file(lock_file: BinaryIO) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        lock_file.seek(0)
+        while True:
+            try:
+                # LK_LOCK itself gives up after ten one-second retries; keep waiting like flock does.
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError as exc:
+                if exc.errno not in (errno.EDEADLK, errno.EACCES):
+                    raise
+    import fcntl
+
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(lock_file: BinaryIO) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    import fcntl
+
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+
+@contextmanager
+def json_file_transaction(path: Path) -> Iterator[dict[str, Any]]:
+    """Read-modify-write a JSON state file under `<path>.lock`, exclusive across threads and processes.
+
+    The yielded object is written back atomically if the block changed it. Raises OSError.
+    """
+    with _file_lock(path.with_name(f"{path.name}.lock")):
+        data = load_json_file(path)
+        original = deepcopy(data)
+        yield data
+        if data != original:
+            write_json_atomically(path, data)
+
+
+@contextmanager
+def _config_lock() -> Iterator[None]:
+    depth = getattr(_transaction_state, "depth", 0)
+    if depth:
+        _transaction_state.depth = depth + 1
+        try:
+            yield
+        finally:
+            _transaction_state.depth = depth
+        return
+
+    with _file_lock(_config_lock_path()):
+        _transaction_state.depth = 1
+        try:
+            yield
+        finally:
+            _transaction_state.depth = 0
+
+
+@contextmanager
+def config_transaction() -> Iterator[dict[str, Any]]:
+    """Read-modify-write the account config under an exclusive advisory lock.
+
+    The yielded config is saved when the block exits cleanly and changed it; an
+    exception discards the changes. Keep slow work (prompts, keyring, git) outside.
+    """
+    outer = getattr(_transaction_state, "data", None)
+    if outer is not None:
+        # Nested transactions work on the outer one's config and commit with it.
+        yield outer
+        return
+
+    with _config_lock():
+        data = load_config()
+        original = _copy_config(data)
+        _transaction_state.data = data
+        try:
+            yield data
+        finally:
+            _transaction_state.data = None
+        # `original` came out of load_config() already normalized.
+        if data != original and _normalize_config(data) != original:
+            save_config(data)
+
+
+def _open_account_store():
+    from cli.account_store import open_account_store
+
+    return open_account_store()
+
+
+def load_config() -> dict[str, Any]:
+    return _copy_config(_load_shared()[0])
+
+
+def save_config(data: dict[str, Any]) -> None:
+    with _config_lock():
+        store = _open_account_store()
+        if store is None:
+            save_json_config(data)
+            return
+        normalized, index = _normalize(data)
+        written_at_ns = time.time_ns()
+        with _config_cache_lock:
+            _config_cache.pop(store.path, None)
+        with store:
+            store.replace(normalized)
+        # Seed the cache like save_json_config does, so the next load skips the database.
+        version = _store_version(store.path)
+        if version is not None:
+            with _config_cache_lock:
+                _config_cache[store.path] = _CachedConfig(version[0], version[1], normalized, index, written_at_ns)
+
+
+def _store_version(db_path: Path) -> Optional[tuple[tuple[int, int, int], bytes]]:
+    # SQLite bumps the header's file change counter on every commit in rollback-journal mode,
+    # so it plays the part the raw bytes play for the JSON file inside the racy window.
+    try:
+        with open(db_path, "rb") as db_file:
+            signature = _stat_signature(os.fstat(db_file.fileno()))
+            header = db_file.read(100)
+    except OSError:
+        return None
+    return signature, header[24:28]
+
+
+def _load_store_shared() -> tuple[dict[str, Any], AccountIndex]:
+    """The SQLite store's config, cached on the database file like the JSON file is."""
+    from cli.account_store import AccountStore
+    from cli.account_store import account_store_path
+
+    db_path = account_store_path()
+    version = _store_version(db_path)
+    checked_at_ns = time.time_ns()
+    with _config_cache_lock:
+        cached = _config_cache.get(db_path)
+    if cached and version and cached.signature == version[0]:
+        if version[0][0] < cached.verified_at_ns - RACY_WINDOW_NS:
+            return cached.config, cached.index
+        if cached.raw == version[1]:
+            cached.verified_at_ns = checked_at_ns
+            return cached.config, cached.index
+
+    with AccountStore(db_path) as store:
+        config, index = _normalize(store.load())
+    if version is not None:
+        with _config_cache_lock:
+            _config_cache[db_path] = _CachedConfig(version[0], version[1], config, index, checked_at_ns)
+    return config, index
+
+
+def _load_shared() -> tuple[dict[str, Any], AccountIndex]:
+    from cli.account_store import account_store_backend
+
+    if account_store_backend() != "sqlite":
+        return _load_json_shared()
+    return _load_store_shared()
+
+
+def load_account_index() -> AccountIndex:
+    """Accounts indexed by name and username, built once per config load; treat it as read-only."""
+    return _load_shared()[1]
+
+
+_rule_trie_cache: tuple[Optional[list], RuleTrie] = (None, RuleTrie())
+
+
+def _rule_trie(config: dict[str, Any]) -> RuleTrie:
+    global _rule_trie_cache
+    rules = config.get("rules")
+    if not rules:
+        return RuleTrie()
+    # The shared config object is reused until the file changes, so its rule list identifies the trie.
+    cached_rules, trie = _rule_trie_cache
+    if cached_rules is not rules:
+        trie = RuleTrie.from_dicts(rules)
+        _rule_trie_cache = (rules, trie)
+    return trie
+
+
+def load_rule_trie() -> RuleTrie:
+    """Directory rules compiled into a prefix trie, rebuilt only when the config changes; treat it as read-only."""
+    return _rule_trie(_load_shared()[0])
+
+
+def _as_dict(account: Optional[Account]) -> Optional[dict[str, Any]]:
+    return account.to_dict() if account else None
 
 
 def get_accounts() -> list[dict[str, Any]]:
@@ -94,44 +430,37 @@ def get_accounts() -> list[dict[str, Any]]:
 
 
 def get_account_by_name(account_name: str) -> Optional[dict[str, Any]]:
-    for account in get_accounts():
-        if account.get("name") == account_name:
-            return account
-    return None
+    store = _open_account_store()
+    if store is not None:
+        with store:
+            return store.get(account_name)
+    return _as_dict(load_account_index().by_name(account_name))
+
+
+def get_account_by_username(username: str) -> Optional[dict[str, Any]]:
+    store = _open_account_store()
+    if store is not None:
+        with store:
+            return store.get_by_username(username)
+    return _as_dict(load_account_index().by_username(username))
 
 
 def set_active_account(account_name: Optional[str]) -> None:
-    data = load_config()
-    if account_name is not None and not get_account_by_name(account_name):
-        raise ValueError(f"Account '{account_name}' does not exist.")
-    data["active"] = account_name
-    save_config(data)
+    with config_transaction() as data:
+        if account_name is not None and account_name not in AccountIndex.from_dicts(data["accounts"]):
+            raise ValueError(f"Account '{account_name}' does not exist.")
+        data["active"] = account_name
 
 
 def get_active_account_from_global_config() -> Optional[dict[str, Any]]:
-    data = load_config()
-    active_name = data.get("active")
-    if not active_name:
-        return None
-    return next((account for account in data.get("accounts", []) if account["name"] == active_name), None)
+    data, index = _load_shared()
+    return _as_dict(index.by_name(data.get("active")))
 
 
 def get_git_config_value(scope: str, key: str, cwd: str | Path | None = None) -> Optional[str]:
-    try:
-        output = subprocess.check_output(
-            ["git", "config", scope, key],
-            stderr=subprocess.PIPE,
-            cwd=str(cwd) if cwd else None,
-            text=True
-        )
-        if isinstance(output, subprocess.CalledProcessError):
-            return None
-        if isinstance(output, bytes):
-            output = output.decode()
-        output = str(output).strip()
-        return output or None
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return None
+    from cli.git_utils import GitConfigSnapshot
+
+    return GitConfigSnapshot.load(cwd or ".").get(key, scope=scope)
 
 
 def set_git_config_value(scope: str, key: str, value: str, cwd: str | Path | None = None) -> None:
@@ -151,7 +480,8 @@ def unset_git_config_value(scope: str, key: str, cwd: str | Path | None = None)
 
 
 def get_linked_account(repo_path: str | Path = ".") -> Optional[str]:
-    project_path = _project_config_path(repo_path)
+    # Subdirectories of a linked repository share its link.
+    project_path = _project_config_path(project_root(repo_path))
     if project_path.exists():
         try:
             with open(project_path, "r", encoding="utf-8") as f:
@@ -166,13 +496,19 @@ def get_linked_account(repo_path: str | Path = ".") -> Optional[str]:
     return None
 
 
-def set_linked_account(account_name: str, repo_path: str | Path = ".") -> None:
+def set_linked_account(account_name: str, repo_path: str | Path = ".", sync_git_config: bool = True) -> None:
     project_path = _project_config_path(repo_path)
     with open(project_path, "w", encoding="utf-8") as f:
         json.dump({"account": account_name}, f, indent=2)
 
     # Keep local git config in sync for compatibility with older tooling.
-    set_git_config_value("--local", LINKED_GIT_CONFIG_KEY, account_name, cwd=repo_path)
+    # Callers that batch their own local config writes pass sync_git_config=False and include the key.
+    if sync_git_config:
+        set_git_config_value("--local", LINKED_GIT_CONFIG_KEY, account_name, cwd=repo_path)
+
+    from cli.registry import record_link
+
+    record_link(repo_path, account_name)
 
 
 def clear_linked_account(repo_path: str | Path = ".") -> None:
@@ -182,30 +518,89 @@ def clear_linked_account(repo_path: str | Path = ".") -> None:
 
     unset_git_config_value("--local", LINKED_GIT_CONFIG_KEY, cwd=repo_path)
 
+    from cli.registry import forget_link
 
-def get_active_account(repo_path: str | Path = ".") -> Optional[dict[str, Any]]:
-    data = load_config()
+    forget_link(repo_path)
+
+
+@dataclass
+class AccountResolution:
+    account: Optional[dict[str, Any]]
+    # "linked" (.ghmulti), "rule" (directory rule), "include" (includeIf rule), "global" or None.
+    source: Optional[str]
+    rule: Optional[DirectoryRule] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "account": self.account,
+            "source": self.source,
+            "rule": self.rule.to_dict() if self.rule else None,
+        }
+
+
+def resolve_account(repo_path: str | Path = ".") -> AccountResolution:
+    """Which account applies at `repo_path`: an explicit .ghmulti link, then the deepest directory or include rule, then the global one."""
+    data, index = _load_shared()
     linked_account_name = get_linked_account(repo_path=repo_path)
     if linked_account_name:
-        linked_account = next(
-            (account for account in data.get("accounts", []) if account["name"] == linked_account_name),
-            None
-        )
+        linked_account = index.by_name(linked_account_name)
         if linked_account:
-            return linked_account
+            return AccountResolution(linked_account.to_dict(), "linked")
+
+    from cli.identity import include_rule_for
+
+    root = project_root(repo_path)
+    rule = _rule_trie(data).match(root)
+    # Repositories covered by an include rule but never linked one by one (e.g. `link --recursive`).
+    # Git applies the deepest gitdir include, so it beats a directory rule that matches higher up.
+    include = include_rule_for(root)
+    if include and (rule is None or len(PurePath(include.directory).parts) >= len(compile_pattern(rule.pattern)[0])):
+        included_account = index.by_name(include.account)
+        if included_account:
+            return AccountResolution(included_account.to_dict(), "include")
 
-    return get_active_account_from_global_config()
+    if rule:
+        ruled_account = index.by_name(rule.account)
+        if ruled_account:
+            return AccountResolution(ruled_account.to_dict(), "rule", rule)
+
+    active = index.by_name(data.get("active"))
+    return AccountResolution(_as_dict(active), "global" if active else None)
+
+
+def get_active_account(repo_path: str | Path = ".") -> Optional[dict[str, Any]]:
+    return resolve_account(repo_path).account
 
 
 def get_token(username: str) -> Optional[str]:
+    from cli.agent import agent_token
+
+    # A running `ghmulti agent` answers from memory and saves a keyring round trip (and unlock prompt).
+    answered, token = agent_token(username)
+    if answered:
+        return token
+
+    import keyring
+
     return keyring.get_password(KEYRING_SERVICE, username)
 
 
 def set_token(username: str, token: str) -> None:
+    import keyring
+
+    from cli.agent import forget_agent_token
+
     keyring.set_password(KEYRING_SERVICE, username, token)
+    forget_agent_token(username)
 
 
 def delete_token(username: str) -> None:
+    import keyring
+    import keyring.errors
+
+    from cli.agent import forget_agent_token
+
+    forget_agent_token(username)
     try:
         keyring.delete_password(KEYRING_SERVICE, username)
     except keyring.errors.PasswordDeleteError:
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Any
+from typing import Optional
+from urllib.parse import urlsplit
+
+from cli.config import LINKED_GIT_CONFIG_KEY
+from cli.config import get_account_by_name
+from cli.config import get_accounts
+from cli.config import get_linked_account
+from cli.config import get_token
+from cli.git_config import GitConfigError
+from cli.git_config import discover_repository
+from cli.git_config import read_repository_config_entries
+
+# GitHub accepts any username alongside a token; this is the one its docs use.
+TOKEN_USERNAME = "x-access-token"
+
+
+def parse_credential_request(text: str) -> dict[str, str]:
+    """Parse git's credential protocol input (`key=value` lines, ended by a blank line or EOF)."""
+    fields: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line:
+            break
+        key, separator, value = line.partition("=")
+        if separator:
+            fields[key] = value
+    return fields
+
+
+def format_credential(fields: dict[str, str]) -> str:
+    return "".join(f"{key}={value}\n" for key, value in fields.items())
+
+
+def github_hosts() -> set[str]:
+    """Hosts ghmulti tokens may be sent to: github.com plus the configured GitHub Enterprise host."""
+    from cli.github_api import api_base_url
+
+    hosts = {"github.com"}
+    api_host = (urlsplit(api_base_url()).hostname or "").lower()
+    if api_host:
+        hosts.add(api_host[len("api."):] if api_host.startswith("api.") else api_host)
+    return hosts
+
+
+def _linked_account_name(cwd: str | Path) -> Optional[str]:
+    repository = discover_repository(cwd)
+    if repository is None or repository.work_tree is None:
+        return None
+    linked = get_linked_account(repo_path=repository.work_tree)
+    if linked:
+        return linked
+    try:
+        values = [
+            value for _, _, key, value in read_repository_config_entries(repository)
+            if key == LINKED_GIT_CONFIG_KEY and value
+        ]
+    except GitConfigError:
+        return None
+    if not values:
+        return None
+    return values[-1].strip() or None
+
+
+def resolve_credential_account(request: dict[str, str], cwd: str | Path = ".") -> Optional[dict[str, Any]]:
+    """Account whose token answers `request`: the repository link first, then the URL's user or owner."""
+    if request.get("protocol") != "https" or request.get("host", "").lower() not in github_hosts():
+        return None
+
+    linked_name = _linked_account_name(cwd)
+    if linked_name:
+        return get_account_by_name(linked_name)
+
+    # `path` is only sent with credential.useHttpPath; its first component is the repository owner.
+    candidates = [request.get("username"), request.get("path", "").strip("/").split("/")[0]]
+    accounts = get_accounts()
+    for candidate in candidates:
+        if not candidate:
+            continue
+        account = next((item for item in accounts if item["username"].lower() == candidate.lower()), None)
+        if account:
+            return account
+    return None
+
+
+def build_credential(request: dict[str, str], cwd: str | Path = ".") -> Optional[dict[str, str]]:
+    account = resolve_credential_account(request, cwd)
+    if account is None:
+        return None
+    token = get_token(account["username"])
+    if not token:
+        return None
+    # Echo back what git asked about so it can match the answer to its request.
+    response = {key: request[key] for key in ("protocol", "host", "path") if key in request}
+    response["username"] = request.get("username") or TOKEN_USERNAME
+    response["password"] = token
+    return response
+
+
+def lookup_credential(request: dict[str, str], cwd: str | Path = ".") -> Optional[dict[str, str]]:
+    """Answer through the resident daemon when it runs, so repeated lookups skip the keyring backend."""
+    from cli.daemon import query_daemon
+
+    answer = query_daemon("credential", {"cwd": str(cwd), "request": request})
+    if answer is not None:
+        return answer.get("credential")
+    return build_credential(request, cwd)
+
+
+def forget_credentials() -> None:
+    from cli.daemon import query_daemon
+
+    query_daemon("invalidate")
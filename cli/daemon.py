@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from cli import config
+from cli.account_store import account_store_path
+from cli.ipc import RpcError
+from cli.ipc import RpcHandler
+from cli.ipc import RpcUnavailable
+from cli.ipc import call
+
+DAEMON_CACHE_MAX_AGE_SECONDS = 30.0
+DAEMON_CLIENT_TIMEOUT_SECONDS = 1.0
+DISABLE_DAEMON_ENV = "GHMULTI_NO_DAEMON"
+SOCKET_ENV = "GHMULTI_SOCKET"
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "ghmulti" / "daemon.sock"
+    return Path(config.STATE_DIR) / "daemon.sock"
+
+
+def query_daemon(method: str, params: Optional[dict[str, Any]] = None) -> Optional[Any]:
+    if os.environ.get(DISABLE_DAEMON_ENV):
+        return None
+    socket_path = default_socket_path()
+    if not socket_path.exists():
+        return None
+    try:
+        return call(socket_path, method, params, timeout=DAEMON_CLIENT_TIMEOUT_SECONDS)
+    except (RpcUnavailable, RpcError):
+        return None
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+def _global_git_config_paths() -> list[Path]:
+    xdg_config_home = os.environ.get("XDG_CONFIG_HOME")
+    xdg_base = Path(xdg_config_home) if xdg_config_home else Path.home() / ".config"
+    return [Path.home() / ".gitconfig", xdg_base / "git" / "config"]
+
+
+def _config_fingerprint() -> tuple:
+    return (_file_signature(Path(config.CONFIG_PATH)), _file_signature(account_store_path()))
+
+
+def _repo_fingerprint(repo_path: str) -> tuple:
+    from cli.git_config import discover_repository
+
+    # Answers for a subdirectory depend on the enclosing repository's link and config.
+    repository = discover_repository(repo_path)
+    watched = [
+        config._project_config_path(config.project_root(repo_path)),
+        (repository.common_dir if repository else Path(repo_path) / ".git") / "config",
+        *_global_git_config_paths(),
+    ]
+    return _config_fingerprint() + tuple(_file_signature(path) for path in watched)
+
+
+def _resolve_cwd(params: dict[str, Any]) -> str:
+    cwd = params.get("cwd")
+    if cwd is not None and not isinstance(cwd, str):
+        raise RpcError(-32602, "'cwd' must be a string.")
+    return os.path.realpath(cwd or os.getcwd())
+
+
+class DaemonService:
+    """Answers read-only queries from warm caches invalidated by config file changes."""
+
+    def __init__(self, max_age_seconds: float = DAEMON_CACHE_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stop_callback: Optional[Callable[[], None]] = None
+        self._cache: dict[tuple, tuple[tuple, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: tuple, fingerprint: tuple, builder: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] == fingerprint and now - entry[1] < self.max_age_seconds:
+                self.cache_hits += 1
+                return entry[2]
+
+        value = builder()
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[key] = (fingerprint, now, value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def handle_ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"pid": os.getpid(), "cache_hits": self.cache_hits, "cache_misses": self.cache_misses}
+
+    def handle_status(self, params: dict[str, Any]) -> dict[str, Any]:
+        from cli.commands.status import build_status_payload
+
+        repo_path = _resolve_cwd(params)
+        skip_token_check = bool(params.get("skip_token_check", False))
+        return self._cached(
+            ("status", repo_path, skip_token_check),
+            _repo_fingerprint(repo_path),
+            lambda: build_status_payload(repo_path=repo_path, skip_token_check=skip_token_check)
+        )
+
+    def handle_list(self, params: dict[str, Any]) -> dict[str, Any]:
+        def build() -> dict[str, Any]:
+            data = config.load_config()
+            return {"accounts": data.get("accounts", []), "active": data.get("active")}
+
+        return self._cached(("list",), _config_fingerprint(), build)
+
+    def handle_whoami(self, params: dict[str, Any]) -> dict[str, Any]:
+        from cli.commands.whoami import build_whoami_payload
+
+        repo_path = _resolve_cwd(params)
+        return self._cached(
+            ("whoami", repo_path),
+            _repo_fingerprint(repo_path),
+            lambda: build_whoami_payload(repo_path=repo_path)
+        )
+
+    def handle_doctor(self, params: dict[str, Any]) -> dict[str, Any]:
+        from cli.commands.doctor import build_doctor_payload
+
+        repo_path = _resolve_cwd(params)
+        return self._cached(
+            ("doctor", repo_path),
+            _repo_fingerprint(repo_path),
+            lambda: build_doctor_payload(repo_path=repo_path)
+        )
+
+    def handle_credential(self, params: dict[str, Any]) -> dict[str, Any]:
+        from cli.credential import build_credential
+
+        repo_path = _resolve_cwd(params)
+        request = params.get("request")
+        if not isinstance(request, dict) or not all(
+            isinstance(key, str) and isinstance(value, str) for key, value in request.items()
+        ):
+            raise RpcError(-32602, "'request' must be an object of strings.")
+        return self._cached(
+            ("credential", repo_path, tuple(sorted(request.items()))),
+            _repo_fingerprint(repo_path),
+            lambda: {"credential": build_credential(request, repo_path)}
+        )
+
+    def handle_invalidate(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.invalidate()
+        return {"invalidated": True}
+
+    def handle_shutdown(self, params: dict[str, Any]) -> dict[str, Any]:
+        if self.stop_callback:
+            self.stop_callback()
+        return {"stopping": True}
+
+    def handlers(self) -> dict[str, RpcHandler]:
+        return {
+            "ping": self.handle_ping,
+            "status": self.handle_status,
+            "list": self.handle_list,
+            "whoami": self.handle_whoami,
+            "doctor": self.handle_doctor,
+            "credential": self.handle_credential,
+            "invalidate": self.handle_invalidate,
+            "shutdown": self.handle_shutdown,
+        }
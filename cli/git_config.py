@@ -0,0 +1,740 @@
+import os
+import re
+import shutil
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+
+# Same racy-timestamp window as the ghmulti config cache in cli/config.py.
+RACY_WINDOW_NS = 2_000_000_000
+MAX_INCLUDE_DEPTH = 10
+_POSIX_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "digit": "0-9",
+    "lower": "a-z",
+    "upper": "A-Z",
+    "space": " \\t\\n\\r\\f\\v",
+    "xdigit": "0-9a-fA-F",
+}
+
+
+class GitConfigError(ValueError):
+    pass
+
+
+class GitConfigUnsupported(GitConfigError):
+    """Raised for config features the native reader does not evaluate; callers fall back to git."""
+
+
+@dataclass(frozen=True)
+class RawConfigEntry:
+    key: str
+    value: Optional[str]
+
+
+@dataclass(frozen=True)
+class GitRepository:
+    work_tree: Optional[Path]
+    git_dir: Path
+    common_dir: Path
+
+
+@dataclass
+class _CachedFile:
+    signature: tuple[int, int, int]
+    raw: bytes
+    entries: list[RawConfigEntry]
+    verified_at_ns: int
+
+
+_file_cache: dict[Path, _CachedFile] = {}
+_file_cache_lock = threading.Lock()
+_file_parse_count = 0
+
+
+def file_parse_count() -> int:
+    return _file_parse_count
+
+
+def clear_file_cache() -> None:
+    with _file_cache_lock:
+        _file_cache.clear()
+
+
+class _Reader:
+    def __init__(self, text: str, origin: str):
+        # git treats CRLF as LF and skips a UTF-8 BOM at the start of the file.
+        self.text = text[1:] if text.startswith("\ufeff") else text
+        self.text = self.text.replace("\r\n", "\n")
+        self.origin = origin
+        self.pos = 0
+        self.line = 1
+
+    def next_char(self) -> str:
+        if self.pos >= len(self.text):
+            self.pos += 1
+            return "\n" if self.pos == len(self.text) + 1 else ""
+        char = self.text[self.pos]
+        self.pos += 1
+        if char == "\n":
+            self.line += 1
+        return char
+
+    def error(self, message: str) -> GitConfigError:
+        return GitConfigError(f"bad config line {self.line} in {self.origin}: {message}")
+
+
+def _parse_value(reader: _Reader) -> str:
+    value: list[str] = []
+    quote = False
+    comment = False
+    spaces = 0
+    while True:
+        char = reader.next_char()
+        if char in ("\n", ""):
+            if quote:
+                raise reader.error("unterminated quote")
+            return "".join(value)
+        if comment:
+            continue
+        if char.isspace() and not quote:
+            if value:
+                spaces += 1
+            continue
+        if not quote and char in (";", "#"):
+            comment = True
+            continue
+        value.append(" " * spaces)
+        spaces = 0
+        if char == "\\":
+            escaped = reader.next_char()
+            if escaped == "\n":
+                continue
+            mapped = {"t": "\t", "b": "\b", "n": "\n", "\\": "\\", '"': '"'}.get(escaped)
+            if mapped is None:
+                raise reader.error("invalid escape sequence")
+            value.append(mapped)
+            continue
+        if char == '"':
+            quote = not quote
+            continue
+        value.append(char)
+
+
+def _parse_section_header(reader: _Reader) -> str:
+    name: list[str] = []
+    while True:
+        char = reader.next_char()
+        if char in ("\n", ""):
+            raise reader.error("unterminated section header")
+        if char == "]":
+            return "".join(name).lower()
+        if char.isspace():
+            return "".join(name).lower() + "." + _parse_subsection(reader)
+        if not (char.isalnum() or char in "-."):
+            raise reader.error(f"invalid character {char!r} in section name")
+        name.append(char)
+
+
+def _parse_subsection(reader: _Reader) -> str:
+    char = reader.next_char()
+    while char.isspace() and char != "\n":
+        char = reader.next_char()
+    if char != '"':
+        raise reader.error("expected quoted subsection")
+    subsection: list[str] = []
+    while True:
+        char = reader.next_char()
+        if char in ("\n", ""):
+            raise reader.error("unterminated subsection")
+        if char == '"':
+            break
+        if char == "\\":
+            char = reader.next_char()
+            if char in ("\n", ""):
+                raise reader.error("unterminated subsection")
+        subsection.append(char)
+    if reader.next_char() != "]":
+        raise reader.error("expected ']' after subsection")
+    return "".join(subsection)
+
+
+def parse_config_text(text: str, origin: str = "<string>") -> list[RawConfigEntry]:
+    reader = _Reader(text, origin)
+    entries: list[RawConfigEntry] = []
+    section: Optional[str] = None
+    comment = False
+    while True:
+        char = reader.next_char()
+        if char == "":
+            return entries
+        if char == "\n":
+            comment = False
+            continue
+        if comment or char.isspace():
+            continue
+        if char in ("#", ";"):
+            comment = True
+            continue
+        if char == "[":
+            section = _parse_section_header(reader)
+            continue
+        if not char.isalpha():
+            raise reader.error(f"unexpected character {char!r}")
+        if section is None:
+            raise reader.error("key outside of a section")
+
+        name = [char]
+        char = reader.next_char()
+        while char.isalnum() or char == "-":
+            name.append(char)
+            char = reader.next_char()
+        while char in (" ", "\t"):
+            char = reader.next_char()
+        key = f"{section}.{''.join(name).lower()}"
+        if char in ("\n", ""):
+            entries.append(RawConfigEntry(key, None))
+            if char == "":
+                return entries
+            continue
+        if char != "=":
+            raise reader.error(f"expected '=' after key '{key}'")
+        entries.append(RawConfigEntry(key, _parse_value(reader)))
+
+
+def _signature(stat_result: os.stat_result) -> tuple[int, int, int]:
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+def parse_config_file(path: Path) -> Optional[list[RawConfigEntry]]:
+    """Parse a git config file, reusing the previous parse while the file is unchanged."""
+    global _file_parse_count
+    try:
+        signature = _signature(path.stat())
+    except OSError:
+        return None
+
+    checked_at_ns = time.time_ns()
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+    if cached and cached.signature == signature and signature[0] < cached.verified_at_ns - RACY_WINDOW_NS:
+        return cached.entries
+
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    if cached and cached.signature == signature and cached.raw == raw:
+        cached.verified_at_ns = checked_at_ns
+        return cached.entries
+
+    _file_parse_count += 1
+    entries = parse_config_text(raw.decode("utf-8", errors="surrogateescape"), origin=str(path))
+    with _file_cache_lock:
+        _file_cache[path] = _CachedFile(signature, raw, entries, checked_at_ns)
+    return entries
+
+
+def _read_gitdir_file(path: Path) -> Optional[Path]:
+    try:
+        content = path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    target = Path(content[len("gitdir:"):].strip())
+    return target if target.is_absolute() else path.parent / target
+
+
+def _is_git_dir(path: Path) -> bool:
+    return (path / "HEAD").is_file() and (
+        (path / "objects").is_dir() or (path / "commondir").is_file()
+    ) and ((path / "refs").is_dir() or (path / "commondir").is_file())
+
+
+def _common_dir(git_dir: Path) -> Path:
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    common_path = Path(common)
+    return common_path if common_path.is_absolute() else git_dir / common_path
+
+
+def _ceiling_directories() -> set[str]:
+    raw = os.environ.get("GIT_CEILING_DIRECTORIES", "")
+    return {
+        os.path.normcase(os.path.normpath(entry))
+        for entry in raw.split(os.pathsep)
+        if entry and os.path.isabs(entry)
+    }
+
+
+def _search_directories(start: Path) -> list[tuple[Path, os.stat_result]]:
+    """`start` and the parents git would search: never into a ceiling directory or across a filesystem boundary."""
+    ceilings = _ceiling_directories()
+    across_filesystems = os.environ.get("GIT_DISCOVERY_ACROSS_FILESYSTEM", "").lower() in ("1", "true", "yes", "on")
+    directories: list[tuple[Path, os.stat_result]] = []
+    current = start
+    while True:
+        try:
+            stat_result = current.stat()
+        except OSError:
+            break
+        if directories and stat_result.st_dev != directories[0][1].st_dev and not across_filesystems:
+            break
+        directories.append((current, stat_result))
+        parent = current.parent
+        if parent == current or os.path.normcase(str(parent)) in ceilings:
+            break
+        current = parent
+    return directories
+
+
+@dataclass
+class _CachedDiscovery:
+    found: Optional[tuple[Path, Optional[GitRepository]]]
+    # Every directory the walk looked at and its mtime; creating or removing a marker in one changes it.
+    directories: tuple[tuple[Path, int], ...]
+    verified_at_ns: int
+
+
+_discovery_cache: dict[tuple, _CachedDiscovery] = {}
+_discovery_cache_lock = threading.Lock()
+
+
+def clear_discovery_cache() -> None:
+    with _discovery_cache_lock:
+        _discovery_cache.clear()
+
+
+def _discovery_still_valid(cached: _CachedDiscovery) -> bool:
+    for directory, mtime_ns in cached.directories:
+        if mtime_ns >= cached.verified_at_ns - RACY_WINDOW_NS:
+            return False
+        try:
+            if directory.stat().st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _discover(start: str | Path, marker: Optional[str]) -> Optional[tuple[Path, Optional[GitRepository]]]:
+    """Nearest enclosing directory holding a repository (or, if given, a `marker` file), memoized per directory."""
+    current = Path(os.path.abspath(start))
+    key = (
+        current,
+        marker,
+        os.environ.get("GIT_CEILING_DIRECTORIES"),
+        os.environ.get("GIT_DISCOVERY_ACROSS_FILESYSTEM"),
+    )
+    with _discovery_cache_lock:
+        cached = _discovery_cache.get(key)
+    if cached and _discovery_still_valid(cached):
+        return cached.found
+
+    checked_at_ns = time.time_ns()
+    found: Optional[tuple[Path, Optional[GitRepository]]] = None
+    walked: list[tuple[Path, int]] = []
+    for directory, stat_result in _search_directories(current):
+        if not stat.S_ISDIR(stat_result.st_mode):
+            break
+        walked.append((directory, stat_result.st_mtime_ns))
+        repository = repository_at(directory)
+        if repository is not None or (marker and (directory / marker).is_file()):
+            found = (directory, repository)
+            break
+    with _discovery_cache_lock:
+        _discovery_cache[key] = _CachedDiscovery(found, tuple(walked), checked_at_ns)
+    return found
+
+
+def discover_repository(start: str | Path = ".") -> Optional[GitRepository]:
+    env_git_dir = os.environ.get("GIT_DIR")
+    if env_git_dir:
+        git_dir = Path(env_git_dir).absolute()
+        if not _is_git_dir(git_dir):
+            return None
+        work_tree = os.environ.get("GIT_WORK_TREE")
+        return GitRepository(Path(work_tree).absolute() if work_tree else None, git_dir, _common_dir(git_dir))
+
+    found = _discover(start, marker=None)
+    return found[1] if found else None
+
+
+def find_project_root(start: str | Path = ".", marker: str = ".ghmulti") -> Optional[Path]:
+    """The directory a command run from `start` acts on: the nearest one with `.git` (directory or
+    `gitdir:` file), a bare repository or a `marker` file. None outside any of them."""
+    found = _discover(start, marker=marker)
+    return found[0] if found else None
+
+
+def repository_at(path: str | Path) -> Optional[GitRepository]:
+    """Repository whose work tree (or bare git directory) is exactly `path`, without walking up."""
+    current = Path(os.path.abspath(path))
+    dot_git = current / ".git"
+    git_dir: Optional[Path] = None
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        git_dir = _read_gitdir_file(dot_git)
+    if git_dir is not None and _is_git_dir(git_dir):
+        return GitRepository(current, Path(os.path.abspath(git_dir)), Path(os.path.abspath(_common_dir(git_dir))))
+    if _is_git_dir(current):
+        return GitRepository(None, current, Path(os.path.abspath(_common_dir(current))))
+    return None
+
+
+def _wildmatch_regex(pattern: str) -> str:
+    parts: list[str] = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        if char == "*":
+            end = index
+            while end < length and pattern[end] == "*":
+                end += 1
+            at_segment_start = index == 0 or pattern[index - 1] == "/"
+            if end - index >= 2 and at_segment_start and (end == length or pattern[end] == "/"):
+                if end == length:
+                    parts.append(".*")
+                    index = end
+                else:
+                    parts.append("(?:.*/)?")
+                    index = end + 1
+                continue
+            parts.append("[^/]*")
+            index = end
+            continue
+        if char == "?":
+            parts.append("[^/]")
+            index += 1
+            continue
+        if char == "[":
+            end = index + 1
+            if end < length and pattern[end] in "!^":
+                end += 1
+            if end < length and pattern[end] == "]":
+                end += 1
+            while end < length and pattern[end] != "]":
+                close = pattern.find(":]", end + 2) if pattern.startswith("[:", end) else -1
+                end = close + 2 if close >= 0 else end + 1
+            if end >= length:
+                parts.append(re.escape(char))
+                index += 1
+                continue
+            body = pattern[index + 1:end]
+            negate = body[:1] in ("!", "^")
+            if negate:
+                body = body[1:]
+            for name, expansion in _POSIX_CLASSES.items():
+                body = body.replace(f"[:{name}:]", expansion)
+            body = body.replace("\\", "\\\\").replace("[", "\\[")
+            parts.append(f"(?!/)[{'^' if negate else ''}{body}]")
+            index = end + 1
+            continue
+        if char == "\\" and index + 1 < length:
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+        parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def wildmatch(pattern: str, text: str, casefold: bool = False) -> bool:
+    return re.fullmatch(_wildmatch_regex(pattern), text, re.DOTALL | (re.IGNORECASE if casefold else 0)) is not None
+
+
+def _expand_user(path: str) -> str:
+    if path == "~" or path.startswith("~/"):
+        return str(Path.home()) + path[1:]
+    return path
+
+
+def _include_by_gitdir(condition: str, config_path: Optional[Path], repo: Optional[GitRepository], casefold: bool) -> bool:
+    if repo is None:
+        return False
+    pattern = condition
+    if pattern.startswith("./"):
+        if config_path is None:
+            raise GitConfigError("relative gitdir include condition outside of a file")
+        pattern = config_path.parent.resolve().as_posix() + pattern[1:]
+    elif pattern.startswith("~/"):
+        pattern = _expand_user(pattern)
+    pattern = pattern.replace(os.sep, "/")
+    if not (pattern.startswith("/") or re.match(r"^[A-Za-z]:/", pattern)):
+        pattern = "**/" + pattern
+    if pattern.endswith("/"):
+        pattern += "**"
+
+    candidates = [repo.git_dir.resolve().as_posix(), repo.git_dir.absolute().as_posix()]
+    return any(wildmatch(pattern, candidate, casefold=casefold) for candidate in candidates)
+
+
+def _include_by_branch(condition: str, repo: Optional[GitRepository]) -> bool:
+    if repo is None:
+        return False
+    try:
+        head = (repo.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return False
+    if not head.startswith("ref: refs/heads/"):
+        return False
+    pattern = condition + "**" if condition.endswith("/") else condition
+    return wildmatch(pattern, head[len("ref: refs/heads/"):])
+
+
+def _include_condition_matches(condition: str, config_path: Optional[Path], repo: Optional[GitRepository]) -> bool:
+    if condition.startswith("gitdir:"):
+        return _include_by_gitdir(condition[len("gitdir:"):], config_path, repo, casefold=False)
+    if condition.startswith("gitdir/i:"):
+        return _include_by_gitdir(condition[len("gitdir/i:"):], config_path, repo, casefold=True)
+    if condition.startswith("onbranch:"):
+        return _include_by_branch(condition[len("onbranch:"):], repo)
+    if condition.startswith("hasconfig:"):
+        raise GitConfigUnsupported(f"includeIf condition '{condition}' is not supported natively")
+    return False
+
+
+def _include_target(key: str, value: Optional[str], config_path: Optional[Path], repo: Optional[GitRepository]) -> Optional[Path]:
+    if value is None or not key.endswith(".path"):
+        return None
+    if key != "include.path":
+        if not key.startswith("includeif.") or key.count(".") < 2:
+            return None
+        condition = key[len("includeif."):-len(".path")]
+        if not _include_condition_matches(condition, config_path, repo):
+            return None
+
+    target = Path(_expand_user(value))
+    if not target.is_absolute():
+        if config_path is None:
+            raise GitConfigError("relative config include outside of a file")
+        target = config_path.parent / target
+    return target
+
+
+def _expand_file(
+    path: Path,
+    scope: str,
+    repo: Optional[GitRepository],
+    depth: int = 0
+) -> list[tuple[str, str, str, Optional[str]]]:
+    if depth > MAX_INCLUDE_DEPTH:
+        raise GitConfigError(f"exceeded maximum include depth ({MAX_INCLUDE_DEPTH}) at {path}")
+    entries = parse_config_file(path)
+    if entries is None:
+        return []
+
+    origin = f"file:{path.as_posix()}"
+    expanded: list[tuple[str, str, str, Optional[str]]] = []
+    for entry in entries:
+        expanded.append((scope, origin, entry.key, entry.value))
+        target = _include_target(entry.key, entry.value, path, repo)
+        if target is not None:
+            expanded.extend(_expand_file(target, scope, repo, depth + 1))
+    return expanded
+
+
+def system_config_path() -> Optional[Path]:
+    if os.environ.get("GIT_CONFIG_NOSYSTEM", "").lower() in ("1", "true", "yes", "on"):
+        return None
+    override = os.environ.get("GIT_CONFIG_SYSTEM")
+    if override is not None:
+        return Path(override) if override else None
+    if os.name == "nt":
+        git_executable = shutil.which("git")
+        return Path(git_executable).resolve().parent.parent / "etc" / "gitconfig" if git_executable else None
+    return Path("/etc/gitconfig")
+
+
+def global_config_paths() -> list[Path]:
+    override = os.environ.get("GIT_CONFIG_GLOBAL")
+    if override is not None:
+        return [Path(override)] if override else []
+    xdg_config_home = os.environ.get("XDG_CONFIG_HOME")
+    xdg_base = Path(xdg_config_home) if xdg_config_home else Path.home() / ".config"
+    return [xdg_base / "git" / "config", Path.home() / ".gitconfig"]
+
+
+def _worktree_config_enabled(local_entries: list[tuple[str, str, str, Optional[str]]]) -> bool:
+    values = [value for _, _, key, value in local_entries if key == "extensions.worktreeconfig"]
+    if not values:
+        return False
+    value = values[-1]
+    return value is None or value.strip().lower() in ("true", "yes", "on", "1")
+
+
+def _command_entries() -> list[tuple[str, str, str, Optional[str]]]:
+    if os.environ.get("GIT_CONFIG_PARAMETERS"):
+        raise GitConfigUnsupported("GIT_CONFIG_PARAMETERS is not supported natively")
+    try:
+        count = int(os.environ.get("GIT_CONFIG_COUNT", "0"))
+    except ValueError as exc:
+        raise GitConfigError("GIT_CONFIG_COUNT must be an integer") from exc
+    entries = []
+    for index in range(count):
+        key = os.environ.get(f"GIT_CONFIG_KEY_{index}")
+        if not key:
+            raise GitConfigError(f"missing GIT_CONFIG_KEY_{index}")
+        section, _, rest = key.partition(".")
+        subsection, dot, name = rest.rpartition(".")
+        normalized = f"{section.lower()}.{subsection}.{name.lower()}" if dot else f"{section.lower()}.{rest.lower()}"
+        entries.append(("command", "command line:", normalized, os.environ.get(f"GIT_CONFIG_VALUE_{index}", "")))
+    return entries
+
+
+def read_config_entries(cwd: str | Path = ".") -> list[tuple[str, str, str, Optional[str]]]:
+    """Return (scope, origin, key, value) tuples in the order `git config --list --show-scope` prints them."""
+    repo = discover_repository(cwd)
+    entries: list[tuple[str, str, str, Optional[str]]] = []
+
+    system_path = system_config_path()
+    if system_path is not None:
+        entries.extend(_expand_file(system_path, "system", repo))
+    for path in global_config_paths():
+        entries.extend(_expand_file(path, "global", repo))
+    if repo is not None:
+        entries.extend(read_repository_config_entries(repo))
+    entries.extend(_command_entries())
+    return entries
+
+
+def read_repository_config_entries(repo: GitRepository) -> list[tuple[str, str, str, Optional[str]]]:
+    """Only the repository's own config (local and worktree scopes), with includes resolved."""
+    entries = _expand_file(repo.common_dir / "config", "local", repo)
+    if _worktree_config_enabled(entries):
+        entries.extend(_expand_file(repo.git_dir / "config.worktree", "worktree", repo))
+    return entries
+
+
+_SECTION_LINE = re.compile(r'^\s*\[\s*([A-Za-z0-9.-]+)\s*(?:"((?:[^"\\\n]|\\.)*)")?\s*\]\s*(?:[#;].*)?$')
+_VARIABLE_LINE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9-]*)\s*(?:=.*)?$")
+
+
+def _quote_value(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t")
+    if value != value.strip() or any(marker in value for marker in "#;"):
+        return f'"{escaped}"'
+    return escaped
+
+
+def _edit_config_text(text: str, changes: dict[str, Optional[str]]) -> str:
+    """Apply `changes` (two-level key -> value, None to unset) the way `git config` would."""
+    targets: dict[str, tuple[str, str]] = {}
+    for key in changes:
+        section, dot, name = key.partition(".")
+        if not dot or "." in name:
+            raise GitConfigUnsupported(f"Batched writes only support two-level keys, not {key!r}.")
+        targets[key.lower()] = (section.lower(), name.lower())
+
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    kept: list[str] = []
+    # Index in `kept` just after the last line of the last plain [section] block, per section.
+    section_ends: dict[str, int] = {}
+    current: Optional[str] = None
+    for line in lines:
+        body = line.rstrip("\r\n")
+        if body.endswith("\\"):
+            raise GitConfigUnsupported("Continuation lines are left to git.")
+        stripped = body.strip()
+        if stripped.startswith("["):
+            match = _SECTION_LINE.match(body)
+            if match is None or "." in match.group(1):
+                raise GitConfigUnsupported(f"Unsupported section header: {stripped!r}.")
+            current = match.group(1).lower() if match.group(2) is None else None
+            kept.append(line)
+            if current is not None:
+                section_ends[current] = len(kept)
+            continue
+        if current is not None and stripped and not stripped.startswith(("#", ";")):
+            match = _VARIABLE_LINE.match(body)
+            if match is None:
+                raise GitConfigUnsupported(f"Unsupported config line: {stripped!r}.")
+            if (current, match.group(1).lower()) in targets.values():
+                continue
+        kept.append(line)
+        if current is not None:
+            section_ends[current] = len(kept)
+
+    additions: dict[str, list[str]] = {}
+    for key, value in changes.items():
+        if value is not None:
+            section, name = key.split(".", 1)
+            additions.setdefault(section.lower(), []).append(f"\t{name} = {_quote_value(value)}\n")
+    # Insert from the bottom up so earlier indices stay valid.
+    for section in sorted(additions, key=lambda name: section_ends.get(name, -1), reverse=True):
+        if section in section_ends:
+            index = section_ends[section]
+            kept[index:index] = additions[section]
+        else:
+            kept.append(f"[{section}]\n")
+            kept.extend(additions[section])
+    return "".join(kept)
+
+
+def write_config_values(path: Path, changes: dict[str, Optional[str]]) -> bool:
+    """Set (or, for None, unset) several keys in one config file with a single locked rewrite.
+
+    Raises GitConfigUnsupported when the file uses syntax this writer does not round-trip.
+    """
+    def edit(raw: bytes) -> bytes:
+        text = raw.decode("utf-8", errors="surrogateescape")
+        return _edit_config_text(text, changes).encode("utf-8", errors="surrogateescape")
+
+    return rewrite_locked_file(path, edit)
+
+
+def rewrite_locked_file(path: Path, edit: Callable[[bytes], bytes]) -> bool:
+    """Read-modify-write `path` under git's `<file>.lock` protocol; False when `edit` changed nothing.
+
+    The lock is taken before reading, as git does, so a concurrent `git config` either
+    finishes first or fails on the lock. Symlinks are followed so the link itself survives.
+    """
+    target = Path(os.path.realpath(path))
+    lock_path = target.with_name(target.name + ".lock")
+    try:
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError as exc:
+        raise GitConfigError(f"{lock_path} exists; another git process may be running.") from exc
+    committed = False
+    try:
+        with os.fdopen(fd, "wb") as lock_file:
+            try:
+                raw = target.read_bytes()
+                mode: Optional[int] = stat.S_IMODE(target.stat().st_mode)
+            except FileNotFoundError:
+                raw, mode = b"", None
+            updated = edit(raw)
+            if updated == raw:
+                return False
+            # The lock file was created with the umask; keep the original file's permissions.
+            if mode is not None and hasattr(os, "fchmod"):
+                os.fchmod(lock_file.fileno(), mode)
+            lock_file.write(updated)
+            lock_file.flush()
+            os.fsync(lock_file.fileno())
+        os.replace(lock_path, target)
+        committed = True
+        return True
+    finally:
+        if not committed:
+            try:
+                os.unlink(lock_path)
+            except OSError:
+                pass
+
+
+def write_repository_config(repo: GitRepository, changes: dict[str, Optional[str]]) -> bool:
+    # `git config --local` writes to the shared config even when worktree config is enabled.
+    return write_config_values(repo.common_dir / "config", changes)
@@ -1,66 +1,196 @@
 import os
-import stat
+import re
 import subprocess
-import tempfile
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterator
 from typing import Optional
 
+from cli.git_config import GitConfigError
+from cli.git_config import discover_repository
+from cli.git_config import read_config_entries
+from cli.git_config import write_repository_config
+
+GIT_CONFIG_LIST_COMMAND = ["git", "config", "--list", "--show-origin", "--show-scope", "-z"]
+# scp-like "user@host:owner/repo" and URL-style "scheme://[user@]host[:port]/owner/repo" remotes.
+_SCP_REMOTE = re.compile(r"^(?:[^@/]+@)?(?P<host>[^:/]+):(?P<path>[^/].*)$")
+_URL_REMOTE = re.compile(r"^[a-z][a-z0-9+.-]*://(?:[^@/]+@)?(?P<host>[^/:]+)(?::\d+)?/(?P<path>.+)$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class GitConfigEntry:
+    scope: str
+    origin: str
+    key: str
+    value: Optional[str]
+
+
+def normalize_git_config_key(key: str) -> str:
+    # Section and variable names are case-insensitive; subsection names are not.
+    section, _, rest = key.partition(".")
+    subsection, dot, name = rest.rpartition(".")
+    if dot:
+        return f"{section.lower()}.{subsection}.{name.lower()}"
+    return f"{section.lower()}.{rest.lower()}"
+
+
+def _scope_name(scope: Optional[str]) -> Optional[str]:
+    return scope.lstrip("-") if scope else None
+
+
+def parse_git_config_listing(output: bytes) -> list[GitConfigEntry]:
+    fields = output.split(b"\0")
+    entries: list[GitConfigEntry] = []
+    # Records are "scope NUL origin NUL key[LF value] NUL".
+    for index in range(0, len(fields) - 2, 3):
+        scope, origin, item = (field.decode("utf-8", errors="replace") for field in fields[index:index + 3])
+        key, newline, value = item.partition("\n")
+        if not scope or not key:
+            continue
+        entries.append(GitConfigEntry(scope, origin, normalize_git_config_key(key), value if newline else None))
+    return entries
+
+
+class GitConfigSnapshot:
+    """All git config values visible from a repository, read without spawning git where possible."""
+
+    def __init__(self, entries: list[GitConfigEntry]):
+        self.entries = entries
+        self._by_key: dict[str, list[GitConfigEntry]] = {}
+        for entry in entries:
+            self._by_key.setdefault(entry.key, []).append(entry)
+
+    @classmethod
+    def load(cls, cwd: str | Path = ".") -> "GitConfigSnapshot":
+        if not os.path.isdir(cwd):
+            return cls([])
+        try:
+            return cls([GitConfigEntry(*entry) for entry in read_config_entries(cwd)])
+        except GitConfigError:
+            # Let git evaluate what the native reader cannot (or report the error its own way).
+            return cls.load_from_git(cwd)
+
+    @classmethod
+    def load_from_git(cls, cwd: str | Path = ".") -> "GitConfigSnapshot":
+        try:
+            output = subprocess.check_output(GIT_CONFIG_LIST_COMMAND, cwd=str(cwd), stderr=subprocess.DEVNULL)
+        except (subprocess.CalledProcessError, OSError):
+            return cls([])
+        if isinstance(output, str):
+            output = output.encode("utf-8")
+        return cls(parse_git_config_listing(output))
+
+    def _matching(self, key: str, scope: Optional[str]) -> list[GitConfigEntry]:
+        scope_name = _scope_name(scope)
+        entries = self._by_key.get(normalize_git_config_key(key), [])
+        return [entry for entry in entries if scope_name is None or entry.scope == scope_name]
+
+    def has(self, key: str, scope: Optional[str] = None) -> bool:
+        return bool(self._matching(key, scope))
+
+    def get(self, key: str, scope: Optional[str] = None) -> Optional[str]:
+        entries = self._matching(key, scope)
+        if not entries or entries[-1].value is None:
+            return None
+        return entries[-1].value.strip() or None
+
+    def get_all(self, key: str, scope: Optional[str] = None) -> list[str]:
+        return [entry.value for entry in self._matching(key, scope) if entry.value is not None]
+
+    def remote_names(self) -> list[str]:
+        names: list[str] = []
+        for entry in self.entries:
+            section, _, rest = entry.key.partition(".")
+            name, dot, _ = rest.rpartition(".")
+            if section == "remote" and dot and name not in names:
+                names.append(name)
+        return names
+
+
+@dataclass(frozen=True)
+class RemoteLocation:
+    host: str
+    owner: str
+    name: str
+
+
+def parse_remote_url(url: str) -> Optional[RemoteLocation]:
+    match = _URL_REMOTE.match(url) or _SCP_REMOTE.match(url)
+    if match is None:
+        return None
+    parts = match.group("path").strip("/").split("/")
+    if len(parts) < 2:
+        return None
+    name = parts[-1][:-4] if parts[-1].endswith(".git") else parts[-1]
+    return RemoteLocation(match.group("host").lower(), parts[-2], name)
+
 
 def is_git_repository(cwd: str | Path = ".") -> bool:
-    try:
-        subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            cwd=str(cwd),
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
-
-
-def list_remote_names(cwd: str | Path = ".") -> list[str]:
-    try:
-        output = subprocess.check_output(
-            ["git", "remote"],
-            cwd=str(cwd),
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        if isinstance(output, bytes):
-            output = output.decode()
-        output = output.strip()
-        return [line.strip() for line in output.splitlines() if line.strip()]
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return []
-
-
-def choose_remote(linked_account_name: Optional[str], requested_remote: Optional[str], cwd: str | Path = ".") -> str:
+    return discover_repository(cwd) is not None
+
+
+def list_remote_names(cwd: str | Path = ".", git_config: Optional[GitConfigSnapshot] = None) -> list[str]:
+    return (git_config or GitConfigSnapshot.load(cwd)).remote_names()
+
+
+def choose_remote(
+    linked_account_name: Optional[str],
+    requested_remote: Optional[str],
+    cwd: str | Path = ".",
+    git_config: Optional[GitConfigSnapshot] = None
+) -> str:
     if requested_remote:
         return requested_remote
 
     if linked_account_name:
         linked_remote = f"origin-{linked_account_name}"
-        if linked_remote in list_remote_names(cwd=cwd):
+        if linked_remote in list_remote_names(cwd=cwd, git_config=git_config):
             return linked_remote
 
     return "origin"
 
 
 def get_git_config_value(scope: str, key: str, cwd: str | Path = ".") -> Optional[str]:
+    return GitConfigSnapshot.load(cwd).get(key, scope=scope)
+
+
+def set_local_git_config_values(values: dict[str, Optional[str]], cwd: str | Path = ".") -> None:
+    """Set (None: unset) several local keys in one write instead of one `git config` process per key."""
+    if not values:
+        return
+    repository = discover_repository(cwd)
+    if repository is not None:
+        try:
+            write_repository_config(repository, values)
+            return
+        except GitConfigError:
+            pass
+    for key, value in values.items():
+        if value is None:
+            subprocess.run(["git", "config", "--local", "--unset-all", key], check=False, cwd=str(cwd))
+        else:
+            subprocess.run(["git", "config", "--local", key, value], check=True, cwd=str(cwd))
+
+
+# Answers git's credential requests from the environment, so no helper script is written to disk.
+INLINE_CREDENTIAL_HELPER = (
+    '!f() { if [ "$1" = get ]; then '
+    'printf "username=%s\\npassword=%s\\n" "${GHMULTI_GIT_USERNAME:-x-access-token}" "$GHMULTI_GIT_PASSWORD"; '
+    'fi; }; f'
+)
+
+
+def add_git_config_env(env: dict[str, str], values: list[tuple[str, str]]) -> None:
+    """Append `-c`-style settings through GIT_CONFIG_COUNT, keeping any the caller already set."""
     try:
-        output = subprocess.check_output(
-            ["git", "config", scope, key],
-            cwd=str(cwd),
-            stderr=subprocess.PIPE,
-            text=True
-        ).strip()
-        return output or None
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return None
+        count = int(env.get("GIT_CONFIG_COUNT") or 0)
+    except ValueError:
+        count = 0
+    for index, (key, value) in enumerate(values, start=count):
+        env[f"GIT_CONFIG_KEY_{index}"] = key
+        env[f"GIT_CONFIG_VALUE_{index}"] = value
+    env["GIT_CONFIG_COUNT"] = str(count + len(values))
 
 
 @contextmanager
@@ -70,34 +200,16 @@ def git_auth_env(token: Optional[str], username: Optional[str] = None) -> Iterat
         yield env
         return
 
-    script_path = _create_askpass_script()
-    env["GIT_ASKPASS"] = script_path
     env["GHMULTI_GIT_PASSWORD"] = token
+    if username:
+        env["GHMULTI_GIT_USERNAME"] = username
     env["GIT_TERMINAL_PROMPT"] = "0"
+    # The empty value clears inherited helpers so a token stored for another account cannot win.
+    add_git_config_env(env, [("credential.helper", ""), ("credential.helper", INLINE_CREDENTIAL_HELPER)])
 
     # Kept for backward compatibility with prior behavior/tests.
     if username:
         env["GIT_USERNAME"] = username
     env["GIT_PASSWORD"] = token
 
-    try:
-        yield env
-    finally:
-        try:
-            os.remove(script_path)
-        except OSError:
-            pass
-
-
-def _create_askpass_script() -> str:
-    if os.name == "nt":
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".cmd", delete=False, encoding="utf-8") as f:
-            f.write("@echo %GHMULTI_GIT_PASSWORD%\n")
-            return f.name
-
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".sh", delete=False, encoding="utf-8") as f:
-        f.write("#!/usr/bin/env sh\n")
-        f.write("printf '%s\\n' \"$GHMULTI_GIT_PASSWORD\"\n")
-        path = f.name
-    os.chmod(path, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR)
-    return path
+    yield env
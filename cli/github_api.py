@@ -0,0 +1,304 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+from cli.config import STATE_DIR
+from cli.config import json_file_transaction
+from cli.config import load_json_file
+
+DEFAULT_API_URL = "https://api.github.com"
+API_URL_ENV = "GHMULTI_GITHUB_API_URL"
+DEFAULT_TIMEOUT_SECONDS = 5
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 0.5
+# Unless a client sets its own deadline, one request() call, retries and waits included, is capped at
+# its timeout plus this allowance, so an unreachable API costs an interactive command one timeout, not several.
+RETRY_ALLOWANCE_SECONDS = 1.0
+# Waits longer than this are not worth blocking a CLI command for; the response is returned instead.
+MAX_RETRY_WAIT_SECONDS = 10.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+BREAKER_STATE_PATH = STATE_DIR / "network-breaker.json"
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_WINDOW_SECONDS = 60.0
+BREAKER_COOL_DOWN_SECONDS = 30.0
+# Half-open probes should fail fast; a healthy API answers well within this.
+BREAKER_PROBE_TIMEOUT_SECONDS = 1.0
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def api_base_url() -> str:
+    return (os.environ.get(API_URL_ENV) or DEFAULT_API_URL).rstrip("/")
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(ConnectionError):
+    def __init__(self, host: str, retry_in_seconds: float):
+        super().__init__(f"{host} was unreachable recently; retrying in {retry_in_seconds:.0f}s.")
+        self.host = host
+        self.retry_in_seconds = retry_in_seconds
+
+
+class CircuitBreaker:
+    """Per-host connection-failure breaker persisted across ghmulti invocations."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        window_seconds: float = BREAKER_WINDOW_SECONDS,
+        cool_down_seconds: float = BREAKER_COOL_DOWN_SECONDS
+    ):
+        self.path = path or BREAKER_STATE_PATH
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cool_down_seconds = cool_down_seconds
+
+    def state(self, host: str, now: Optional[float] = None) -> tuple[str, float]:
+        """Return ("closed" | "open" | "half-open", seconds until the next probe is allowed)."""
+        now = time.time() if now is None else now
+        opened_at = load_json_file(self.path).get(host, {}).get("opened_at")
+        if opened_at is None:
+            return "closed", 0.0
+        remaining = opened_at + self.cool_down_seconds - now
+        return ("open", remaining) if remaining > 0 else ("half-open", 0.0)
+
+    def record_failure(self, host: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        try:
+            with json_file_transaction(self.path) as data:
+                entry = data.get(host, {})
+                failures = [stamp for stamp in entry.get("failures", []) if now - stamp < self.window_seconds]
+                failures.append(now)
+                opened_at = entry.get("opened_at")
+                if opened_at is not None or len(failures) >= self.failure_threshold:
+                    # A failed half-open probe restarts the cool-down.
+                    opened_at = now
+                data[host] = {"failures": failures, "opened_at": opened_at}
+        except OSError:
+            # Without a writable state dir the breaker just stays closed.
+            pass
+
+    def record_success(self, host: str) -> None:
+        if host not in load_json_file(self.path):
+            # The common case: nothing to clear, so no lock and no write.
+            return
+        try:
+            with json_file_transaction(self.path) as data:
+                data.pop(host, None)
+        except OSError:
+            pass
+
+
+def is_request_error(exc: BaseException) -> bool:
+    import requests
+
+    return isinstance(exc, requests.RequestException)
+
+
+@dataclass
+class RateLimit:
+    limit: Optional[int]
+    remaining: Optional[int]
+    reset: Optional[int]
+    observed_at: float
+
+    @classmethod
+    def from_headers(cls, headers: Any) -> Optional["RateLimit"]:
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            return None
+        return cls(
+            limit=_header_int(headers, "X-RateLimit-Limit"),
+            remaining=remaining,
+            reset=_header_int(headers, "X-RateLimit-Reset"),
+            observed_at=time.time()
+        )
+
+
+class GitHubApiClient:
+    """GitHub REST client with per-host pooled sessions, bounded retries and rate-limit tracking."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        max_retry_wait_seconds: float = MAX_RETRY_WAIT_SECONDS,
+        pool_maxsize: int = 10,
+        sleep: Callable[[float], None] = time.sleep,
+        breaker: Optional[CircuitBreaker] = None,
+        deadline_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.base_url = (base_url or api_base_url()).rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_retry_wait_seconds = max_retry_wait_seconds
+        self.pool_maxsize = pool_maxsize
+        self._sleep = sleep
+        self.deadline_seconds = deadline_seconds
+        self._clock = clock
+        self.breaker = breaker or CircuitBreaker()
+        self._sessions: dict[str, Any] = {}
+        self._rate_limits: dict[str, RateLimit] = {}
+        self._lock = threading.Lock()
+
+    def url_for(self, path: str) -> str:
+        if urlsplit(path).scheme:
+            return path
+        return urljoin(self.base_url + "/", path.lstrip("/"))
+
+    def session_for(self, url: str) -> Any:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers["Accept"] = "application/vnd.github+json"
+                session.mount(host, HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize))
+                self._sessions[host] = session
+            return session
+
+    def rate_limit_for(self, token: str) -> Optional[RateLimit]:
+        with self._lock:
+            return self._rate_limits.get(token_fingerprint(token))
+
+    def _record_rate_limit(self, token: Optional[str], headers: Any) -> None:
+        rate_limit = RateLimit.from_headers(headers)
+        if token and rate_limit is not None:
+            with self._lock:
+                self._rate_limits[token_fingerprint(token)] = rate_limit
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # Full jitter keeps concurrent callers from retrying in lockstep.
+        return random.uniform(0, self.backoff_seconds * (2 ** attempt))
+
+    def _rate_limit_delay(self, response: Any) -> Optional[float]:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                return None
+        if response.status_code in (403, 429) and _header_int(response.headers, "X-RateLimit-Remaining") == 0:
+            reset = _header_int(response.headers, "X-RateLimit-Reset")
+            if reset is not None:
+                return max(0.0, reset - time.time())
+        return None
+
+    def _retry_delay(self, response: Any, attempt: int) -> Optional[float]:
+        if response.status_code < 400:
+            return None
+        delay = self._rate_limit_delay(response)
+        if delay is not None:
+            return delay if delay <= self.max_retry_wait_seconds else None
+        if response.status_code in RETRY_STATUS_CODES:
+            return self._backoff_delay(attempt)
+        return None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        **kwargs: Any
+    ) -> Any:
+        method = method.upper()
+        url = self.url_for(path)
+        host = urlsplit(url).netloc
+        # Checked before importing requests so the offline path stays in the millisecond range.
+        breaker_state, retry_in = self.breaker.state(host)
+        if breaker_state == "open":
+            raise CircuitOpenError(host, retry_in)
+
+        import requests
+
+        request_headers = dict(headers or {})
+        if token:
+            request_headers["Authorization"] = f"token {token}"
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        session = self.session_for(url)
+        if breaker_state == "half-open":
+            retries = 0
+            timeout = min(timeout, BREAKER_PROBE_TIMEOUT_SECONDS)
+
+        budget = self.deadline_seconds if self.deadline_seconds is not None else timeout + RETRY_ALLOWANCE_SECONDS
+        deadline = self._clock() + budget
+        attempt = 0
+        while True:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                # requests rejects a zero timeout with ValueError; report the exhausted budget as a timeout instead.
+                raise requests.Timeout(f"{method} {url} did not finish within {budget:g}s")
+            attempt_timeout = min(timeout, remaining)
+            try:
+                response = session.request(method, url, headers=request_headers, timeout=attempt_timeout, **kwargs)
+            except requests.ConnectTimeout:
+                # A host that swallowed the SYN will not answer a second time either.
+                self.breaker.record_failure(host)
+                raise
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self._backoff_delay(attempt)
+                if attempt >= retries or self._clock() + delay >= deadline:
+                    self.breaker.record_failure(host)
+                    raise
+                self._sleep(delay)
+                attempt += 1
+                continue
+
+            self.breaker.record_success(host)
+            self._record_rate_limit(token, response.headers)
+            delay = self._retry_delay(response, attempt) if attempt < retries else None
+            if delay is None or self._clock() + delay >= deadline:
+                return response
+            response.close()
+            self._sleep(delay)
+            attempt += 1
+
+    def get(self, path: str, **kwargs: Any) -> Any:
+        return self.request("GET", path, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_default_client: Optional[GitHubApiClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> GitHubApiClient:
+    """Process-wide client, rebuilt if the configured base URL changes."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None or _default_client.base_url != api_base_url():
+            _default_client = GitHubApiClient()
+        return _default_client
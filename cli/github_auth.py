@@ -1,40 +1,167 @@
+import os
+import time
+from dataclasses import asdict
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 from typing import Optional
 
-import requests
+from cli.config import STATE_DIR
+from cli.config import json_file_transaction
+from cli.config import load_json_file
+from cli.github_api import CircuitOpenError
+from cli.github_api import GitHubApiClient
+from cli.github_api import RateLimit
+from cli.github_api import get_client
+from cli.github_api import is_request_error
+from cli.github_api import token_fingerprint
 
+TOKEN_CACHE_PATH = STATE_DIR / "token-cache.json"
+TOKEN_CACHE_TTL_ENV = "GHMULTI_TOKEN_CACHE_TTL"
+DEFAULT_TOKEN_CACHE_TTL_SECONDS = 300
 
 @dataclass
 class TokenValidationResult:
     valid: Optional[bool]
     message: str
     status_code: Optional[int] = None
+    # "network", "cache" or "revalidated" (304 Not Modified); None when nothing was checked.
+    source: Optional[str] = None
+    age_seconds: Optional[float] = None
+    latency_ms: Optional[float] = None
+    rate_limit_limit: Optional[int] = None
+    rate_limit_remaining: Optional[int] = None
+    rate_limit_reset: Optional[int] = None
+    # Set when validation was skipped, e.g. "offline-cached" while the network breaker is open.
+    reason: Optional[str] = None
 
 
-def validate_github_token(token: str, timeout_seconds: int = 5) -> TokenValidationResult:
+@dataclass
+class _CachedValidation:
+    valid: Optional[bool]
+    message: str
+    status_code: Optional[int]
+    etag: Optional[str]
+    checked_at: float
+
+
+def token_cache_ttl_seconds() -> float:
+    try:
+        return max(0.0, float(os.environ.get(TOKEN_CACHE_TTL_ENV, DEFAULT_TOKEN_CACHE_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_TOKEN_CACHE_TTL_SECONDS
+
+
+def _read_cached_validation(path: Path, fingerprint: str) -> Optional[_CachedValidation]:
+    entry = load_json_file(path).get(fingerprint)
+    if not isinstance(entry, dict):
+        return None
+    try:
+        return _CachedValidation(**entry)
+    except TypeError:
+        return None
+
+
+def _store_cached_validation(path: Path, fingerprint: str, cached: _CachedValidation) -> None:
+    try:
+        with json_file_transaction(path) as data:
+            data[fingerprint] = asdict(cached)
+    except OSError:
+        # A read-only state dir must not break validation.
+        pass
+
+
+def _result_from_cache(cached: _CachedValidation, source: str, now: float) -> TokenValidationResult:
+    return TokenValidationResult(
+        valid=cached.valid,
+        message=cached.message,
+        status_code=cached.status_code,
+        source=source,
+        age_seconds=round(max(0.0, now - cached.checked_at), 3)
+    )
+
+
+def validate_github_token(
+    token: str,
+    timeout_seconds: int = 5,
+    use_cache: bool = True,
+    ttl_seconds: Optional[float] = None,
+    cache_path: Optional[Path] = None,
+    client: Optional[GitHubApiClient] = None
+) -> TokenValidationResult:
     if not token:
         return TokenValidationResult(valid=None, message="No token provided.")
 
+    path = cache_path or TOKEN_CACHE_PATH
+    fingerprint = token_fingerprint(token)
+    ttl = token_cache_ttl_seconds() if ttl_seconds is None else ttl_seconds
+    now = time.time()
+    cached = _read_cached_validation(path, fingerprint) if use_cache else None
+    if cached and now - cached.checked_at < ttl:
+        return _result_from_cache(cached, "cache", now)
+
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+
+    started = time.perf_counter()
     try:
-        response = requests.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"token {token}"},
-            timeout=timeout_seconds
+        response = (client or get_client()).get("/user", token=token, headers=headers, timeout=timeout_seconds)
+    except CircuitOpenError as exc:
+        return TokenValidationResult(
+            valid=None,
+            message=f"Token validation skipped: {exc}",
+            reason="offline-cached"
         )
-    except requests.RequestException as exc:
+    except Exception as exc:
+        if not is_request_error(exc):
+            raise
         return TokenValidationResult(
             valid=None,
-            message=f"Token validation unavailable: {exc.__class__.__name__}: {exc}"
+            message=f"Token validation unavailable: {exc.__class__.__name__}: {exc}",
+            source="network",
+            latency_ms=round((time.perf_counter() - started) * 1000, 1)
         )
+    rate_limit = RateLimit.from_headers(response.headers)
+    network_details = {
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "rate_limit_limit": rate_limit.limit if rate_limit else None,
+        "rate_limit_remaining": rate_limit.remaining if rate_limit else None,
+        "rate_limit_reset": rate_limit.reset if rate_limit else None,
+    }
 
-    if response.status_code == 200:
-        return TokenValidationResult(valid=True, message="Token is valid.", status_code=200)
+    if response.status_code == 304 and cached:
+        cached.checked_at = now
+        _store_cached_validation(path, fingerprint, cached)
+        result = _result_from_cache(cached, "revalidated", now)
+        for name, value in network_details.items():
+            setattr(result, name, value)
+        return result
 
-    if response.status_code == 401:
-        return TokenValidationResult(valid=False, message="Token is invalid or expired.", status_code=401)
+    if response.status_code == 200:
+        result = TokenValidationResult(valid=True, message="Token is valid.", status_code=200, source="network", **network_details)
+    elif response.status_code == 401:
+        result = TokenValidationResult(
+            valid=False,
+            message="Token is invalid or expired.",
+            status_code=401,
+            source="network",
+            **network_details
+        )
+    else:
+        return TokenValidationResult(
+            valid=None,
+            message=f"Token validation returned unexpected status code: {response.status_code}",
+            status_code=response.status_code,
+            source="network",
+            **network_details
+        )
 
-    return TokenValidationResult(
-        valid=None,
-        message=f"Token validation returned unexpected status code: {response.status_code}",
-        status_code=response.status_code
-    )
+    result.age_seconds = 0.0
+    if use_cache:
+        _store_cached_validation(
+            path,
+            fingerprint,
+            _CachedValidation(result.valid, result.message, result.status_code, response.headers.get("ETag"), now)
+        )
+    return result
@@ -0,0 +1,285 @@
+import os
+import re
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+from cli.git_config import GitConfigError
+from cli.git_config import global_config_paths
+from cli.git_config import rewrite_locked_file
+
+BLOCK_BEGIN = "# >>> ghmulti identities (managed by `ghmulti identity`; do not edit) >>>"
+BLOCK_END = "# <<< ghmulti identities <<<"
+FRAGMENT_SUFFIX = ".gitconfig"
+
+
+def account_identity(account: dict) -> dict[str, Optional[str]]:
+    """Git settings that carry `account`'s identity (None means unset)."""
+    ssh_key_path = account.get("ssh_key_path")
+    return {
+        "user.name": account["username"],
+        "user.email": f'{account["username"]}@users.noreply.github.com',
+        "user.signingkey": account.get("gpg_key_id"),
+        "core.sshCommand": f"ssh -i {os.path.expanduser(ssh_key_path)}" if ssh_key_path else None,
+    }
+
+
+def identity_dir() -> Path:
+    config_home = os.environ.get("XDG_CONFIG_HOME")
+    return (Path(config_home) if config_home else Path.home() / ".config") / "ghmulti" / "identities"
+
+
+def global_gitconfig_path() -> Path:
+    # The last candidate is what `git config --global` writes: $GIT_CONFIG_GLOBAL or ~/.gitconfig.
+    paths = global_config_paths()
+    return paths[-1] if paths else Path.home() / ".gitconfig"
+
+
+def fragment_path(account_name: str) -> Path:
+    return identity_dir() / f"{account_name}{FRAGMENT_SUFFIX}"
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _included_identity(account: dict) -> dict[str, str]:
+    # An include cannot unset what the default fragment set, so unset keys get git's own defaults instead.
+    identity = account_identity(account)
+    defaults = {
+        "user.signingkey": f'{identity["user.name"]} <{identity["user.email"]}>',
+        "core.sshCommand": "ssh",
+    }
+    return {key: value if value is not None else defaults[key] for key, value in identity.items()}
+
+
+def render_fragment(account: dict) -> str:
+    sections: dict[str, list[str]] = {}
+    for key, value in _included_identity(account).items():
+        section, name = key.split(".")
+        sections.setdefault(section, []).append(f"\t{name} = {_quote(value)}")
+    lines = [f"# ghmulti identity for account '{account['name']}'; regenerated by ghmulti."]
+    for section, entries in sections.items():
+        lines.append(f"[{section}]")
+        lines.extend(entries)
+    return "\n".join(lines) + "\n"
+
+
+@dataclass(frozen=True)
+class IncludeRule:
+    directory: str
+    account: str
+
+    def to_dict(self) -> dict[str, str]:
+        return {"directory": self.directory, "account": self.account}
+
+
+@dataclass
+class IdentityBlock:
+    """The managed block: a default identity plus one `includeIf "gitdir:..."` rule per linked tree."""
+
+    default_account: Optional[str] = None
+    rules: list[IncludeRule] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"default_account": self.default_account, "rules": [rule.to_dict() for rule in self.rules]}
+
+
+def _account_from_fragment(value: str) -> Optional[str]:
+    path = Path(value.strip().strip('"'))
+    return path.name[:-len(FRAGMENT_SUFFIX)] if path.name.endswith(FRAGMENT_SUFFIX) else None
+
+
+def _gitdir_condition(directory: str) -> str:
+    # Git matches gitdir: patterns against forward-slash paths, even on Windows.
+    return f"gitdir:{Path(directory).as_posix().rstrip('/')}/"
+
+
+def _unquote_subsection(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def parse_identity_block(text: str) -> Optional[IdentityBlock]:
+    lines = text.splitlines()
+    if BLOCK_BEGIN not in lines or BLOCK_END not in lines:
+        return None
+    block = IdentityBlock()
+    directory: Optional[str] = None
+    section = ""
+    for line in lines[lines.index(BLOCK_BEGIN) + 1:lines.index(BLOCK_END)]:
+        stripped = line.strip()
+        if stripped.startswith("[includeIf \"gitdir:") and stripped.endswith("\"]"):
+            section, directory = "includeif", _unquote_subsection(stripped[len("[includeIf \"gitdir:"):-2])
+        elif stripped.startswith("["):
+            section, directory = stripped.strip("[]").lower(), None
+        elif stripped.startswith("path"):
+            account = _account_from_fragment(stripped.partition("=")[2])
+            if account is None:
+                continue
+            if section == "include":
+                block.default_account = account
+            elif section == "includeif" and directory:
+                block.rules.append(IncludeRule(str(Path(directory.rstrip("/") or "/")), account))
+    return block
+
+
+def render_identity_block(block: IdentityBlock) -> str:
+    lines = [BLOCK_BEGIN, "[ghmulti]", "\tidentityMode = include"]
+    if block.default_account:
+        lines += ["[include]", f"\tpath = {_quote(fragment_path(block.default_account).as_posix())}"]
+    # Git applies includes in order and the last value wins, so deeper directories go last.
+    for rule in sorted(block.rules, key=lambda rule: len(Path(rule.directory).parts)):
+        lines += [
+            f"[includeIf {_quote(_gitdir_condition(rule.directory))}]",
+            f"\tpath = {_quote(fragment_path(rule.account).as_posix())}",
+        ]
+    lines.append(BLOCK_END)
+    return "\n".join(lines) + "\n"
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return path.read_bytes().decode("utf-8", errors="surrogateescape")
+    except FileNotFoundError:
+        return ""
+
+
+def read_identity_block() -> Optional[IdentityBlock]:
+    """The managed block from the global gitconfig; None means include mode is off."""
+    return parse_identity_block(_read_text(global_gitconfig_path()))
+
+
+def include_mode_enabled() -> bool:
+    return read_identity_block() is not None
+
+
+def _without_block(text: str) -> str:
+    lines = text.splitlines(keepends=True)
+    stripped = [line.rstrip("\r\n") for line in lines]
+    if BLOCK_BEGIN not in stripped or BLOCK_END not in stripped:
+        return text
+    return "".join(lines[:stripped.index(BLOCK_BEGIN)] + lines[stripped.index(BLOCK_END) + 1:])
+
+
+def _update_identity_block(
+    transform: Callable[[Optional[IdentityBlock]], Optional[IdentityBlock]]
+) -> tuple[bool, Optional[IdentityBlock]]:
+    """Apply `transform` to the managed block (None: absent) with the gitconfig locked from read to rename."""
+    path = global_gitconfig_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    result: list[Optional[IdentityBlock]] = []
+
+    def edit(raw: bytes) -> bytes:
+        text = raw.decode("utf-8", errors="surrogateescape")
+        block = transform(parse_identity_block(text))
+        result.append(block)
+        updated = _without_block(text)
+        if block is not None:
+            if updated and not updated.endswith("\n"):
+                updated += "\n"
+            # The block always sits at the end so it overrides plain global settings.
+            updated += render_identity_block(block)
+        return updated.encode("utf-8", errors="surrogateescape")
+
+    changed = rewrite_locked_file(path, edit)
+    return changed, result[0]
+
+
+def write_identity_block(block: Optional[IdentityBlock]) -> bool:
+    """Replace (None: remove) the managed block."""
+    return _update_identity_block(lambda _current: block)[0]
+
+
+def write_fragment(account: dict) -> bool:
+    path = fragment_path(account["name"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = render_fragment(account).encode("utf-8")
+    return rewrite_locked_file(path, lambda _raw: content)
+
+
+def sync_identities(
+    accounts: Iterable[dict],
+    active: Optional[str],
+    renamed: Optional[dict[str, str]] = None
+) -> Optional[IdentityBlock]:
+    """Bring fragments and rules in line with the account config; a no-op (None) unless include mode is on."""
+    if read_identity_block() is None:
+        return None
+    renamed = renamed or {}
+    names = set()
+    for account in accounts:
+        names.add(account["name"])
+        write_fragment(account)
+
+    def transform(block: Optional[IdentityBlock]) -> Optional[IdentityBlock]:
+        if block is None:
+            return None
+        rules = [IncludeRule(rule.directory, renamed.get(rule.account, rule.account)) for rule in block.rules]
+        return IdentityBlock(active if active in names else None, [rule for rule in rules if rule.account in names])
+
+    block = _update_identity_block(transform)[1]
+    # Stale fragments go only once no rule points at them any more.
+    for stale in identity_dir().glob(f"*{FRAGMENT_SUFFIX}"):
+        if stale.name[:-len(FRAGMENT_SUFFIX)] not in names:
+            stale.unlink()
+    return block
+
+
+def enable_include_mode(accounts: Iterable[dict], active: Optional[str]) -> IdentityBlock:
+    _update_identity_block(lambda current: current or IdentityBlock())
+    return sync_identities(accounts, active)
+
+
+def disable_include_mode() -> bool:
+    removed = write_identity_block(None)
+    for fragment in identity_dir().glob(f"*{FRAGMENT_SUFFIX}"):
+        fragment.unlink()
+    return removed
+
+
+def add_include_rule(directory: str | Path, account: dict, default_account: Optional[str] = None) -> IncludeRule:
+    """Send every repository under `directory` to `account`'s fragment: one write to the global gitconfig."""
+    if read_identity_block() is None:
+        raise GitConfigError("Include mode is not enabled; run `ghmulti identity enable` first.")
+    write_fragment(account)
+    rule = IncludeRule(os.path.realpath(directory), account["name"])
+
+    def transform(block: Optional[IdentityBlock]) -> Optional[IdentityBlock]:
+        if block is None:
+            raise GitConfigError("Include mode is not enabled; run `ghmulti identity enable` first.")
+        block.rules = [existing for existing in block.rules if existing.directory != rule.directory] + [rule]
+        return block
+
+    _update_identity_block(transform)
+    return rule
+
+
+def remove_include_rule(directory: str | Path) -> bool:
+    target = os.path.realpath(directory)
+
+    def transform(block: Optional[IdentityBlock]) -> Optional[IdentityBlock]:
+        if block is not None:
+            block.rules = [rule for rule in block.rules if rule.directory != target]
+        return block
+
+    return _update_identity_block(transform)[0]
+
+
+def include_rule_for(path: str | Path) -> Optional[IncludeRule]:
+    """The rule covering `path` (the deepest matching directory wins, as in git)."""
+    block = read_identity_block()
+    if block is None or not block.rules:
+        return None
+    target = os.path.realpath(path)
+    matches = [
+        rule for rule in block.rules
+        if target == rule.directory or target.startswith(rule.directory.rstrip(os.sep) + os.sep)
+    ]
+    if not matches:
+        return None
+    return max(matches, key=lambda rule: len(rule.directory))
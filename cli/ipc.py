@@ -0,0 +1,173 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+JSONRPC_VERSION = "2.0"
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+RpcHandler = Callable[[dict[str, Any]], Any]
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class RpcUnavailable(OSError):
+    pass
+
+
+def supports_unix_sockets() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socketserver, "UnixStreamServer")
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "error": {"code": code, "message": message}}
+
+
+def dispatch_request(raw: bytes, handlers: dict[str, RpcHandler]) -> dict[str, Any]:
+    try:
+        request = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        return _error_response(None, PARSE_ERROR, f"Invalid JSON: {exc}")
+
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error_response(None, INVALID_REQUEST, "Request must be an object with a 'method'.")
+
+    request_id = request.get("id")
+    handler = handlers.get(request["method"])
+    if handler is None:
+        return _error_response(request_id, METHOD_NOT_FOUND, f"Unknown method '{request['method']}'.")
+
+    params = request.get("params") or {}
+    if not isinstance(params, dict):
+        return _error_response(request_id, INVALID_REQUEST, "Params must be an object.")
+
+    try:
+        result = handler(params)
+    except RpcError as exc:
+        return _error_response(request_id, exc.code, exc.message)
+    except Exception as exc:
+        return _error_response(request_id, INTERNAL_ERROR, f"{exc.__class__.__name__}: {exc}")
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+
+class _RpcRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = dispatch_request(line, self.server.handlers)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.shutdown_requested:
+                # Stop only after the reply is flushed so the caller sees it.
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+def _peer_uid(connection: socket.socket) -> Optional[int]:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    try:
+        credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    except OSError:
+        return None
+    _pid, uid, _gid = struct.unpack("3i", credentials)
+    return uid
+
+
+_UnixStreamServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+class RpcServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, handlers: dict[str, RpcHandler]):
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self.shutdown_requested = False
+        super().__init__(str(socket_path), _RpcRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def verify_request(self, request, client_address) -> bool:
+        # The socket is already 0600; where the OS reports the peer, refuse other users outright.
+        uid = _peer_uid(request)
+        return uid is None or uid == os.getuid()
+
+    def request_shutdown(self) -> None:
+        self.shutdown_requested = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+
+def create_server(socket_path: Path, handlers: dict[str, RpcHandler]) -> RpcServer:
+    if not supports_unix_sockets():
+        raise RuntimeError("Unix domain sockets are not supported on this platform.")
+
+    try:
+        socket_path.parent.mkdir(parents=True)
+    except FileExistsError:
+        # A directory the user picked (say /tmp) keeps its permissions; the socket itself is 0600.
+        pass
+    else:
+        os.chmod(socket_path.parent, 0o700)
+    if socket_path.exists():
+        if is_listening(socket_path):
+            raise RuntimeError(f"Another server is already listening on {socket_path}.")
+        socket_path.unlink()
+    return RpcServer(socket_path, handlers)
+
+
+def is_listening(socket_path: Path) -> bool:
+    try:
+        call(socket_path, "ping", timeout=0.5)
+    except (RpcUnavailable, RpcError):
+        return False
+    return True
+
+
+def call(socket_path: Path, method: str, params: Optional[dict[str, Any]] = None, timeout: float = 2.0) -> Any:
+    if not supports_unix_sockets():
+        raise RpcUnavailable("Unix domain sockets are not supported on this platform.")
+
+    request = {"jsonrpc": JSONRPC_VERSION, "id": 1, "method": method, "params": params or {}}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as exc:
+        raise RpcUnavailable(str(exc)) from exc
+
+    if not line:
+        raise RpcUnavailable("Connection closed without a response.")
+
+    try:
+        response = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise RpcError(PARSE_ERROR, f"Invalid response: {exc}") from exc
+
+    error = response.get("error")
+    if error:
+        raise RpcError(error.get("code", INTERNAL_ERROR), error.get("message", "Unknown error."))
+    return response.get("result")
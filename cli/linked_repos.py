@@ -0,0 +1,207 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+from cli.config import LINKED_GIT_CONFIG_KEY
+from cli.config import clear_linked_account
+from cli.config import get_linked_account
+from cli.config import set_linked_account
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import parse_remote_url
+from cli.git_utils import set_local_git_config_values
+from cli.identity import account_identity
+from cli.identity import include_mode_enabled
+from cli.registry import RepoRegistry
+from cli.registry import forget_link
+from cli.registry import normalize_repo_path
+from cli.registry import record_link
+from cli.registry import registry_session
+from cli.scanner import scan_repositories
+
+DEFAULT_CASCADE_WORKERS = 8
+
+
+@dataclass
+class RepoChange:
+    path: str
+    # "updated", "planned" (dry run), "skipped" (nothing to do for this repository) or "error".
+    status: str
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _current_link(repo_path: str) -> Optional[str]:
+    linked = get_linked_account(repo_path=repo_path)
+    if linked:
+        return linked
+    if os.path.exists(os.path.join(repo_path, ".git")):
+        return GitConfigSnapshot.load(repo_path).get(LINKED_GIT_CONFIG_KEY, scope="--local")
+    return None
+
+
+def repositories_linked_to(account_name: str, include_cwd: bool = True) -> list[str]:
+    """Registered repositories for the account, plus the current directory if it is linked but unregistered."""
+    with RepoRegistry() as registry:
+        paths = [repo.path for repo in registry.repos_for(account_name)]
+    if include_cwd and get_linked_account() == account_name:
+        cwd = normalize_repo_path(".")
+        if cwd not in paths:
+            paths.append(cwd)
+    return paths
+
+
+def _run_for_each(
+    paths: list[str],
+    account_name: str,
+    change: Callable[[str], None],
+    dry_run: bool,
+    workers: int
+) -> list[RepoChange]:
+    def process(path: str) -> RepoChange:
+        try:
+            current_link = _current_link(path)
+            if current_link != account_name:
+                if not dry_run:
+                    # The registry was stale for this path; bring it in line with the disk.
+                    if current_link:
+                        record_link(path, current_link)
+                    else:
+                        forget_link(path)
+                return RepoChange(path, "skipped")
+            if dry_run:
+                return RepoChange(path, "planned")
+            change(path)
+            return RepoChange(path, "updated")
+        except (OSError, subprocess.CalledProcessError) as exc:
+            return RepoChange(path, "error", str(exc))
+
+    if not paths:
+        return []
+    with registry_session(), ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(paths))), thread_name_prefix="ghmulti-cascade"
+    ) as pool:
+        return list(pool.map(process, paths))
+
+
+def relink_repositories(
+    paths: list[str],
+    old_name: str,
+    new_account: dict,
+    dry_run: bool = False,
+    workers: int = DEFAULT_CASCADE_WORKERS
+) -> list[RepoChange]:
+    from cli.commands.link import link_repository
+
+    # In include mode the renamed rules already carry the identity; only the link records move.
+    by_include = include_mode_enabled()
+
+    def relink(path: str) -> None:
+        if by_include:
+            set_linked_account(new_account["name"], repo_path=path, sync_git_config=False)
+        elif os.path.exists(os.path.join(path, ".git")):
+            link_repository(new_account, repo_path=path)
+        else:
+            set_linked_account(new_account["name"], repo_path=path)
+
+    return _run_for_each(paths, old_name, relink, dry_run, workers)
+
+
+def unlink_repositories(
+    paths: list[str],
+    removed_account: dict,
+    dry_run: bool = False,
+    workers: int = DEFAULT_CASCADE_WORKERS
+) -> list[RepoChange]:
+    identity = account_identity(removed_account)
+
+    def unlink(path: str) -> None:
+        clear_linked_account(repo_path=path)
+        if not os.path.exists(os.path.join(path, ".git")):
+            return
+        # Only unset settings ghmulti put there; anything the user changed by hand stays.
+        git_config = GitConfigSnapshot.load(path)
+        set_local_git_config_values(
+            {
+                key: None for key, value in identity.items()
+                if value is not None and git_config.get(key, scope="--local") == value
+            },
+            cwd=path
+        )
+
+    return _run_for_each(paths, removed_account["name"], unlink, dry_run, workers)
+
+
+def _remote_owners(git_config: GitConfigSnapshot) -> set[str]:
+    owners: set[str] = set()
+    for name in git_config.remote_names():
+        for url in git_config.get_all(f"remote.{name}.url", scope="--local"):
+            location = parse_remote_url(url.strip())
+            if location is not None:
+                owners.add(location.owner.lower())
+    return owners
+
+
+def link_repositories_under(
+    root: str,
+    account: dict,
+    owners: Iterable[str] = (),
+    dry_run: bool = False,
+    workers: int = DEFAULT_CASCADE_WORKERS
+) -> tuple[list[RepoChange], list[str]]:
+    """Link every repository under `root` to `account`; returns the changes and the paths the owner filter excluded.
+
+    Each repository gets one batched local config write, and repositories are processed concurrently.
+    """
+    from cli.commands.link import link_changes
+    from cli.commands.link import link_repository
+
+    wanted_owners = {owner.lower() for owner in owners}
+    filtered: list[str] = []
+    candidates: list[tuple[str, GitConfigSnapshot]] = []
+    for repository in scan_repositories(root):
+        if repository.error:
+            continue
+        git_config = GitConfigSnapshot.load(repository.path)
+        if wanted_owners and not wanted_owners & _remote_owners(git_config):
+            filtered.append(repository.path)
+        else:
+            candidates.append((repository.path, git_config))
+
+    def process(candidate: tuple[str, GitConfigSnapshot]) -> RepoChange:
+        path, git_config = candidate
+        try:
+            pending = link_changes(account, repo_path=path, git_config=git_config)
+            if not pending and get_linked_account(repo_path=path) == account["name"]:
+                if not dry_run:
+                    record_link(path, account["name"])
+                return RepoChange(path, "skipped")
+            if dry_run:
+                return RepoChange(path, "planned")
+            link_repository(account, repo_path=path, git_config=git_config)
+            return RepoChange(path, "updated")
+        except (OSError, subprocess.CalledProcessError) as exc:
+            return RepoChange(path, "error", str(exc))
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    filtered.sort()
+    if not candidates:
+        return [], filtered
+    with registry_session(), ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(candidates))), thread_name_prefix="ghmulti-link"
+    ) as pool:
+        return list(pool.map(process, candidates)), filtered
+
+
+def summarize_changes(changes: list[RepoChange]) -> dict[str, int]:
+    summary = {"updated": 0, "planned": 0, "skipped": 0, "error": 0}
+    for change in changes:
+        summary[change.status] += 1
+    return summary
@@ -0,0 +1,198 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from cli.config import DATA_DIR
+from cli.config import STATE_DIR
+
+REGISTRY_PATH = DATA_DIR / "repos.sqlite3"
+# Where releases before the move kept it; adopted on first use.
+LEGACY_REGISTRY_PATH = STATE_DIR / "repos.sqlite3"
+REGISTRY_PATH_ENV = "GHMULTI_REPO_REGISTRY"
+
+logger = logging.getLogger(__name__)
+# The registry bulk operations share (see registry_session); None outside one.
+_session_registry: Optional["RepoRegistry"] = None
+_session_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    path TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS repos_by_account ON repos (account);
+"""
+
+
+def registry_path() -> Path:
+    override = os.environ.get(REGISTRY_PATH_ENV)
+    return Path(override) if override else REGISTRY_PATH
+
+
+def _adopt_legacy_registry(path: Path) -> None:
+    if path != REGISTRY_PATH or path.exists() or not LEGACY_REGISTRY_PATH.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The WAL and shared-memory files travel with the database so no committed link is lost.
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.replace(f"{LEGACY_REGISTRY_PATH}{suffix}", f"{path}{suffix}")
+        except FileNotFoundError:
+            pass
+
+
+def normalize_repo_path(repo_path: str | Path) -> str:
+    return os.path.realpath(repo_path)
+
+
+@dataclass(frozen=True)
+class RegisteredRepo:
+    path: str
+    account: str
+
+
+@dataclass
+class RepairReport:
+    removed: list[str] = field(default_factory=list)
+    updated: list[RegisteredRepo] = field(default_factory=list)
+    added: list[RegisteredRepo] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "removed": self.removed,
+            "updated": [{"path": repo.path, "account": repo.account} for repo in self.updated],
+            "added": [{"path": repo.path, "account": repo.account} for repo in self.added],
+        }
+
+
+class RepoRegistry:
+    """Index of linked repositories (path -> account) so account-wide operations never crawl the disk."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or registry_path()
+        _adopt_legacy_registry(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RepoRegistry":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def record(self, repo_path: str | Path, account: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO repos (path, account, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET account = excluded.account, updated_at = excluded.updated_at",
+                (normalize_repo_path(repo_path), account, time.time())
+            )
+
+    def forget(self, repo_path: str | Path) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM repos WHERE path = ?", (normalize_repo_path(repo_path),))
+
+    def account_for(self, repo_path: str | Path) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT account FROM repos WHERE path = ?", (normalize_repo_path(repo_path),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def repos_for(self, account: str) -> list[RegisteredRepo]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT path, account FROM repos WHERE account = ? ORDER BY path", (account,)
+            ).fetchall()
+        return [RegisteredRepo(*row) for row in rows]
+
+    def all(self) -> list[RegisteredRepo]:
+        with self._lock:
+            rows = self._connection.execute("SELECT path, account FROM repos ORDER BY path").fetchall()
+        return [RegisteredRepo(*row) for row in rows]
+
+    def repair(self, scan_roots: Iterable[str | Path] = ()) -> RepairReport:
+        """Drop entries whose link is gone, follow links that changed, and register links found under scan_roots."""
+        from cli.scanner import describe_repository
+        from cli.scanner import scan_repositories
+
+        report = RepairReport()
+        for entry in self.all():
+            repository = describe_repository(entry.path) if os.path.isdir(entry.path) else None
+            account = repository.account if repository else None
+            if account is None:
+                self.forget(entry.path)
+                report.removed.append(entry.path)
+            elif account != entry.account:
+                self.record(entry.path, account)
+                report.updated.append(RegisteredRepo(entry.path, account))
+
+        for root in scan_roots:
+            for repository in scan_repositories(root):
+                if repository.account and self.account_for(repository.path) is None:
+                    self.record(repository.path, repository.account)
+                    report.added.append(RegisteredRepo(normalize_repo_path(repository.path), repository.account))
+        return report
+
+
+@contextmanager
+def registry_session() -> Iterator[None]:
+    """Send record_link/forget_link from every thread through one connection until the block exits.
+
+    Concurrent link workers otherwise each open the database and can time out on each other's locks.
+    """
+    global _session_registry
+    with _session_lock:
+        if _session_registry is not None:
+            owner = False
+        else:
+            owner = True
+            try:
+                _session_registry = RepoRegistry()
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("Could not open the repository registry: %s", exc)
+    try:
+        yield
+    finally:
+        if owner:
+            with _session_lock:
+                registry, _session_registry = _session_registry, None
+            if registry is not None:
+                registry.close()
+
+
+def _update_registry(action: str, repo_path: str | Path, update: Callable[[RepoRegistry], None]) -> None:
+    # The registry is an index; failing to update it must never fail the link itself, but it is reported.
+    try:
+        if _session_registry is not None:
+            update(_session_registry)
+            return
+        with RepoRegistry() as registry:
+            update(registry)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Could not %s %s in the repository registry (`ghmulti repos --repair` fixes it): %s", action, repo_path, exc)
+
+
+def record_link(repo_path: str | Path, account: str) -> None:
+    _update_registry("record", repo_path, lambda registry: registry.record(repo_path, account))
+
+
+def forget_link(repo_path: str | Path) -> None:
+    _update_registry("forget", repo_path, lambda registry: registry.forget(repo_path))
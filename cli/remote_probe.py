@@ -0,0 +1,335 @@
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import asdict
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from urllib.parse import urlsplit
+
+from cli.config import STATE_DIR
+from cli.config import json_file_transaction
+from cli.config import load_json_file
+from cli.credential import github_hosts
+from cli.git_utils import git_auth_env
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5
+DEFAULT_PROBE_DEADLINE_SECONDS = 15.0
+DEFAULT_PROBE_WORKERS = 8
+DEFAULT_PROBES_PER_HOST = 4
+PROBE_CACHE_PATH = STATE_DIR / "remote-probes.json"
+PROBE_CACHE_TTL_ENV = "GHMULTI_REMOTE_PROBE_TTL"
+DEFAULT_PROBE_CACHE_TTL_SECONDS = 60
+
+_SSH_URL = re.compile(r"^(?:ssh|git\+ssh|ssh\+git)://(?:(?P<user>[^@/]+)@)?(?P<host>[^/:]+)(?::(?P<port>\d+))?/", re.IGNORECASE)
+_SCP_LIKE = re.compile(r"^(?:(?P<user>[^@/]+)@)?(?P<host>[^/:]+):(?!//)")
+# GitHub-style greeting for a key that authenticated but has no shell: "Hi octocat! You've successfully authenticated".
+_SSH_GREETING = re.compile(r"Hi (?P<user>[^!]+)! You've successfully authenticated")
+_HTTPS_AUTH_FAILURES = (
+    "Authentication failed",
+    "could not read Username",
+    "could not read Password",
+    "terminal prompts disabled",
+    "Repository not found",
+    "returned error: 401",
+    "returned error: 403",
+)
+_SSH_AUTH_FAILURES = ("Permission denied", "Host key verification failed", "Too many authentication failures")
+
+
+@dataclass(frozen=True)
+class SshEndpoint:
+    user: Optional[str]
+    host: str
+    port: Optional[int]
+
+    @property
+    def destination(self) -> str:
+        return f"{self.user}@{self.host}" if self.user else self.host
+
+
+@dataclass
+class RemoteProbe:
+    name: str
+    url: str
+    # "ssh", "https", "http" or "unknown".
+    protocol: str
+    reachable: Optional[bool] = None
+    authenticated: Optional[bool] = None
+    latency_ms: Optional[float] = None
+    # Branches advertised by an HTTPS remote.
+    refs: Optional[int] = None
+    message: str = ""
+    cached: bool = False
+    age_seconds: Optional[float] = None
+
+    def apply(self, outcome: "ProbeOutcome", cached: bool = False, age_seconds: Optional[float] = None) -> None:
+        self.reachable, self.authenticated, self.latency_ms, self.refs, self.message = outcome
+        self.cached = cached
+        self.age_seconds = age_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ProbeOutcome(NamedTuple):
+    reachable: Optional[bool]
+    authenticated: Optional[bool]
+    latency_ms: Optional[float]
+    refs: Optional[int]
+    message: str
+
+
+def remote_protocol(url: str) -> str:
+    lowered = url.lower()
+    if lowered.startswith("https://"):
+        return "https"
+    if lowered.startswith("http://"):
+        return "http"
+    if ssh_endpoint(url) is not None:
+        return "ssh"
+    return "unknown"
+
+
+def ssh_endpoint(url: str) -> Optional[SshEndpoint]:
+    match = _SSH_URL.match(url)
+    if match is None and "://" not in url:
+        match = _SCP_LIKE.match(url)
+    if match is None:
+        return None
+    port = match.groupdict().get("port")
+    return SshEndpoint(match.group("user"), match.group("host").lower(), int(port) if port else None)
+
+
+def ssh_batch_options(identity_file: Optional[str]) -> list[str]:
+    """ssh options for unattended use with `identity_file` (the account's key) when there is one."""
+    # Never stop for a passphrase, password or host-key prompt.
+    options = ["-o", "BatchMode=yes"]
+    if identity_file:
+        # Offer only the account's key so an agent key of another account cannot answer instead.
+        options += ["-i", identity_file, "-o", "IdentitiesOnly=yes"]
+    return options
+
+
+def ssh_probe_command(endpoint: SshEndpoint, identity_file: Optional[str], connect_timeout: int) -> list[str]:
+    command = [
+        "ssh", "-T",
+        *ssh_batch_options(identity_file),
+        # Bound the TCP/handshake wait.
+        "-o", f"ConnectTimeout={connect_timeout}",
+        "-o", "ConnectionAttempts=1",
+    ]
+    if endpoint.port:
+        command += ["-p", str(endpoint.port)]
+    return command + [endpoint.destination]
+
+
+def probe_ssh(
+    endpoint: SshEndpoint,
+    identity_file: Optional[str] = None,
+    connect_timeout: int = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    timeout: float = DEFAULT_PROBE_DEADLINE_SECONDS
+) -> ProbeOutcome:
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(
+            ssh_probe_command(endpoint, identity_file, connect_timeout),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            errors="replace",
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return ProbeOutcome(False, None, None, None, f"No answer within {timeout:g}s.")
+    except OSError as exc:
+        return ProbeOutcome(None, None, None, None, f"Could not run ssh: {exc}")
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    output = (result.stderr or result.stdout).strip()
+    last_line = output.splitlines()[-1] if output else ""
+    greeting = _SSH_GREETING.search(output)
+    if greeting:
+        return ProbeOutcome(True, True, latency_ms, None, f"Authenticated as {greeting.group('user')}.")
+    if any(marker in output for marker in _SSH_AUTH_FAILURES):
+        return ProbeOutcome(True, False, latency_ms, None, last_line)
+    # GitHub exits 1 after a successful handshake because it offers no shell.
+    if result.returncode in (0, 1):
+        return ProbeOutcome(True, True, latency_ms, None, last_line or "Connected.")
+    return ProbeOutcome(False, None, latency_ms, None, last_line or f"ssh exited with status {result.returncode}.")
+
+
+def probe_https(
+    url: str,
+    token: Optional[str] = None,
+    username: Optional[str] = None,
+    timeout: float = DEFAULT_PROBE_DEADLINE_SECONDS
+) -> ProbeOutcome:
+    """Run `git ls-remote --heads` against `url`, with the account's token when one is given."""
+    started = time.perf_counter()
+    try:
+        with git_auth_env(token=token, username=username) as env:
+            env["GIT_TERMINAL_PROMPT"] = "0"
+            result = subprocess.run(
+                [
+                    "git",
+                    # Give up on a stalled transfer instead of waiting for the kernel's TCP timeout.
+                    "-c", "http.lowSpeedLimit=1",
+                    "-c", f"http.lowSpeedTime={max(1, int(timeout))}",
+                    "ls-remote", "--heads", url,
+                ],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                errors="replace",
+                env=env,
+                timeout=timeout
+            )
+    except subprocess.TimeoutExpired:
+        return ProbeOutcome(False, None, None, None, f"No answer within {timeout:g}s.")
+    except OSError as exc:
+        return ProbeOutcome(None, None, None, None, f"Could not run git: {exc}")
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    if result.returncode == 0:
+        refs = sum(1 for line in result.stdout.splitlines() if line.strip())
+        return ProbeOutcome(True, True if token else None, latency_ms, refs, f"{refs} branch(es) advertised.")
+    stderr = result.stderr.strip()
+    last_line = stderr.splitlines()[-1] if stderr else f"git exited with status {result.returncode}."
+    if any(marker in stderr for marker in _HTTPS_AUTH_FAILURES):
+        return ProbeOutcome(True, False, latency_ms, None, last_line)
+    return ProbeOutcome(False, None, latency_ms, None, last_line)
+
+
+def remote_probe_cache_ttl_seconds() -> float:
+    try:
+        return max(0.0, float(os.environ.get(PROBE_CACHE_TTL_ENV, DEFAULT_PROBE_CACHE_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_PROBE_CACHE_TTL_SECONDS
+
+
+def _cache_key(kind: str, target: str, credential: Optional[str]) -> str:
+    from cli.github_api import token_fingerprint
+
+    # Credentials are part of the key (hashed) so switching accounts never reuses another account's answer.
+    return token_fingerprint(f"{kind}\0{target}\0{credential or ''}")
+
+
+def _store_probe_cache(path: Path, updates: dict[str, dict[str, Any]], ttl_seconds: float, now: float) -> None:
+    try:
+        with json_file_transaction(path) as data:
+            expired = [
+                key for key, entry in data.items()
+                if not isinstance(entry, dict) or now - entry.get("checked_at", 0) >= ttl_seconds
+            ]
+            for key in expired:
+                del data[key]
+            data.update(updates)
+    except OSError:
+        # The cache is an optimization; a read-only state dir must not break the check.
+        pass
+
+
+def _https_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def probe_remotes(
+    remotes: dict[str, str],
+    account: Optional[dict[str, Any]] = None,
+    token: Optional[str] = None,
+    connect_timeout: int = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    deadline_seconds: float = DEFAULT_PROBE_DEADLINE_SECONDS,
+    max_workers: int = DEFAULT_PROBE_WORKERS,
+    per_host: int = DEFAULT_PROBES_PER_HOST,
+    refresh: bool = False,
+    ttl_seconds: Optional[float] = None,
+    cache_path: Optional[Path] = None
+) -> list[RemoteProbe]:
+    """Probe SSH and HTTPS remotes concurrently; identical targets are probed once and answers cached briefly."""
+    key_path = (account or {}).get("ssh_key_path")
+    identity_file = os.path.expanduser(key_path) if key_path else None
+    if identity_file and not os.path.exists(identity_file):
+        identity_file = None
+    username = (account or {}).get("username")
+    ttl = remote_probe_cache_ttl_seconds() if ttl_seconds is None else ttl_seconds
+    path = cache_path or PROBE_CACHE_PATH
+    token_hosts = github_hosts()
+
+    probes = [RemoteProbe(name, url, remote_protocol(url)) for name, url in remotes.items()]
+    # Cache key -> (host bucket, probe function, probes sharing the answer).
+    targets: dict[str, tuple[str, Callable[[], ProbeOutcome], list[RemoteProbe]]] = {}
+    for probe in probes:
+        if probe.protocol == "ssh":
+            endpoint = ssh_endpoint(probe.url)
+            key = _cache_key("ssh", f"{endpoint.destination}:{endpoint.port or ''}", identity_file)
+            check = partial(probe_ssh, endpoint, identity_file, connect_timeout, deadline_seconds)
+            host = endpoint.host
+        elif probe.protocol == "https":
+            host = _https_host(probe.url)
+            # Other hosts get the user's own credential helpers; a GitHub token must never reach them.
+            host_token = token if host in token_hosts else None
+            key = _cache_key("https", probe.url, host_token)
+            check = partial(probe_https, probe.url, host_token, username if host_token else None, deadline_seconds)
+        else:
+            probe.message = "Insecure HTTP configured." if probe.protocol == "http" else "Unknown protocol."
+            continue
+        targets.setdefault(key, (host, check, []))[2].append(probe)
+    if not targets:
+        return probes
+
+    now = time.time()
+    cached = {} if refresh or ttl <= 0 else load_json_file(path)
+    pending: dict[str, tuple[str, Callable[[], ProbeOutcome], list[RemoteProbe]]] = {}
+    for key, target in targets.items():
+        entry = cached.get(key)
+        if isinstance(entry, dict) and 0 <= now - entry.get("checked_at", 0) < ttl:
+            try:
+                outcome = ProbeOutcome(**{field: entry[field] for field in ProbeOutcome._fields})
+            except KeyError:
+                pending[key] = target
+                continue
+            for probe in target[2]:
+                probe.apply(outcome, cached=True, age_seconds=round(now - entry["checked_at"], 3))
+        else:
+            pending[key] = target
+    if not pending:
+        return probes
+
+    host_slots = {host: threading.BoundedSemaphore(per_host) for host, _, _ in pending.values()}
+
+    def run(host: str, check: Callable[[], ProbeOutcome]) -> ProbeOutcome:
+        with host_slots[host]:
+            return check()
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))), thread_name_prefix="ghmulti-probe")
+    updates: dict[str, dict[str, Any]] = {}
+    try:
+        futures = {executor.submit(run, host, check): key for key, (host, check, _) in pending.items()}
+        wait(futures, timeout=max(0.0, deadline_seconds - (time.monotonic() - started)))
+        for future, key in futures.items():
+            if future.done() and not future.cancelled():
+                outcome = future.result()
+                if outcome.reachable is not None:
+                    updates[key] = {**outcome._asdict(), "checked_at": time.time()}
+            else:
+                outcome = ProbeOutcome(
+                    False, None, None, None, f"Check did not finish within the {deadline_seconds:g}s deadline."
+                )
+            for probe in pending[key][2]:
+                probe.apply(outcome)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if updates and ttl > 0:
+        _store_probe_cache(path, updates, ttl, time.time())
+    return probes
@@ -0,0 +1,131 @@
+import os
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+RECURSIVE_SUFFIX = "**"
+WILDCARD = "*"
+
+
+@dataclass(frozen=True)
+class DirectoryRule:
+    """Repositories under `pattern` use `account`; `DIR/**` covers DIR and everything below it."""
+
+    pattern: str
+    account: str
+
+    def to_dict(self) -> dict[str, str]:
+        return {"pattern": self.pattern, "account": self.account}
+
+
+def _split(path: str) -> tuple[str, ...]:
+    return PurePath(os.path.normcase(path)).parts
+
+
+def compile_pattern(pattern: str) -> tuple[tuple[str, ...], bool]:
+    """Path components of `pattern` and whether it is recursive; ValueError if it is not a usable rule."""
+    expanded = os.path.expanduser(pattern.strip())
+    if not expanded:
+        raise ValueError("Rule pattern is empty.")
+    if not os.path.isabs(expanded):
+        raise ValueError(f"Rule pattern '{pattern}' must be an absolute path (or start with ~).")
+    parts = _split(os.path.normpath(expanded))
+    recursive = parts[-1] == RECURSIVE_SUFFIX
+    if recursive:
+        parts = parts[:-1]
+    for part in parts[1:]:
+        if part != WILDCARD and (WILDCARD in part or "?" in part or "[" in part):
+            raise ValueError(f"Rule pattern '{pattern}' may only use '*' for a whole directory name and '**' at the end.")
+    return parts, recursive
+
+
+def normalize_rules(raw: Any) -> list[dict[str, str]]:
+    """Valid rules from the config in file order; later duplicates of a pattern are dropped."""
+    if not isinstance(raw, list):
+        return []
+    rules: list[dict[str, str]] = []
+    seen: set[tuple[tuple[str, ...], bool]] = set()
+    for entry in raw:
+        if not isinstance(entry, dict):
+            continue
+        pattern, account = entry.get("pattern"), entry.get("account")
+        if not isinstance(pattern, str) or not isinstance(account, str) or not account.strip():
+            continue
+        try:
+            key = compile_pattern(pattern)
+        except ValueError:
+            continue
+        if key not in seen:
+            seen.add(key)
+            rules.append({"pattern": pattern.strip(), "account": account.strip()})
+    return rules
+
+
+class _Node:
+    __slots__ = ("children", "exact", "recursive")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.exact: Optional[DirectoryRule] = None
+        self.recursive: Optional[DirectoryRule] = None
+
+
+class RuleTrie:
+    """Directory rules keyed by path component, so matching a path costs O(depth) rather than O(rules)."""
+
+    __slots__ = ("rules", "_root")
+
+    def __init__(self, rules: Iterable[DirectoryRule] = ()):
+        self.rules: list[DirectoryRule] = []
+        self._root = _Node()
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def from_dicts(cls, rules: Any) -> "RuleTrie":
+        return cls(DirectoryRule(rule["pattern"], rule["account"]) for rule in normalize_rules(rules))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: DirectoryRule) -> None:
+        parts, recursive = compile_pattern(rule.pattern)
+        node = self._root
+        for part in parts:
+            node = node.children.setdefault(part, _Node())
+        if recursive:
+            node.recursive = node.recursive or rule
+        else:
+            node.exact = node.exact or rule
+        self.rules.append(rule)
+
+    def match(self, path: str | os.PathLike) -> Optional[DirectoryRule]:
+        """The most specific rule covering `path`: the deepest one, then the one with fewer wildcards."""
+        if not self.rules:
+            return None
+        parts = _split(os.path.abspath(path))
+        best: Optional[DirectoryRule] = None
+        best_key = (-1, -1, -1)
+        # Only `*` components branch, so without wildcards this is a single walk down the path.
+        nodes = [(self._root, 0)]
+        for depth in range(len(parts) + 1):
+            following = []
+            for node, literals in nodes:
+                if node.recursive and (depth, literals, 0) > best_key:
+                    best, best_key = node.recursive, (depth, literals, 0)
+                if depth == len(parts):
+                    if node.exact and (depth, literals, 1) > best_key:
+                        best, best_key = node.exact, (depth, literals, 1)
+                    continue
+                child = node.children.get(parts[depth])
+                if child is not None:
+                    following.append((child, literals + 1))
+                child = node.children.get(WILDCARD)
+                if child is not None and depth:
+                    following.append((child, literals))
+            if not following:
+                break
+            nodes = following
+        return best
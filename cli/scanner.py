@@ -0,0 +1,153 @@
+import os
+import queue
+import threading
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+from cli.config import LINKED_GIT_CONFIG_KEY
+from cli.config import get_linked_account
+from cli.git_config import GitConfigError
+from cli.git_config import read_repository_config_entries
+from cli.git_config import repository_at
+
+# Directories that never contain checkouts worth reporting and can be huge.
+PRUNED_DIRECTORIES = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "bower_components",
+    "node_modules",
+    "third_party",
+    "vendor",
+    "venv",
+})
+DEFAULT_SCAN_WORKERS = 8
+_DONE = object()
+
+
+@dataclass
+class ScannedRepository:
+    path: str
+    linked_account: Optional[str]
+    linked_account_from_git_config: Optional[str]
+    worktree: bool
+    # Set when the directory could not be scanned; the other fields are then empty.
+    error: Optional[str] = None
+
+    @property
+    def account(self) -> Optional[str]:
+        return self.linked_account or self.linked_account_from_git_config
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {**asdict(self), "account": self.account}
+        if self.error is None:
+            del data["error"]
+        return data
+
+
+def describe_repository(path: str | Path) -> Optional[ScannedRepository]:
+    repository = repository_at(path)
+    if repository is None or repository.work_tree is None:
+        return None
+
+    linked_git_config = None
+    try:
+        values = [
+            value for _, _, key, value in read_repository_config_entries(repository)
+            if key == LINKED_GIT_CONFIG_KEY and value is not None
+        ]
+        if values:
+            linked_git_config = values[-1].strip() or None
+    except GitConfigError:
+        pass
+
+    return ScannedRepository(
+        path=str(repository.work_tree),
+        linked_account=get_linked_account(repo_path=repository.work_tree),
+        linked_account_from_git_config=linked_git_config,
+        worktree=(repository.work_tree / ".git").is_file()
+    )
+
+
+def scan_repositories(
+    root: str | Path,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    max_depth: Optional[int] = None,
+    pruned: frozenset[str] = PRUNED_DIRECTORIES
+) -> Iterator[ScannedRepository]:
+    """Yield repositories under `root` as they are found; order is not deterministic.
+
+    A directory that fails unexpectedly is yielded with `error` set instead of stopping the scan.
+    """
+    work: queue.Queue = queue.Queue()
+    results: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    lock = threading.Lock()
+    pending = 1
+
+    def worker() -> None:
+        nonlocal pending
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            directory, depth = item
+            subdirectories: list[str] = []
+            try:
+                has_git = False
+                if not stop.is_set():
+                    try:
+                        with os.scandir(directory) as entries:
+                            for entry in entries:
+                                if entry.name == ".git":
+                                    has_git = True
+                                    continue
+                                if entry.name in pruned:
+                                    continue
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        subdirectories.append(entry.path)
+                                except OSError:
+                                    continue
+                    except OSError:
+                        pass
+
+                if has_git:
+                    repository = describe_repository(directory)
+                    if repository is not None:
+                        results.put(repository)
+            except Exception as exc:
+                results.put(ScannedRepository(directory, None, None, False, error=f"{type(exc).__name__}: {exc}"))
+            finally:
+                # Always settle the count, or the consumer would wait forever for the end marker.
+                if max_depth is not None and depth >= max_depth:
+                    subdirectories = []
+                with lock:
+                    pending += len(subdirectories) - 1
+                    finished = pending == 0
+                for subdirectory in subdirectories:
+                    work.put((subdirectory, depth + 1))
+                if finished:
+                    results.put(_DONE)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    work.put((os.path.abspath(root), 0))
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        for _ in threads:
+            work.put(None)
@@ -0,0 +1,238 @@
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from cli.config import LINKED_GIT_CONFIG_KEY
+from cli.config import get_active_account
+from cli.config import get_linked_account
+from cli.config import get_token
+from cli.credential import github_hosts
+from cli.git_config import discover_repository
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import choose_remote
+from cli.git_utils import git_auth_env
+from cli.git_utils import parse_remote_url
+from cli.remote_probe import remote_protocol
+from cli.remote_probe import ssh_batch_options
+
+DEFAULT_SYNC_WORKERS = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_SYNC_TIMEOUT_SECONDS = 300
+# Remotes that are not host-based (local paths, file://) share one concurrency bucket.
+LOCAL_HOST = "local"
+
+# Final progress line git prints for an object transfer, e.g.
+# "Receiving objects: 100% (12/12), 4.02 KiB | 4.02 MiB/s, done."
+_TRANSFER_LINE = re.compile(
+    r"(?:Receiving|Unpacking) objects:\s+100% \(\d+/\d+\)(?:,\s*(?P<size>[\d.]+)\s*(?P<unit>bytes|KiB|MiB|GiB))?"
+)
+_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+
+
+@dataclass
+class SyncTarget:
+    path: str
+    account: Optional[str]
+    username: Optional[str]
+    remote: str
+    url: Optional[str]
+    host: str
+    # GIT_SSH_COMMAND for SSH remotes; None keeps whatever ssh command git would use.
+    ssh_command: Optional[str] = None
+
+
+@dataclass
+class SyncResult:
+    path: str
+    account: Optional[str]
+    remote: str
+    host: str
+    # "ok" or "error".
+    status: str
+    duration_ms: float
+    bytes_received: Optional[int]
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parse_bytes_received(progress: str) -> Optional[int]:
+    """Bytes transferred according to git's --progress output; 0 when nothing was fetched, None if unknown."""
+    received: Optional[int] = 0
+    # Progress updates are separated by carriage returns; the last update carries the total.
+    for line in re.split(r"[\r\n]", progress):
+        match = _TRANSFER_LINE.search(line)
+        if match is None:
+            continue
+        if match.group("size") is None:
+            received = None
+        else:
+            received = int(float(match.group("size")) * _UNITS[match.group("unit")])
+    return received
+
+
+def object_store_bytes(objects_dir: Path) -> Optional[int]:
+    """Size of a repository's packs and loose objects; None when it cannot be read."""
+    total = 0
+    try:
+        for entry in os.scandir(objects_dir):
+            if entry.name == "pack" or (len(entry.name) == 2 and entry.is_dir()):
+                with os.scandir(entry.path) as files:
+                    total += sum(item.stat().st_size for item in files if item.is_file())
+    except OSError:
+        return None
+    return total
+
+
+def _objects_dir(path: str) -> Optional[Path]:
+    repository = discover_repository(path)
+    return repository.common_dir / "objects" if repository else None
+
+
+def _ssh_command(account: Optional[dict], git_config: GitConfigSnapshot) -> Optional[str]:
+    key_path = (account or {}).get("ssh_key_path")
+    if not key_path and (os.environ.get("GIT_SSH_COMMAND") or git_config.has("core.sshCommand")):
+        # A command the user configured (a wrapper, a proxy) is left alone.
+        return None
+    identity_file = os.path.expanduser(key_path) if key_path else None
+    return shlex.join(["ssh", *ssh_batch_options(identity_file)])
+
+
+def plan_sync(paths: Iterable[str], account_name: Optional[str] = None, remote: Optional[str] = None) -> list[SyncTarget]:
+    """Resolve account, remote and host for each repository; repositories linked elsewhere are dropped when account_name is set."""
+    targets: list[SyncTarget] = []
+    seen: set[str] = set()
+    for path in paths:
+        if path in seen:
+            continue
+        seen.add(path)
+        account = get_active_account(repo_path=path)
+        if account_name and (account is None or account["name"] != account_name):
+            continue
+        git_config = GitConfigSnapshot.load(path)
+        linked_name = get_linked_account(repo_path=path) or git_config.get(LINKED_GIT_CONFIG_KEY, scope="--local")
+        chosen_remote = choose_remote(linked_name, remote, cwd=path, git_config=git_config)
+        url = git_config.get(f"remote.{chosen_remote}.url")
+        location = parse_remote_url(url) if url else None
+        targets.append(SyncTarget(
+            path=path,
+            account=account["name"] if account else None,
+            username=account["username"] if account else None,
+            remote=chosen_remote,
+            url=url,
+            host=location.host if location else LOCAL_HOST,
+            ssh_command=_ssh_command(account, git_config) if url and remote_protocol(url) == "ssh" else None
+        ))
+    return targets
+
+
+def _interleave_by_host(targets: list[SyncTarget]) -> list[SyncTarget]:
+    # Round-robin across hosts so workers waiting on one host's cap do not starve the others.
+    by_host: dict[str, list[SyncTarget]] = {}
+    for target in targets:
+        by_host.setdefault(target.host, []).append(target)
+    ordered: list[SyncTarget] = []
+    queues = list(by_host.values())
+    while queues:
+        ordered.extend(queue.pop(0) for queue in queues)
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+def sync_command(pull: bool, remote: str) -> list[str]:
+    if pull:
+        return ["git", "pull", "--ff-only", "--progress", remote]
+    return ["git", "fetch", "--progress", remote]
+
+
+def sync_repositories(
+    targets: list[SyncTarget],
+    pull: bool = False,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    timeout_seconds: float = DEFAULT_SYNC_TIMEOUT_SECONDS,
+    token_for: Callable[[str], Optional[str]] = get_token
+) -> Iterator[SyncResult]:
+    """Fetch (or fast-forward) every target concurrently and yield results as they finish."""
+    if not targets:
+        return
+
+    # Only HTTPS remotes on GitHub get the account token; any other host keeps the user's own credentials.
+    token_hosts = github_hosts()
+    token_targets = {
+        id(target) for target in targets
+        if target.username and (target.url or "").startswith("https://") and target.host.lower() in token_hosts
+    }
+    # Keyring backends are not guaranteed to be thread-safe, so look tokens up before fanning out.
+    tokens: dict[str, Optional[str]] = {}
+    for target in targets:
+        if id(target) in token_targets and target.username not in tokens:
+            tokens[target.username] = token_for(target.username)
+
+    host_slots = {target.host: threading.BoundedSemaphore(per_host) for target in targets}
+
+    def run(target: SyncTarget) -> SyncResult:
+        with host_slots[target.host]:
+            started = time.perf_counter()
+            token = tokens.get(target.username) if id(target) in token_targets else None
+            objects_dir = _objects_dir(target.path)
+            stored_before = object_store_bytes(objects_dir) if objects_dir else None
+            try:
+                with git_auth_env(token=token, username=target.username) as env:
+                    # Never block a batch run on an interactive credential prompt.
+                    env["GIT_TERMINAL_PROMPT"] = "0"
+                    if target.ssh_command:
+                        env["GIT_SSH_COMMAND"] = target.ssh_command
+                    completed = subprocess.run(
+                        sync_command(pull, target.remote),
+                        cwd=target.path,
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        errors="replace",
+                        timeout=timeout_seconds
+                    )
+                error = None
+                if completed.returncode != 0:
+                    stderr_lines = completed.stderr.strip().splitlines()
+                    error = stderr_lines[-1] if stderr_lines else f"git exited with status {completed.returncode}"
+                received = parse_bytes_received(completed.stderr)
+                if not received and stored_before is not None:
+                    # Small transfers are unpacked without a progress summary; the object store grew instead.
+                    stored_after = object_store_bytes(objects_dir)
+                    if stored_after is not None and stored_after >= stored_before:
+                        received = stored_after - stored_before
+            except subprocess.TimeoutExpired:
+                error, received = f"timed out after {timeout_seconds:g}s", None
+            except OSError as exc:
+                error, received = str(exc), None
+            return SyncResult(
+                path=target.path,
+                account=target.account,
+                remote=target.remote,
+                host=target.host,
+                status="error" if error else "ok",
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                bytes_received=received,
+                error=error
+            )
+
+    ordered = _interleave_by_host(targets)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ordered))), thread_name_prefix="ghmulti-sync") as pool:
+        futures = [pool.submit(run, target) for target in ordered]
+        for future in as_completed(futures):
+            yield future.result()
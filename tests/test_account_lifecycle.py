@@ -1,7 +1,10 @@
 import json
 import os
 import shutil
+import subprocess
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 from click.testing import CliRunner
@@ -9,6 +12,9 @@ from click.testing import CliRunner
 from cli.commands.remove import remove_account
 from cli.commands.rename import rename_account
 from cli.commands.update import update_account
+from cli.commands.link import link_account_logic
+from cli.registry import REGISTRY_PATH_ENV
+from cli.registry import RepoRegistry
 
 
 class TestAccountLifecycle(unittest.TestCase):
@@ -78,5 +84,103 @@ class TestAccountLifecycle(unittest.TestCase):
         mock_delete.assert_called_once_with("ghmulti", "personal_user")
 
 
+class TestCascadingAccountChanges(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-cascade")))
+        self.env_patch = patch.dict(os.environ, {REGISTRY_PATH_ENV: str(self.root / "repos.sqlite3")})
+        self.env_patch.start()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user", "gpg_key_id": "WORKGPG"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": "personal"
+                },
+                f,
+                indent=2
+            )
+        self.repos = [self._init_repo(f"repo{index}") for index in range(4)]
+        for repo in self.repos[:3]:
+            link_account_logic("work", repo_path=str(repo))
+        link_account_logic("personal", repo_path=str(self.repos[3]))
+        # Relinked by hand since registration; the cascade must leave it alone.
+        (self.repos[2] / ".ghmulti").write_text(json.dumps({"account": "personal"}), encoding="utf-8")
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _init_repo(self, name):
+        path = self.root / name
+        path.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        return path
+
+    def _git_config(self, repo, key):
+        result = subprocess.run(["git", "config", "--local", key], cwd=repo, capture_output=True, text=True)
+        return result.stdout.strip() or None
+
+    def _project_account(self, repo):
+        return json.loads((repo / ".ghmulti").read_text(encoding="utf-8"))["account"]
+
+    def test_rename_relinks_every_registered_repository(self):
+        result = self.runner.invoke(rename_account, ["work", "company", "--json"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        payload = json.loads(result.output)
+
+        self.assertEqual(payload["summary"], {"updated": 2, "planned": 0, "skipped": 1, "error": 0})
+        for repo in self.repos[:2]:
+            self.assertEqual(self._project_account(repo), "company")
+            self.assertEqual(self._git_config(repo, "ghmulti.linkedaccount"), "company")
+            self.assertEqual(self._git_config(repo, "user.signingkey"), "WORKGPG")
+        self.assertEqual(self._project_account(self.repos[2]), "personal")
+        with RepoRegistry() as registry:
+            self.assertEqual(
+                [repo.path for repo in registry.repos_for("company")],
+                [str(repo) for repo in self.repos[:2]]
+            )
+
+    def test_rename_dry_run_changes_nothing(self):
+        result = self.runner.invoke(rename_account, ["work", "company", "--dry-run", "--json"], catch_exceptions=False)
+        payload = json.loads(result.output)
+
+        self.assertEqual(payload["summary"]["planned"], 2)
+        self.assertEqual(self._project_account(self.repos[0]), "work")
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            self.assertTrue(any(account["name"] == "work" for account in json.load(f)["accounts"]))
+
+    @patch("keyring.delete_password")
+    def test_remove_unlinks_repositories_and_keeps_manual_settings(self, _mock_delete):
+        subprocess.run(["git", "config", "user.email", "me@example.com"], cwd=self.repos[1], check=True)
+
+        result = self.runner.invoke(remove_account, ["work", "--yes", "--json"], catch_exceptions=False)
+        payload = json.loads(result.output)
+
+        self.assertEqual(payload["summary"]["updated"], 2)
+        for repo in self.repos[:2]:
+            self.assertFalse((repo / ".ghmulti").exists())
+            self.assertIsNone(self._git_config(repo, "ghmulti.linkedaccount"))
+            self.assertIsNone(self._git_config(repo, "user.name"))
+        self.assertEqual(self._git_config(self.repos[1], "user.email"), "me@example.com")
+        self.assertEqual(self._project_account(self.repos[3]), "personal")
+        with RepoRegistry() as registry:
+            self.assertEqual(registry.repos_for("work"), [])
+
+    def test_errors_are_reported_per_repository(self):
+        # Without .git, writing ghmulti.linkedaccount fails for this repository only.
+        shutil.rmtree(self.repos[0] / ".git")
+        result = self.runner.invoke(rename_account, ["work", "company", "--json"], catch_exceptions=False)
+        payload = json.loads(result.output)
+        statuses = {change["path"]: change["status"] for change in payload["repositories"]}
+        self.assertEqual(statuses[str(self.repos[1])], "updated")
+        self.assertEqual(statuses[str(self.repos[0])], "error")
+
+
 if __name__ == "__main__":
     unittest.main()
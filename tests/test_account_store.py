@@ -0,0 +1,176 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli import config as config_module
+from cli.account_store import ACCOUNT_DB_ENV
+from cli.account_store import ACCOUNT_STORE_ENV
+from cli.account_store import AccountStore
+from cli.account_store import account_store_backend
+from cli.account_store import account_store_path
+from cli.commands.migrate_store import migrate_store
+from cli.config import clear_config_cache
+from cli.config import config_transaction
+from cli.config import get_account_by_name
+from cli.config import get_account_by_username
+from cli.config import load_account_index
+from cli.config import load_config
+from cli.config import load_rule_trie
+from cli.config import save_config
+from cli.config import set_active_account
+
+from timing import assert_within_budget
+from timing import budget
+
+ACCOUNTS = [
+    {"name": "work", "username": "work_user", "ssh_key_path": "~/.ssh/id_work"},
+    {"name": "personal", "username": "personal_user", "gpg_key_id": "ABC123"},
+]
+BENCHMARK_ACCOUNTS = 10_000
+# Per-operation budgets in milliseconds, checked only on opt-in (see tests/timing.py).
+LOOKUP_BUDGET_MS = budget("GHMULTI_ACCOUNT_LOOKUP_BUDGET_MS", 5)
+UPDATE_BUDGET_MS = budget("GHMULTI_ACCOUNT_UPDATE_BUDGET_MS", 250)
+
+
+class TestAccountStore(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.root = Path(tempfile.mkdtemp(prefix="ghmulti-account-store"))
+        self.config_path = self.root / ".ghmulti.json"
+        self.patches = [
+            patch("cli.config.CONFIG_PATH", self.config_path),
+            patch.dict(os.environ, {ACCOUNT_STORE_ENV: "", ACCOUNT_DB_ENV: ""}),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+        clear_config_cache()
+        self.config_path.write_text(json.dumps({"accounts": ACCOUNTS, "active": "personal"}), encoding="utf-8")
+
+    def tearDown(self):
+        for patcher in reversed(self.patches):
+            patcher.stop()
+        clear_config_cache()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _migrate(self, target):
+        result = self.runner.invoke(migrate_store, [target, "--json"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return json.loads(result.output)
+
+    def test_migration_round_trip_keeps_accounts_and_order(self):
+        before = load_config()
+        report = self._migrate("sqlite")
+        self.assertEqual((report["from"], report["to"], report["accounts"]), ("json", "sqlite", 2))
+        self.assertEqual(account_store_path(), self.root / ".ghmulti.sqlite3")
+        self.assertFalse(self.config_path.exists())
+        self.assertTrue(Path(report["backup"]).exists())
+        self.assertEqual(account_store_backend(), "sqlite")
+        self.assertEqual(load_config(), before)
+
+        report = self._migrate("json")
+        self.assertEqual(report["from"], "sqlite")
+        self.assertEqual(account_store_backend(), "json")
+        self.assertEqual(json.loads(self.config_path.read_text(encoding="utf-8")), before)
+
+    def test_facade_reads_and_writes_the_sqlite_store(self):
+        self._migrate("sqlite")
+        data = load_config()
+        data["accounts"][0]["name"] = "job"
+        data["accounts"].append({"name": "bot", "username": "bot_user"})
+        save_config(data)
+        set_active_account("bot")
+
+        self.assertEqual([account["name"] for account in load_config()["accounts"]], ["job", "personal", "bot"])
+        self.assertEqual(load_config()["active"], "bot")
+        self.assertIsNone(get_account_by_name("work"))
+        self.assertEqual(get_account_by_name("personal"), ACCOUNTS[1])
+        self.assertEqual(get_account_by_username("bot_user")["name"], "bot")
+        self.assertFalse(self.config_path.exists())
+
+    def test_rules_survive_migration(self):
+        rules = [{"pattern": "/src/clients/acme/**", "account": "work"}, {"pattern": "/src/*/oss/**", "account": "personal"}]
+        save_config({**load_config(), "rules": rules})
+        self._migrate("sqlite")
+        self.assertEqual(load_config()["rules"], rules)
+        save_config({**load_config(), "rules": rules[1:]})
+        self.assertEqual(load_config()["rules"], rules[1:])
+        self._migrate("json")
+        self.assertEqual(json.loads(self.config_path.read_text(encoding="utf-8"))["rules"], rules[1:])
+
+    def test_migration_refuses_duplicate_account_names(self):
+        duplicated = [*ACCOUNTS, {"name": "work", "username": "other_user"}]
+        self.config_path.write_text(json.dumps({"accounts": duplicated, "active": "work"}), encoding="utf-8")
+        result = self.runner.invoke(migrate_store, ["sqlite"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Duplicate account names: work", result.output)
+        self.assertFalse(account_store_path().exists())
+        self.assertEqual(len(json.loads(self.config_path.read_text(encoding="utf-8"))["accounts"]), 3)
+
+    def test_migration_writes_under_the_config_lock(self):
+        held = []
+        replace = AccountStore.replace
+
+        def locked_replace(store, data):
+            held.append(getattr(config_module._transaction_state, "depth", 0) > 0)
+            replace(store, data)
+
+        with patch.object(AccountStore, "replace", locked_replace):
+            self._migrate("sqlite")
+        self.assertEqual(held, [True])
+
+    def test_loads_are_cached_until_the_database_changes(self):
+        save_config({**load_config(), "rules": [{"pattern": "/src/**", "account": "work"}]})
+        self._migrate("sqlite")
+        self.assertIs(load_rule_trie(), load_rule_trie())
+        self.assertIs(load_account_index(), load_account_index())
+
+        # A write from another connection (another process) is picked up on the next load.
+        with AccountStore(account_store_path()) as store:
+            store.replace({**store.load(), "active": "work"})
+        self.assertEqual(load_config()["active"], "work")
+
+    def test_schema_runs_only_for_new_databases(self):
+        with AccountStore(account_store_path()) as store:
+            store.replace({"accounts": ACCOUNTS, "active": None})
+        with patch("cli.account_store._SCHEMA", "this is not sql;"):
+            with AccountStore(account_store_path()) as store:
+                self.assertEqual(store.count(), 2)
+
+    def test_store_reports_backend_without_target(self):
+        result = self.runner.invoke(migrate_store, ["--json"], catch_exceptions=False)
+        self.assertEqual(json.loads(result.output), {"backend": "json"})
+
+    def test_lookup_and_update_cost_at_ten_thousand_accounts(self):
+        accounts = [{"name": f"bot-{index}", "username": f"bot_user_{index}"} for index in range(BENCHMARK_ACCOUNTS)]
+        with AccountStore(account_store_path()) as store:
+            store.replace({"accounts": accounts, "active": "bot-0"})
+            self.assertEqual(store.count(), BENCHMARK_ACCOUNTS)
+
+        names = [f"bot-{index}" for index in range(0, BENCHMARK_ACCOUNTS, 100)]
+        started = time.perf_counter()
+        for name in names:
+            self.assertIsNotNone(get_account_by_name(name))
+        lookup_ms = (time.perf_counter() - started) * 1000 / len(names)
+
+        # The real write path: a transaction over the whole config, saved as row-level changes.
+        started = time.perf_counter()
+        for index in range(10):
+            with config_transaction() as data:
+                data["accounts"][index]["username"] = f"renamed_{index}"
+        update_ms = (time.perf_counter() - started) * 1000 / 10
+
+        assert_within_budget(self, lookup_ms, LOOKUP_BUDGET_MS, "lookup (ms)")
+        assert_within_budget(self, update_ms, UPDATE_BUDGET_MS, "update (ms)")
+        self.assertEqual(get_account_by_username("renamed_3")["name"], "bot-3")
+        self.assertEqual(load_config()["accounts"][3], {"name": "bot-3", "username": "renamed_3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cli.accounts import Account
+from cli.accounts import AccountIndex
+from cli.config import clear_config_cache
+from cli.config import get_account_by_name
+from cli.config import get_account_by_username
+from cli.config import get_active_account
+from cli.config import load_account_index
+from cli.config import load_config
+from cli.config import save_config
+
+from timing import assert_within_budget
+from timing import budget
+
+# Budgets in milliseconds, checked only on opt-in (see tests/timing.py).
+LOAD_BUDGET_MS_PER_1K = budget("GHMULTI_ACCOUNT_LOAD_BUDGET_MS_PER_1K", 40)
+LOOKUP_BUDGET_MS = budget("GHMULTI_ACCOUNT_INDEX_LOOKUP_BUDGET_MS", 0.5)
+
+
+class TestAccountModel(unittest.TestCase):
+    def test_from_dict_normalizes_and_round_trips(self):
+        account = Account.from_dict({"name": " work ", "username": "work_user", "gpg_key_id": " ", "ssh_key_path": "~/k"})
+        self.assertEqual(account.to_dict(), {"name": "work", "username": "work_user", "ssh_key_path": "~/k"})
+        self.assertIsNone(Account.from_dict({"name": "work", "username": "  "}))
+        self.assertIsNone(Account.from_dict(["work"]))
+        with self.assertRaises(AttributeError):
+            account.extra = True
+
+    def test_index_lookups_keep_first_match(self):
+        index = AccountIndex.from_dicts([
+            {"name": "work", "username": "shared"},
+            {"name": "personal", "username": "shared"},
+            {"name": "work", "username": "other"},
+            "garbage",
+        ])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.by_name("work").username, "shared")
+        self.assertEqual(index.by_username("shared").name, "work")
+        self.assertEqual(index.position("personal"), 1)
+        self.assertIn("personal", index)
+        self.assertIsNone(index.by_name(None))
+        self.assertIsNone(index.by_username("missing"))
+
+
+class TestAccountIndexConfig(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix="ghmulti-accounts"))
+        self.config_path = self.root / ".ghmulti.json"
+        self.path_patch = patch("cli.config.CONFIG_PATH", self.config_path)
+        self.path_patch.start()
+        self.env_patch = patch.dict(os.environ, {"GHMULTI_ACCOUNT_STORE": "json"})
+        self.env_patch.start()
+        clear_config_cache()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.path_patch.stop()
+        clear_config_cache()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, count):
+        accounts = [{"name": f"bot-{index}", "username": f"bot_user_{index}"} for index in range(count)]
+        self.config_path.write_text(json.dumps({"accounts": accounts, "active": "bot-0"}), encoding="utf-8")
+        clear_config_cache()
+
+    def test_json_shape_is_unchanged(self):
+        data = {
+            "accounts": [
+                {"name": "work", "username": "work_user", "gpg_key_id": "ABC", "ssh_key_path": "~/.ssh/id_work"},
+                {"name": "personal", "username": "personal_user"},
+            ],
+            "active": "work",
+        }
+        save_config(data)
+        self.assertEqual(self.config_path.read_text(encoding="utf-8"), json.dumps(data, indent=2))
+        self.assertEqual(load_config(), data)
+        self.assertEqual(get_active_account(repo_path=str(self.root)), data["accounts"][0])
+
+    def test_lookups_return_independent_dicts(self):
+        self._write(3)
+        account = get_account_by_name("bot-1")
+        account["username"] = "changed"
+        self.assertEqual(get_account_by_name("bot-1")["username"], "bot_user_1")
+        self.assertEqual(get_account_by_username("bot_user_2")["name"], "bot-2")
+
+    def test_index_is_built_once_per_load(self):
+        self._write(10)
+        self.assertIs(load_account_index(), load_account_index())
+
+    def test_load_and_lookup_cost(self):
+        for count in (1_000, 10_000):
+            with self.subTest(accounts=count):
+                self._write(count)
+                started = time.perf_counter()
+                index = load_account_index()
+                load_ms = (time.perf_counter() - started) * 1000
+
+                names = [f"bot-{position}" for position in range(0, count, count // 100)]
+                started = time.perf_counter()
+                for name in names:
+                    self.assertEqual(get_account_by_name(name)["name"], name)
+                lookup_ms = (time.perf_counter() - started) * 1000 / len(names)
+
+                self.assertEqual(len(index), count)
+                assert_within_budget(self, load_ms, LOAD_BUDGET_MS_PER_1K * count / 1000, "index load (ms)")
+                # Warm lookups must not grow with the number of accounts.
+                assert_within_budget(self, lookup_ms, LOOKUP_BUDGET_MS, "lookup (ms)")
+
+
+if __name__ == "__main__":
+    unittest.main()
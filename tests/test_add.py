@@ -77,6 +77,15 @@ class TestAddCommand(unittest.TestCase):
         self.assertEqual(payload["active"], "work")
         self.assertEqual(payload["accounts"][0]["name"], "work")
 
+    def test_account_added_concurrently_keeps_its_token(self):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"accounts": [{"name": "work", "username": "work-user"}], "active": "work"}, f)
+        # The early check misses the account, as if another process added it right after.
+        with patch("cli.commands.add.get_account_by_name", return_value=None):
+            result = self.runner.invoke(add_account, ["--name", "work", "--username", "other", "--token", "tok_456"])
+        self.assertIn("Account 'work' already exists.", result.output)
+        self.mock_keyring.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
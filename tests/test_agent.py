@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.agent import AGENT_SOCKET_ENV
+from cli.agent import TokenAgent
+from cli.commands.agent import agent as agent_command
+from cli.config import get_token
+from cli.config import set_token
+from cli.ipc import create_server
+from cli.ipc import supports_unix_sockets
+
+
+@unittest.skipUnless(supports_unix_sockets(), "Unix domain sockets are not available")
+class TestTokenAgent(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": "work"
+                },
+                f,
+                indent=2
+            )
+        self.socket_dir = tempfile.mkdtemp(prefix="ghm")
+        self.socket_path = Path(self.socket_dir) / "agent.sock"
+        self.env_patch = patch.dict(os.environ, {AGENT_SOCKET_ENV: str(self.socket_path)})
+        self.env_patch.start()
+
+        self.backend = MagicMock()
+        self.backend.get_password.side_effect = lambda _service, username: f"token-{username}"
+        self.get_keyring_patch = patch("keyring.get_keyring", return_value=self.backend)
+        self.mock_get_keyring = self.get_keyring_patch.start()
+        # Direct keyring reads only happen when the agent cannot answer.
+        self.direct_patch = patch("keyring.get_password", return_value="direct-token")
+        self.mock_direct = self.direct_patch.start()
+
+        self.now = 1000.0
+        self.agent = TokenAgent(idle_timeout_seconds=60, clock=lambda: self.now)
+        self.server = create_server(self.socket_path, self.agent.handlers())
+        self.agent.stop_callback = self.server.request_shutdown
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+        self.direct_patch.stop()
+        self.get_keyring_patch.stop()
+        self.env_patch.stop()
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _agent(self, *args):
+        result = self.runner.invoke(agent_command, [*args, "--json"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return json.loads(result.output)
+
+    def test_get_token_is_served_from_memory(self):
+        self.assertEqual(get_token("work_user"), "token-work_user")
+        self.assertEqual(get_token("work_user"), "token-work_user")
+        self.assertEqual(self.backend.get_password.call_count, 1)
+        self.mock_direct.assert_not_called()
+
+    def test_tokens_expire_after_idle_timeout(self):
+        get_token("work_user")
+        self.now += 59
+        get_token("work_user")
+        self.assertEqual(self.backend.get_password.call_count, 1)
+
+        self.now += 60
+        self.agent.sweep()
+        self.assertEqual(self._agent("status")["cached_tokens"], 0)
+        get_token("work_user")
+        self.assertEqual(self.backend.get_password.call_count, 2)
+
+    def test_preload_reads_every_account_with_one_backend(self):
+        self.assertEqual(self._agent("preload")["loaded"], ["personal_user", "work_user"])
+        self.assertEqual(self.mock_get_keyring.call_count, 1)
+        get_token("personal_user")
+        self.assertEqual(self.backend.get_password.call_count, 2)
+
+    def test_lock_flushes_and_falls_back_to_keyring(self):
+        get_token("work_user")
+        self._agent("lock")
+        self.assertEqual(get_token("work_user"), "direct-token")
+        status = self._agent("status")
+        self.assertTrue(status["locked"])
+        self.assertEqual(status["cached_tokens"], 0)
+
+        self._agent("unlock")
+        self.assertEqual(get_token("work_user"), "token-work_user")
+
+    def test_flush_and_set_token_forget_cached_tokens(self):
+        get_token("work_user")
+        get_token("personal_user")
+        self.assertEqual(self._agent("flush")["flushed"], 2)
+
+        get_token("work_user")
+        with patch("keyring.set_password"):
+            set_token("work_user", "new")
+        self.assertEqual(self._agent("status")["cached_tokens"], 0)
+
+    def test_socket_is_private(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_dir).st_mode), 0o700)
+
+    def test_client_without_agent_reports_error(self):
+        with patch.dict(os.environ, {AGENT_SOCKET_ENV: str(Path(self.socket_dir) / "missing.sock")}):
+            result = self.runner.invoke(agent_command, ["status"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("No ghmulti agent", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
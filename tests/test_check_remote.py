@@ -0,0 +1,215 @@
+import json
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.check_remote import check_remote
+from cli.remote_probe import PROBE_CACHE_TTL_ENV
+from cli.remote_probe import SshEndpoint
+from cli.remote_probe import ssh_endpoint
+
+# Stand-in for ssh: behaviour depends on the destination host; every call is logged.
+FAKE_SSH = """#!/bin/sh
+for last; do :; done
+echo "$*" >> "$FAKE_SSH_LOG"
+case "$last" in
+  *github.com) sleep 0.3; echo "Hi work_user! You've successfully authenticated, but GitHub does not provide shell access." >&2; exit 1 ;;
+  *slow.example.com) sleep 0.3; exit 0 ;;
+  *denied.example.com) echo "git@denied.example.com: Permission denied (publickey)." >&2; exit 255 ;;
+  *blackhole.example.com) sleep 10; exit 255 ;;
+esac
+echo "ssh: Could not resolve hostname" >&2
+exit 255
+"""
+
+# Stand-in for git that answers ls-remote itself (checking the token git would send) and defers everything else.
+FAKE_GIT = """#!/bin/sh
+for last; do :; done
+case " $* " in
+  *" ls-remote "*)
+    echo "ls-remote $last token=${GHMULTI_GIT_PASSWORD:-none} config=${GIT_CONFIG_COUNT:-0}" >> "$FAKE_SSH_LOG"
+    sleep 0.2
+    case "$last" in
+      *down.example.com*) echo "fatal: unable to access '$last': Could not resolve host: down.example.com" >&2; exit 128 ;;
+      *private*)
+        if [ "$GHMULTI_GIT_PASSWORD" != "good-token" ]; then
+          echo "remote: Repository not found." >&2; echo "fatal: repository '$last' not found" >&2; exit 128
+        fi ;;
+    esac
+    printf '1111111111111111111111111111111111111111\trefs/heads/main\n2222222222222222222222222222222222222222\trefs/heads/dev\n'
+    exit 0 ;;
+esac
+exec "$REAL_GIT" "$@"
+"""
+
+
+class TestCheckRemote(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-check-remote")))
+        self.key_path = self.root / "id_work"
+        self.key_path.write_text("not a real key", encoding="utf-8")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"accounts": [{"name": "work", "username": "work_user", "ssh_key_path": str(self.key_path)}], "active": "work"},
+                f,
+                indent=2
+            )
+
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        ssh = bin_dir / "ssh"
+        ssh.write_text(FAKE_SSH, encoding="utf-8")
+        ssh.chmod(ssh.stat().st_mode | stat.S_IXUSR)
+        git = bin_dir / "git"
+        git.write_text(FAKE_GIT, encoding="utf-8")
+        git.chmod(git.stat().st_mode | stat.S_IXUSR)
+        self.log_path = self.root / "ssh.log"
+        self.env_patch = patch.dict(os.environ, {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "REAL_GIT": shutil.which("git"),
+            "FAKE_SSH_LOG": str(self.log_path),
+        })
+        self.env_patch.start()
+        self.cache_patch = patch("cli.remote_probe.PROBE_CACHE_PATH", self.root / "remote-probes.json")
+        self.cache_patch.start()
+        self.keyring_patch = patch("keyring.get_password", return_value="good-token")
+        self.keyring_patch.start()
+
+        self.repo = self.root / "repo"
+        self.repo.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=self.repo, check=True)
+        self.original_cwd = os.getcwd()
+        os.chdir(self.repo)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.keyring_patch.stop()
+        self.cache_patch.stop()
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _add_remote(self, name, url):
+        subprocess.run(["git", "remote", "add", name, url], cwd=self.repo, check=True)
+
+    def _check(self, *args):
+        started = time.perf_counter()
+        result = self.runner.invoke(check_remote, ["--json", *args], catch_exceptions=False)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(result.exit_code, 0, result.output)
+        return {probe["name"]: probe for probe in json.loads(result.output)["remotes"]}, elapsed
+
+    def _logged_calls(self):
+        return self.log_path.read_text(encoding="utf-8").splitlines() if self.log_path.exists() else []
+
+    def test_probes_run_concurrently_and_report_latency(self):
+        self._add_remote("origin", "git@github.com:work/api.git")
+        self._add_remote("mirror", "ssh://git@slow.example.com:2222/work/api.git")
+        self._add_remote("denied", "git@denied.example.com:work/api.git")
+        self._add_remote("web", "https://github.com/work/api.git")
+
+        probes, elapsed = self._check()
+
+        self.assertLess(elapsed, 0.55)
+        self.assertTrue(probes["origin"]["authenticated"])
+        self.assertIn("work_user", probes["origin"]["message"])
+        self.assertGreaterEqual(probes["origin"]["latency_ms"], 300)
+        self.assertTrue(probes["mirror"]["reachable"])
+        self.assertTrue(probes["denied"]["reachable"])
+        self.assertFalse(probes["denied"]["authenticated"])
+        self.assertEqual(probes["web"]["protocol"], "https")
+        self.assertEqual(probes["web"]["refs"], 2)
+
+        calls = [call for call in self._logged_calls() if not call.startswith("ls-remote")]
+        self.assertTrue(all("BatchMode=yes" in call and "ConnectTimeout=5" in call for call in calls))
+        self.assertTrue(all(f"-i {self.key_path} -o IdentitiesOnly=yes" in call for call in calls))
+        self.assertTrue(any("-p 2222 git@slow.example.com" in call for call in calls))
+
+    def test_same_endpoint_is_probed_once(self):
+        self._add_remote("origin", "git@github.com:work/api.git")
+        self._add_remote("origin-work", "git@github.com:work/other.git")
+        probes, _ = self._check()
+        self.assertEqual(len(self._logged_calls()), 1)
+        self.assertEqual(probes["origin"]["latency_ms"], probes["origin-work"]["latency_ms"])
+
+    def test_deadline_bounds_a_black_holed_host(self):
+        self._add_remote("origin", "git@github.com:work/api.git")
+        self._add_remote("lost", "git@blackhole.example.com:work/api.git")
+        probes, elapsed = self._check("--deadline", "1")
+        self.assertLess(elapsed, 2)
+        self.assertTrue(probes["origin"]["authenticated"])
+        self.assertFalse(probes["lost"]["reachable"])
+        self.assertIn("deadline", probes["lost"]["message"])
+
+    def test_https_probe_uses_linked_token_and_reports_failures(self):
+        self._add_remote("origin", "https://github.com/work/private-api.git")
+        self._add_remote("down", "https://down.example.com/work/api.git")
+        probes, _ = self._check()
+        self.assertEqual(
+            {key: probes["origin"][key] for key in ("reachable", "authenticated", "refs")},
+            {"reachable": True, "authenticated": True, "refs": 2}
+        )
+        self.assertGreaterEqual(probes["origin"]["latency_ms"], 200)
+        self.assertFalse(probes["down"]["reachable"])
+        self.assertIn("Could not resolve host", probes["down"]["message"])
+
+        with patch("keyring.get_password", return_value="wrong-token"):
+            probes, _ = self._check("--refresh")
+        self.assertTrue(probes["origin"]["reachable"])
+        self.assertFalse(probes["origin"]["authenticated"])
+
+    def test_https_probe_sends_token_only_to_github(self):
+        self._add_remote("origin", "https://github.com/work/api.git")
+        self._add_remote("gitlab", "https://gitlab.example.com/work/api.git")
+        self._check()
+        calls = {call.split()[1]: call for call in self._logged_calls() if call.startswith("ls-remote")}
+        self.assertIn("token=good-token", calls["https://github.com/work/api.git"])
+        self.assertIn("token=none config=0", calls["https://gitlab.example.com/work/api.git"])
+
+    def test_results_are_cached_until_refresh(self):
+        self._add_remote("origin", "https://github.com/work/api.git")
+        self._add_remote("ssh", "git@github.com:work/api.git")
+        first, _ = self._check()
+        calls = len(self._logged_calls())
+        second, _ = self._check()
+        self.assertEqual(len(self._logged_calls()), calls)
+        self.assertTrue(second["origin"]["cached"])
+        self.assertEqual(second["origin"]["refs"], first["origin"]["refs"])
+        self.assertTrue(second["ssh"]["cached"])
+
+        with patch.dict(os.environ, {PROBE_CACHE_TTL_ENV: "0"}):
+            third, _ = self._check()
+        self.assertFalse(third["origin"]["cached"])
+        self._check("--refresh")
+        self.assertEqual(len(self._logged_calls()), calls * 3)
+
+    def test_per_host_cap_serializes_probes(self):
+        for index in range(3):
+            self._add_remote(f"r{index}", f"https://github.com/work/repo{index}.git")
+        _, elapsed = self._check("--per-host", "1")
+        self.assertGreaterEqual(elapsed, 0.6)
+
+    def test_text_output(self):
+        self._add_remote("origin", "git@github.com:work/api.git")
+        result = self.runner.invoke(check_remote, [], catch_exceptions=False)
+        self.assertIn("• origin → git@github.com:work/api.git [✅ SSH reachable", result.output)
+
+    def test_ssh_endpoint_parsing(self):
+        self.assertEqual(ssh_endpoint("git@GitHub.com:org/repo.git"), SshEndpoint("git", "github.com", None))
+        self.assertEqual(ssh_endpoint("ssh://host.example.com:22/org/repo"), SshEndpoint(None, "host.example.com", 22))
+        self.assertIsNone(ssh_endpoint("https://github.com/org/repo.git"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,9 @@ from pathlib import Path
 
 # Import the functions to be tested
 from cli.config import load_config, save_config, get_active_account, get_linked_account, get_token, CONFIG_PATH, PROJECT_CONFIG_FILE
+from cli.config import clear_config_cache, config_parse_count
+from cli.config import json_file_transaction, load_json_file, write_json_atomically
+import tempfile
 
 class TestConfigLogic(unittest.TestCase):
 
@@ -119,11 +122,80 @@ class TestConfigLogic(unittest.TestCase):
         active_acc = get_active_account()
         self.assertEqual(active_acc, {"name": "global_acc", "username": "global_user"})
 
+    def test_load_config_cached_between_reads(self):
+        self._create_dummy_config({"accounts": [{"name": "test", "username": "user"}], "active": "test"})
+        clear_config_cache()
+        before = config_parse_count()
+        first = load_config()
+        second = load_config()
+        self.assertEqual(first, second)
+        self.assertEqual(config_parse_count() - before, 1)
+
+    def test_load_config_returns_independent_copies(self):
+        self._create_dummy_config({"accounts": [{"name": "test", "username": "user"}], "active": "test"})
+        first = load_config()
+        first["accounts"][0]["username"] = "mutated"
+        first["accounts"].append({"name": "other", "username": "other"})
+        self.assertEqual(load_config()["accounts"], [{"name": "test", "username": "user"}])
+
+    def test_load_config_sees_same_size_rewrite(self):
+        self._create_dummy_config({"accounts": [{"name": "aaaa", "username": "user"}], "active": "aaaa"})
+        self.assertEqual(load_config()["active"], "aaaa")
+        # Same size, written within the racy window of the cached entry.
+        self._create_dummy_config({"accounts": [{"name": "bbbb", "username": "user"}], "active": "bbbb"})
+        self.assertEqual(load_config()["active"], "bbbb")
+
+    def test_save_config_refreshes_cache_without_reparse(self):
+        self._create_dummy_config({"accounts": [{"name": "test", "username": "user"}], "active": "test"})
+        load_config()
+        save_config({"accounts": [{"name": "new", "username": "new_user"}], "active": "new"})
+        before = config_parse_count()
+        self.assertEqual(load_config()["active"], "new")
+        self.assertEqual(config_parse_count(), before)
+
     @patch('keyring.get_password', return_value="mock_token_123")
     def test_get_token(self, mock_keyring_get_password):
         token = get_token("test_user")
         self.assertEqual(token, "mock_token_123")
         mock_keyring_get_password.assert_called_once_with("ghmulti", "test_user")
 
+
+class TestJsonStateFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "state" / "cache.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        write_json_atomically(self.path, {"a": 1})
+        self.assertEqual(load_json_file(self.path), {"a": 1})
+
+    def test_missing_or_invalid_file_loads_empty(self):
+        self.assertEqual(load_json_file(self.path), {})
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text("[1, 2]")
+        self.assertEqual(load_json_file(self.path), {})
+        self.path.write_text("{not json")
+        self.assertEqual(load_json_file(self.path), {})
+
+    def test_unserializable_value_leaves_no_temp_file(self):
+        write_json_atomically(self.path, {"a": 1})
+        with self.assertRaises(TypeError):
+            write_json_atomically(self.path, {"a": object()})
+        self.assertEqual(load_json_file(self.path), {"a": 1})
+        self.assertEqual(sorted(p.name for p in self.path.parent.iterdir()), ["cache.json"])
+
+    def test_transaction_writes_only_changes(self):
+        with json_file_transaction(self.path) as data:
+            data["a"] = 1
+        self.assertEqual(load_json_file(self.path), {"a": 1})
+        mtime = self.path.stat().st_mtime_ns
+        with json_file_transaction(self.path) as data:
+            self.assertEqual(data, {"a": 1})
+        self.assertEqual(self.path.stat().st_mtime_ns, mtime)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cli.config import clear_config_cache
+from cli.config import config_transaction
+from cli.config import load_config
+from cli.config import save_config
+
+from timing import assert_within_budget
+from timing import budget
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WRITER_PROCESSES = 50
+TRANSACTIONS_PER_WRITER = 10
+# Minimum committed transactions per second across all writers, checked only on opt-in (see tests/timing.py).
+MIN_THROUGHPUT = budget("GHMULTI_CONFIG_TXN_MIN_PER_SECOND", 20)
+
+WRITER = """
+import sys
+from cli.config import config_transaction
+
+writer = sys.argv[1]
+for index in range(int(sys.argv[2])):
+    with config_transaction() as config:
+        config["accounts"].append({"name": f"{writer}-{index}", "username": f"user-{writer}-{index}"})
+        config["active"] = f"{writer}-{index}"
+"""
+
+
+class TestConfigTransaction(unittest.TestCase):
+    def setUp(self):
+        self.home = Path(tempfile.mkdtemp(prefix="ghmulti-config-txn"))
+        self.config_path = self.home / ".ghmulti.json"
+        self.path_patch = patch("cli.config.CONFIG_PATH", self.config_path)
+        self.path_patch.start()
+        clear_config_cache()
+        self.env = {
+            **os.environ,
+            "HOME": str(self.home),
+            "PYTHONPATH": str(REPO_ROOT),
+            "GHMULTI_NO_DAEMON": "1",
+            "GHMULTI_NO_AGENT": "1",
+            "GHMULTI_ACCOUNT_STORE": "json",
+        }
+
+    def tearDown(self):
+        self.path_patch.stop()
+        clear_config_cache()
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def _run_concurrently(self, commands):
+        processes = [
+            subprocess.Popen(
+                command, cwd=self.home, env=self.env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            for command in commands
+        ]
+        for process in processes:
+            _, stderr = process.communicate(timeout=120)
+            self.assertEqual(process.returncode, 0, stderr.decode("utf-8", errors="replace"))
+
+    def test_concurrent_writers_lose_no_updates(self):
+        save_config({"accounts": [{"name": "seed", "username": "seed_user"}], "active": "seed"})
+        started = time.perf_counter()
+        self._run_concurrently(
+            [sys.executable, "-c", WRITER, f"w{writer}", str(TRANSACTIONS_PER_WRITER)]
+            for writer in range(WRITER_PROCESSES)
+        )
+        elapsed = time.perf_counter() - started
+
+        names = {account["name"] for account in json.loads(self.config_path.read_text(encoding="utf-8"))["accounts"]}
+        expected = {f"w{writer}-{index}" for writer in range(WRITER_PROCESSES) for index in range(TRANSACTIONS_PER_WRITER)}
+        self.assertEqual(names, expected | {"seed"})
+        # Process start-up is included, so this is a floor rather than the lock's real throughput.
+        assert_within_budget(self, elapsed, WRITER_PROCESSES * TRANSACTIONS_PER_WRITER / MIN_THROUGHPUT, "writers (s)")
+        self.assertEqual([path.name for path in self.home.iterdir() if path.name.endswith(".tmp")], [])
+
+    def test_concurrent_add_commands_all_land(self):
+        commands = 20
+        self._run_concurrently(
+            [sys.executable, "-m", "ghmulti", "add", "--name", f"bot{index}", "--username", f"bot_user{index}",
+             "--token=", "--ssh-key-path", "~/.ssh/id_bot"]
+            for index in range(commands)
+        )
+        config = load_config()
+        self.assertEqual(len(config["accounts"]), commands)
+        self.assertIn(config["active"], {f"bot{index}" for index in range(commands)})
+
+    def test_exception_discards_changes(self):
+        save_config({"accounts": [{"name": "work", "username": "work_user"}], "active": "work"})
+        with self.assertRaises(RuntimeError):
+            with config_transaction() as config:
+                config["active"] = None
+                raise RuntimeError("abort")
+        self.assertEqual(load_config()["active"], "work")
+
+    def test_nested_transactions_share_the_lock(self):
+        with config_transaction() as outer:
+            outer["accounts"].append({"name": "outer", "username": "outer_user"})
+            with config_transaction() as inner:
+                inner["accounts"].append({"name": "inner", "username": "inner_user"})
+            self.assertIs(inner, outer)
+        self.assertEqual([account["name"] for account in load_config()["accounts"]], ["outer", "inner"])
+
+    def test_unchanged_transaction_does_not_write(self):
+        save_config({"accounts": [{"name": "work", "username": "work_user"}], "active": "work"})
+        before = self.config_path.stat().st_mtime_ns
+        with config_transaction():
+            pass
+        self.assertEqual(self.config_path.stat().st_mtime_ns, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
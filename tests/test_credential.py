@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.credential import credential
+from cli.commands.link import link_account_logic
+from cli.credential import parse_credential_request
+from cli.daemon import DISABLE_DAEMON_ENV
+from cli.daemon import DaemonService
+from cli.registry import REGISTRY_PATH_ENV
+
+
+class TestCredentialHelper(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-credential")))
+        self.env_patch = patch.dict(os.environ, {
+            REGISTRY_PATH_ENV: str(self.root / "repos.sqlite3"),
+            DISABLE_DAEMON_ENV: "1",
+        })
+        self.env_patch.start()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": "personal"
+                },
+                f,
+                indent=2
+            )
+        self.keyring_patch = patch("keyring.get_password", side_effect=lambda _service, username: f"token-{username}")
+        self.mock_keyring = self.keyring_patch.start()
+
+        self.repo = self.root / "repo"
+        self.repo.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=self.repo, check=True)
+        link_account_logic("work", repo_path=str(self.repo))
+        self.original_cwd = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.keyring_patch.stop()
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _get(self, cwd, request):
+        os.chdir(cwd)
+        result = self.runner.invoke(credential, ["get"], input=request, catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return parse_credential_request(result.output)
+
+    def test_linked_repository_gets_its_account_token(self):
+        (self.repo / "src").mkdir()
+        answer = self._get(self.repo / "src", "protocol=https\nhost=github.com\n\n")
+        self.assertEqual(answer["password"], "token-work_user")
+        self.assertEqual(answer["username"], "x-access-token")
+        self.assertEqual(answer["host"], "github.com")
+
+    def test_unlinked_directory_uses_url_owner(self):
+        answer = self._get(self.root, "protocol=https\nhost=github.com\npath=Personal_User/blog.git\n\n")
+        self.assertEqual(answer["password"], "token-personal_user")
+        self.assertEqual(self._get(self.root, "protocol=https\nhost=github.com\npath=stranger/x.git\n\n"), {})
+
+    def test_never_answers_for_other_hosts(self):
+        self.assertEqual(self._get(self.repo, "protocol=https\nhost=gitlab.com\n\n"), {})
+        self.assertEqual(self._get(self.repo, "protocol=http\nhost=github.com\n\n"), {})
+        self.mock_keyring.assert_not_called()
+
+    def test_store_and_erase_leave_keyring_alone(self):
+        os.chdir(self.repo)
+        with patch("keyring.set_password") as mock_set, patch("keyring.delete_password") as mock_delete:
+            for operation in ("store", "erase", "capability"):
+                result = self.runner.invoke(
+                    credential, [operation], input="protocol=https\nhost=github.com\npassword=x\n\n"
+                )
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, "")
+        mock_set.assert_not_called()
+        mock_delete.assert_not_called()
+
+    def test_daemon_caches_lookups(self):
+        service = DaemonService()
+        params = {"cwd": str(self.repo), "request": {"protocol": "https", "host": "github.com"}}
+        first = service.handle_credential(params)
+        second = service.handle_credential(params)
+        self.assertEqual(first, second)
+        self.assertEqual(first["credential"]["password"], "token-work_user")
+        self.assertEqual(self.mock_keyring.call_count, 1)
+
+        service.handle_invalidate({})
+        service.handle_credential(params)
+        self.assertEqual(self.mock_keyring.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
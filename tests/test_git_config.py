@@ -0,0 +1,346 @@
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cli.git_config import clear_discovery_cache
+from cli.git_config import clear_file_cache
+from cli.git_config import discover_repository
+from cli.git_config import file_parse_count
+from cli.git_config import find_project_root
+from cli.git_config import parse_config_text
+from cli.git_config import repository_at
+from cli.git_config import wildmatch
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import is_git_repository
+
+
+SYNTAX_FIXTURE = (
+    "\ufeff# leading comment\n"
+    "[core]\n"
+    "\tbare = false\n"
+    "\tFlag\n"
+    "\tpadded   =   spaced    out   value   ; trailing comment\n"
+    "[User]\n"
+    '\tname = "Quoted  Name" # comment\n'
+    '\temail = a\\"b@example.com\n'
+    "\tsigningKey = ABC\\\n"
+    "DEF\n"
+    '\tnote = tab\\there "semi;colon" "#hash"\n'
+    '[remote "Origin-Work"]\n'
+    "\turl = git@github.com:work/repo.git\n"
+    '\tfetch = +refs/heads/*:refs/remotes/Origin-Work/*\n'
+    '[remote "with \\"quote\\" and \\\\slash"]\n'
+    "\turl = https://example.com/a.git\n"
+    "[Section.Sub]\n"
+    "\tkey = dotted\n"
+    "[alias] co = checkout\r\n"
+    "\tmulti = one\n"
+    "\tmulti = two\n"
+    "; semicolon comment\n"
+    "[empty]\n"
+    "\tvalue =\n"
+)
+
+
+class GitConfigFixture:
+    """Isolated HOME/XDG/system environment shared by the native reader and real git."""
+
+    def __init__(self):
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-gitconfig")))
+        self.home = self.root / "home"
+        self.xdg = self.root / "xdg"
+        self.home.mkdir()
+        (self.xdg / "git").mkdir(parents=True)
+        self.env = {
+            "HOME": str(self.home),
+            "USERPROFILE": str(self.home),
+            "XDG_CONFIG_HOME": str(self.xdg),
+            "GIT_CONFIG_NOSYSTEM": "1",
+        }
+        self._patch = patch.dict(os.environ, self.env)
+        self._patch.start()
+        for name in ("GIT_DIR", "GIT_WORK_TREE", "GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM", "GIT_CONFIG_COUNT", "GIT_CONFIG_PARAMETERS"):
+            os.environ.pop(name, None)
+
+    def close(self):
+        self._patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def git(self, *args, cwd=None):
+        subprocess.run(["git", *args], cwd=str(cwd or self.root), capture_output=True, check=True)
+
+    def init_repo(self, name):
+        repo = self.root / name
+        repo.mkdir(parents=True)
+        self.git("init", "-q", "-b", "main", cwd=repo)
+        return repo
+
+    def write(self, path, content):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content.encode("utf-8"))
+        return path
+
+
+def _triples(snapshot):
+    return [(entry.scope, entry.key, entry.value) for entry in snapshot.entries]
+
+
+class TestGitConfigDifferential(unittest.TestCase):
+    """Compares the native reader with `git config --list --show-scope` on generated fixtures."""
+
+    def setUp(self):
+        clear_file_cache()
+        self.fixture = GitConfigFixture()
+        self.repo = self.fixture.init_repo("repo")
+
+    def tearDown(self):
+        self.fixture.close()
+
+    def assertMatchesGit(self, cwd):
+        with patch.object(GitConfigSnapshot, "load_from_git", side_effect=AssertionError("fell back to git")):
+            native = GitConfigSnapshot.load(cwd)
+        expected = GitConfigSnapshot.load_from_git(cwd)
+        self.assertTrue(expected.entries, "git reported no config; fixture is broken")
+        self.assertEqual(_triples(native), _triples(expected))
+
+    def test_syntax_edge_cases(self):
+        self.fixture.write(self.fixture.home / ".gitconfig", SYNTAX_FIXTURE)
+        self.assertMatchesGit(self.repo)
+
+    def test_xdg_then_home_then_local_order(self):
+        self.fixture.write(self.fixture.xdg / "git" / "config", "[user]\n\tname = xdg\n")
+        self.fixture.write(self.fixture.home / ".gitconfig", "[user]\n\tname = home\n")
+        self.fixture.git("config", "user.name", "local", cwd=self.repo)
+        self.assertMatchesGit(self.repo)
+        self.assertEqual(GitConfigSnapshot.load(self.repo).get("user.name"), "local")
+
+    def test_includes_and_conditional_includes(self):
+        fragments = self.fixture.home / "fragments"
+        self.fixture.write(fragments / "plain.inc", "[user]\n\tname = included\n[include]\n\tpath = nested.inc\n")
+        self.fixture.write(fragments / "nested.inc", "[user]\n\temail = nested@example.com\n")
+        self.fixture.write(fragments / "work.inc", "[user]\n\tsigningkey = WORKKEY\n")
+        self.fixture.write(fragments / "other.inc", "[user]\n\tsigningkey = OTHERKEY\n")
+        self.fixture.write(fragments / "branch.inc", "[ghmulti]\n\tlinkedaccount = on-main\n")
+        self.fixture.write(fragments / "icase.inc", "[core]\n\tsshcommand = ssh -i icase\n")
+        self.fixture.write(fragments / "relative.inc", "[ghmulti]\n\trelative = yes\n")
+        root = self.fixture.root.as_posix()
+        self.fixture.write(
+            self.fixture.home / ".gitconfig",
+            "[include]\n"
+            "\tpath = fragments/plain.inc\n"
+            "\tpath = ~/fragments/missing.inc\n"
+            f'[includeIf "gitdir:{root}/"]\n'
+            "\tpath = ~/fragments/work.inc\n"
+            '[includeIf "gitdir:/nowhere/"]\n'
+            "\tpath = ~/fragments/other.inc\n"
+            '[includeIf "gitdir:repo/.git"]\n'
+            "\tpath = ~/fragments/relative.inc\n"
+            '[includeIf "onbranch:main"]\n'
+            "\tpath = ~/fragments/branch.inc\n"
+            '[includeIf "onbranch:feature/"]\n'
+            "\tpath = ~/fragments/other.inc\n"
+            f'[includeIf "gitdir/i:{root.upper()}/REPO/"]\n'
+            "\tpath = ~/fragments/icase.inc\n"
+            '[includeIf "unknown:condition"]\n'
+            "\tpath = ~/fragments/other.inc\n"
+        )
+        self.fixture.write(self.repo / ".git" / "local.inc", "[user]\n\tname = local-include\n")
+        self.fixture.git("config", "include.path", "local.inc", cwd=self.repo)
+        self.assertMatchesGit(self.repo)
+
+    def test_discovery_from_subdirectory(self):
+        self.fixture.write(self.fixture.home / ".gitconfig", "[user]\n\tname = home\n")
+        self.fixture.git("config", "user.email", "local@example.com", cwd=self.repo)
+        nested = self.repo / "a" / "b"
+        nested.mkdir(parents=True)
+        self.assertMatchesGit(nested)
+        self.assertTrue(is_git_repository(nested))
+
+    def test_outside_repository_reads_only_global(self):
+        outside = self.fixture.root / "outside"
+        outside.mkdir()
+        self.fixture.write(self.fixture.home / ".gitconfig", "[user]\n\tname = home\n")
+        self.assertMatchesGit(outside)
+        self.assertFalse(is_git_repository(outside))
+
+    def test_linked_worktree_uses_commondir_and_worktree_config(self):
+        self.fixture.write(self.fixture.home / ".gitconfig", "[user]\n\tname = home\n\temail = h@example.com\n")
+        self.fixture.git("commit", "-q", "--allow-empty", "-m", "init", cwd=self.repo)
+        self.fixture.git("config", "extensions.worktreeConfig", "true", cwd=self.repo)
+        self.fixture.git("config", "remote.origin.url", "https://example.com/r.git", cwd=self.repo)
+        worktree = self.fixture.root / "wt"
+        self.fixture.git("worktree", "add", "-q", "-b", "feature/x", str(worktree), cwd=self.repo)
+        self.fixture.git("config", "--worktree", "user.name", "worktree-user", cwd=worktree)
+        self.fixture.write(
+            self.fixture.home / ".gitconfig",
+            "[user]\n\tname = home\n\temail = h@example.com\n"
+            '[includeIf "onbranch:feature/"]\n\tpath = feature.inc\n'
+        )
+        self.fixture.write(self.fixture.home / "feature.inc", "[ghmulti]\n\tbranch = feature\n")
+
+        self.assertMatchesGit(worktree)
+        repository = discover_repository(worktree)
+        self.assertEqual(repository.common_dir, self.repo / ".git")
+        self.assertEqual(GitConfigSnapshot.load(worktree).get("user.name"), "worktree-user")
+        self.assertEqual(GitConfigSnapshot.load(worktree).remote_names(), ["origin"])
+
+    def test_command_scope_from_environment(self):
+        self.fixture.write(self.fixture.home / ".gitconfig", "[user]\n\tname = home\n")
+        with patch.dict(os.environ, {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "User.Name",
+            "GIT_CONFIG_VALUE_0": "from-env",
+        }):
+            self.assertMatchesGit(self.repo)
+
+    def test_unsupported_condition_falls_back_to_git(self):
+        self.fixture.write(self.fixture.home / "remote.inc", "[user]\n\tname = by-remote\n")
+        self.fixture.write(
+            self.fixture.home / ".gitconfig",
+            '[includeIf "hasconfig:remote.*.url:https://example.com/**"]\n\tpath = remote.inc\n'
+        )
+        self.fixture.git("config", "remote.origin.url", "https://example.com/r.git", cwd=self.repo)
+        self.assertEqual(GitConfigSnapshot.load(self.repo).get("user.name"), "by-remote")
+
+    def test_generated_fixtures(self):
+        rng = random.Random(5)
+        words = ["alpha", "Beta", "gamma-1", "delta", "x"]
+        value_parts = ["plain", "two words", '"quoted  text"', "tab\\tescape", "semi;colon", "a#b", "\\\\back", ""]
+        for iteration in range(25):
+            lines = []
+            for _ in range(rng.randint(1, 6)):
+                section = rng.choice(words)
+                if rng.random() < 0.4:
+                    subsection = rng.choice(words + ["Mixed Case", 'q\\"uote'])
+                    lines.append(f'[{section} "{subsection}"]')
+                else:
+                    lines.append(f"[{section}]")
+                for _ in range(rng.randint(0, 4)):
+                    name = rng.choice(words)
+                    indent = rng.choice(["", "\t", "  "])
+                    if rng.random() < 0.15:
+                        lines.append(f"{indent}{name}")
+                        continue
+                    value = " ".join(rng.choice(value_parts) for _ in range(rng.randint(1, 3)))
+                    comment = rng.choice(["", " # note", " ; note"])
+                    lines.append(f"{indent}{name} {rng.choice(['=', ' = ', '='])} {value}{comment}")
+            newline = rng.choice(["\n", "\r\n"])
+            self.fixture.write(self.fixture.home / ".gitconfig", newline.join(lines) + newline)
+            with self.subTest(iteration=iteration):
+                self.assertMatchesGit(self.repo)
+
+
+class TestRepositoryDiscovery(unittest.TestCase):
+    def setUp(self):
+        clear_discovery_cache()
+        self.fixture = GitConfigFixture()
+        self.repo = self.fixture.init_repo("repo")
+        self.nested = self.repo / "src" / "pkg"
+        self.nested.mkdir(parents=True)
+
+    def tearDown(self):
+        os.environ.pop("GIT_CEILING_DIRECTORIES", None)
+        self.fixture.close()
+        clear_discovery_cache()
+
+    def _git_toplevel(self, cwd):
+        result = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=cwd, capture_output=True, text=True)
+        return Path(result.stdout.strip()) if result.returncode == 0 else None
+
+    def _age(self, *paths):
+        # Push mtimes out of the racy window so memoized results can be trusted.
+        old = time.time() - 60
+        for path in paths:
+            os.utime(path, (old, old))
+
+    def test_walks_up_to_the_work_tree(self):
+        self.assertEqual(discover_repository(self.nested).work_tree, self._git_toplevel(self.nested))
+        self.assertEqual(find_project_root(self.nested), self.repo)
+
+        # A `.git` file with a gitdir: pointer marks a work tree too (as for submodules and worktrees).
+        pointer = self.fixture.root / "pointer" / "deep"
+        pointer.mkdir(parents=True)
+        self.fixture.write(pointer.parent / ".git", f"gitdir: {self.repo / '.git'}\n")
+        self.assertEqual(discover_repository(pointer).work_tree, pointer.parent)
+
+    def test_ceiling_directories_stop_the_walk(self):
+        os.environ["GIT_CEILING_DIRECTORIES"] = f"/nonexistent{os.pathsep}{self.repo / 'src'}"
+        self.assertIsNone(self._git_toplevel(self.nested))
+        self.assertIsNone(discover_repository(self.nested))
+        self.assertIsNone(find_project_root(self.nested))
+        # The starting directory itself is always searched.
+        self.assertEqual(find_project_root(self.repo), self.repo)
+
+    def test_project_file_marks_a_root_outside_git(self):
+        linked = self.fixture.root / "plain"
+        (linked / "docs").mkdir(parents=True)
+        self.fixture.write(linked / ".ghmulti", '{"account": "work"}')
+        self.assertEqual(find_project_root(linked / "docs"), linked)
+        self.assertIsNone(discover_repository(linked / "docs"))
+
+    def test_stops_at_filesystem_boundary(self):
+        real_stat = Path.stat
+
+        def fake_stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if path == self.repo:
+                values = list(result)
+                values[2] = result.st_dev + 1
+                return os.stat_result(values)
+            return result
+
+        with patch.object(Path, "stat", fake_stat):
+            self.assertIsNone(discover_repository(self.nested))
+            clear_discovery_cache()
+            with patch.dict(os.environ, {"GIT_DISCOVERY_ACROSS_FILESYSTEM": "true"}):
+                self.assertEqual(discover_repository(self.nested).work_tree, self.repo)
+
+    def test_results_are_memoized_until_a_directory_changes(self):
+        self._age(self.nested, self.nested.parent, self.repo)
+        with patch("cli.git_config.repository_at", wraps=repository_at) as probe:
+            self.assertEqual(find_project_root(self.nested), self.repo)
+            walked = probe.call_count
+            self.assertEqual(find_project_root(self.nested), self.repo)
+            self.assertEqual(probe.call_count, walked)
+
+            self.fixture.git("init", "-q", cwd=self.nested)
+            self.assertEqual(find_project_root(self.nested), self.nested)
+
+
+class TestGitConfigParser(unittest.TestCase):
+    def test_parse_reports_line_of_syntax_error(self):
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            parse_config_text("[core]\n\t= broken\n")
+
+    def test_wildmatch_path_semantics(self):
+        self.assertTrue(wildmatch("**/work/**", "/home/u/work/repo/.git"))
+        self.assertFalse(wildmatch("/home/*/.git", "/home/u/work/.git"))
+        self.assertTrue(wildmatch("/home/u/[a-z]ork/**", "/home/u/work/r/.git"))
+        self.assertTrue(wildmatch("/HOME/**", "/home/u/.git", casefold=True))
+
+    def test_files_are_reparsed_only_after_changes(self):
+        fixture = GitConfigFixture()
+        try:
+            clear_file_cache()
+            repo = fixture.init_repo("repo")
+            GitConfigSnapshot.load(repo)
+            parsed = file_parse_count()
+            GitConfigSnapshot.load(repo)
+            self.assertEqual(file_parse_count(), parsed)
+
+            fixture.git("config", "user.name", "changed", cwd=repo)
+            self.assertEqual(GitConfigSnapshot.load(repo).get("user.name"), "changed")
+            self.assertEqual(file_parse_count(), parsed + 1)
+        finally:
+            fixture.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from cli.git_config import GitConfigError
+from cli.git_config import write_config_values
+from cli.git_utils import GitConfigSnapshot
+from cli.git_utils import choose_remote
+from cli.git_utils import git_auth_env
+from cli.git_utils import normalize_git_config_key
+from cli.git_utils import RemoteLocation
+from cli.git_utils import parse_git_config_listing
+from cli.git_utils import parse_remote_url
+from cli.git_utils import set_local_git_config_values
+
+
+class TestGitConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir = tempfile.mkdtemp(prefix="ghmulti-git-utils")
+        subprocess.run(["git", "init"], cwd=self.repo_dir, capture_output=True, check=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.repo_dir, capture_output=True, check=True)
+
+    def test_parse_listing_handles_valueless_and_multiline_entries(self):
+        output = (
+            b"local\0file:.git/config\0core.sshCommand\nssh -i key\0"
+            b"local\0file:.git/config\0Remote.My.Remote.URL\nhttps://example.com/a.git\0"
+            b"local\0file:.git/config\0foo.flag\0"
+            b"global\0file:/home/u/.gitconfig\0alias.multi\nline1\nline2\0"
+        )
+        entries = parse_git_config_listing(output)
+        self.assertEqual([entry.key for entry in entries], [
+            "core.sshcommand", "remote.My.Remote.url", "foo.flag", "alias.multi"
+        ])
+        self.assertIsNone(entries[2].value)
+        self.assertEqual(entries[3].value, "line1\nline2")
+
+    def test_normalize_key_preserves_subsection_case(self):
+        self.assertEqual(normalize_git_config_key("Remote.Origin-Work.URL"), "remote.Origin-Work.url")
+        self.assertEqual(normalize_git_config_key("core.sshCommand"), "core.sshcommand")
+
+    def test_snapshot_scopes_and_multivalues(self):
+        self._git("config", "user.name", "local_user")
+        self._git("config", "--add", "ghmulti.tag", "one")
+        self._git("config", "--add", "ghmulti.tag", "two")
+        snapshot = GitConfigSnapshot.load(self.repo_dir)
+        self.assertEqual(snapshot.get("user.name", scope="--local"), "local_user")
+        self.assertEqual(snapshot.get_all("ghmulti.tag"), ["one", "two"])
+        self.assertEqual(snapshot.get("ghmulti.tag"), "two")
+        self.assertFalse(snapshot.has("user.name", scope="--worktree"))
+
+    def test_remote_names_follow_config_order(self):
+        self._git("remote", "add", "origin", "https://github.com/test/test.git")
+        self._git("remote", "add", "origin-work", "git@github.com:work/test.git")
+        snapshot = GitConfigSnapshot.load(self.repo_dir)
+        self.assertEqual(snapshot.remote_names(), ["origin", "origin-work"])
+        self.assertEqual(choose_remote("work", None, cwd=self.repo_dir, git_config=snapshot), "origin-work")
+        self.assertEqual(choose_remote("other", None, cwd=self.repo_dir, git_config=snapshot), "origin")
+
+    def test_snapshot_of_missing_directory_is_empty(self):
+        snapshot = GitConfigSnapshot.load(os.path.join(self.repo_dir, "missing"))
+        self.assertEqual(snapshot.entries, [])
+
+    def _git_output(self, *args):
+        return subprocess.run(["git", *args], cwd=self.repo_dir, capture_output=True, text=True).stdout
+
+    def test_batched_local_writes_match_git(self):
+        self._git("config", "user.name", "old")
+        self._git("config", "--add", "core.sshCommand", "ssh -i a")
+        self._git("config", "--add", "core.sshCommand", "ssh -i b")
+        set_local_git_config_values({
+            "user.name": "new",
+            "user.email": " spaced ; value ",
+            "core.sshCommand": None,
+            "ghmulti.linkedAccount": "work",
+        }, cwd=self.repo_dir)
+
+        self.assertEqual(self._git_output("config", "--local", "user.name"), "new\n")
+        self.assertEqual(self._git_output("config", "--local", "user.email"), " spaced ; value \n")
+        self.assertEqual(self._git_output("config", "--local", "--get-all", "core.sshCommand"), "")
+        self.assertEqual(self._git_output("config", "--local", "ghmulti.linkedaccount"), "work\n")
+        self.assertFalse(os.path.exists(os.path.join(self.repo_dir, ".git", "config.lock")))
+
+    def test_batched_writes_keep_symlinks_and_mode(self):
+        git_dir = Path(self.repo_dir) / ".git"
+        shared = Path(self.repo_dir) / "shared-config"
+        shutil.move(git_dir / "config", shared)
+        os.chmod(shared, 0o600)
+        os.symlink(shared, git_dir / "config")
+        set_local_git_config_values({"user.name": "new"}, cwd=self.repo_dir)
+        self.assertTrue((git_dir / "config").is_symlink())
+        self.assertEqual(self._git_output("config", "--local", "user.name"), "new\n")
+        self.assertEqual(os.stat(shared).st_mode & 0o777, 0o600)
+        self.assertFalse(os.path.exists(str(shared) + ".lock"))
+
+    def test_existing_lock_blocks_the_write(self):
+        config = Path(self.repo_dir) / ".git" / "config"
+        before = config.read_bytes()
+        (config.parent / "config.lock").write_bytes(b"")
+        with self.assertRaises(GitConfigError):
+            write_config_values(config, {"user.name": "new"})
+        self.assertEqual(config.read_bytes(), before)
+        self.assertTrue((config.parent / "config.lock").exists())
+
+    def test_batched_writes_fall_back_to_git_for_unusual_syntax(self):
+        with open(os.path.join(self.repo_dir, ".git", "config"), "a", encoding="utf-8") as f:
+            f.write("[user] name = inline\n")
+        set_local_git_config_values({"user.name": "new"}, cwd=self.repo_dir)
+        self.assertEqual(self._git_output("config", "--local", "user.name"), "new\n")
+
+    def test_parse_remote_url(self):
+        self.assertEqual(parse_remote_url("git@github.com:Acme/api.git"), RemoteLocation("github.com", "Acme", "api"))
+        self.assertEqual(
+            parse_remote_url("https://user@GitHub.com/acme/web"),
+            RemoteLocation("github.com", "acme", "web")
+        )
+        self.assertEqual(
+            parse_remote_url("ssh://git@github.example.com:2222/org/tool.git"),
+            RemoteLocation("github.example.com", "org", "tool")
+        )
+        self.assertIsNone(parse_remote_url("/srv/git/bare.git"))
+
+    def test_auth_env_answers_credentials_without_temp_files(self):
+        with git_auth_env("secret-token", username="work_user") as env:
+            self.assertNotIn("GIT_ASKPASS", env)
+            filled = subprocess.run(
+                ["git", "credential", "fill"],
+                input="protocol=https\nhost=github.com\n\n",
+                cwd=self.repo_dir,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout
+        self.assertIn("username=work_user\n", filled)
+        self.assertIn("password=secret-token\n", filled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import requests
+
+from cli.github_api import API_URL_ENV
+from cli.github_api import CircuitBreaker
+from cli.github_api import CircuitOpenError
+from cli.github_api import GitHubApiClient
+from cli.github_api import get_client
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+    def _respond(self):
+        server = self.server
+        server.requests.append((self.command, self.path, dict(self.headers)))
+        status, headers = server.responses.pop(0) if server.responses else (200, {})
+        body = json.dumps({"login": "octocat"}).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+class TestGitHubApiClient(unittest.TestCase):
+    """Exercises the client against a local stand-in for api.github.com."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self.server.requests = []
+        self.server.responses = []
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.sleeps = []
+        self.state_dir = tempfile.mkdtemp(prefix="ghmulti-api")
+        self.breaker = CircuitBreaker(Path(self.state_dir) / "network-breaker.json")
+        self.client = GitHubApiClient(
+            base_url=self.base_url,
+            backoff_seconds=0.01,
+            sleep=self.sleeps.append,
+            breaker=self.breaker
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def test_retries_server_errors_with_backoff(self):
+        self.server.responses = [(503, {}), (502, {}), (200, {})]
+        response = self.client.get("/user", token="tok")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= 0.04 for delay in self.sleeps))
+
+    def test_gives_up_after_max_retries(self):
+        self.server.responses = [(503, {})] * 5
+        response = self.client.get("/user")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_does_not_retry_non_idempotent_requests(self):
+        self.server.responses = [(503, {}), (200, {})]
+        response = self.client.request("POST", "/user/repos", token="tok", json={})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_honours_retry_after(self):
+        self.server.responses = [(429, {"Retry-After": "3"}), (200, {})]
+        response = self.client.get("/user")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.sleeps, [3.0])
+
+    def test_waits_for_rate_limit_reset_within_cap(self):
+        reset = int(time.time()) + 2
+        self.server.responses = [
+            (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Limit": "60", "X-RateLimit-Reset": str(reset)}),
+            (200, {}),
+        ]
+        self.client.get("/user")
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertLessEqual(self.sleeps[0], 2.0)
+
+    def test_returns_rate_limited_response_when_reset_is_too_far(self):
+        reset = int(time.time()) + 3600
+        self.server.responses = [(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})]
+        response = self.client.get("/user")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.sleeps, [])
+
+    def test_records_quota_per_token(self):
+        self.server.responses = [
+            (200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4990", "X-RateLimit-Reset": "1700000000"}),
+            (200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "1700000000"}),
+        ]
+        self.client.get("/user", token="first")
+        self.client.get("/user", token="second")
+        self.assertEqual(self.client.rate_limit_for("first").remaining, 4990)
+        self.assertEqual(self.client.rate_limit_for("second").remaining, 12)
+        self.assertIsNone(self.client.rate_limit_for("unused"))
+        self.assertEqual(self.server.requests[0][2]["Authorization"], "token first")
+
+    def test_reuses_one_session_per_host(self):
+        self.client.get("/user")
+        self.client.get("/rate_limit")
+        self.assertIs(self.client.session_for(self.base_url + "/a"), self.client.session_for(self.base_url + "/b"))
+
+    def test_connection_errors_are_retried_then_raised(self):
+        client = GitHubApiClient(base_url="http://127.0.0.1:9", sleep=self.sleeps.append, breaker=self.breaker)
+        with self.assertRaises(requests.ConnectionError):
+            client.get("/user", timeout=0.5)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_connect_timeouts_are_not_retried(self):
+        with patch.object(self.client.session_for(self.base_url), "request", side_effect=requests.ConnectTimeout()) as sent:
+            with self.assertRaises(requests.ConnectTimeout):
+                self.client.get("/user")
+        self.assertEqual(sent.call_count, 1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_retries_stop_at_the_call_deadline(self):
+        now = [0.0]
+
+        def sleep(delay):
+            self.sleeps.append(delay)
+            now[0] += delay
+
+        client = GitHubApiClient(
+            base_url=self.base_url, sleep=sleep, breaker=self.breaker, deadline_seconds=1.0, clock=lambda: now[0]
+        )
+        self.server.responses = [(503, {"Retry-After": "0.6"})] * 3
+        response = client.get("/user")
+        client.close()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.sleeps, [0.6])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_exhausted_deadline_raises_timeout_instead_of_sending(self):
+        now = [0.0]
+
+        def sleep(delay):
+            # The process was descheduled: the sleep overran the deadline.
+            self.sleeps.append(delay)
+            now[0] += delay + 1.0
+
+        client = GitHubApiClient(
+            base_url=self.base_url, sleep=sleep, breaker=self.breaker, deadline_seconds=1.0, clock=lambda: now[0]
+        )
+        self.server.responses = [(503, {"Retry-After": "0.6"})] * 3
+        with self.assertRaises(requests.Timeout):
+            client.get("/user")
+        client.close()
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_default_deadline_follows_the_request_timeout(self):
+        now = [0.0]
+
+        def sleep(delay):
+            self.sleeps.append(delay)
+            now[0] += delay
+
+        client = GitHubApiClient(base_url=self.base_url, sleep=sleep, breaker=self.breaker, clock=lambda: now[0])
+        self.server.responses = [(503, {"Retry-After": "2.5"})] * 3
+        self.assertEqual(client.get("/user", timeout=1).status_code, 503)
+        client.close()
+        # 2.5s of waiting does not fit in the 1s timeout plus the retry allowance.
+        self.assertEqual(self.sleeps, [])
+
+    def test_default_client_follows_base_url_environment(self):
+        with patch.dict(os.environ, {API_URL_ENV: self.base_url + "/"}):
+            with patch("cli.github_api.BREAKER_STATE_PATH", Path(self.state_dir) / "default-breaker.json"):
+                client = get_client()
+            self.assertEqual(client.base_url, self.base_url)
+            self.assertIs(get_client(), client)
+            self.assertEqual(client.get("/user").json(), {"login": "octocat"})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp(prefix="ghmulti-breaker")
+        self.breaker = CircuitBreaker(
+            Path(self.state_dir) / "network-breaker.json",
+            failure_threshold=2,
+            window_seconds=60,
+            cool_down_seconds=30
+        )
+        # Port 9 (discard) is closed on test machines, so connections fail immediately.
+        self.client = GitHubApiClient(base_url="http://127.0.0.1:9", max_retries=0, breaker=self.breaker)
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def test_opens_after_threshold_and_skips_network(self):
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.client.get("/user", timeout=0.5)
+        self.assertEqual(self.breaker.state("127.0.0.1:9")[0], "open")
+
+        with patch("requests.Session.request") as mock_request:
+            started = time.perf_counter()
+            with self.assertRaises(CircuitOpenError):
+                self.client.get("/user")
+            elapsed = time.perf_counter() - started
+        mock_request.assert_not_called()
+        self.assertLess(elapsed, 0.05)
+
+    def test_failures_outside_window_do_not_open(self):
+        self.breaker.record_failure("host", now=1000.0)
+        self.breaker.record_failure("host", now=1100.0)
+        self.assertEqual(self.breaker.state("host", now=1100.0)[0], "closed")
+
+    def test_half_open_probe_success_closes(self):
+        self.breaker.record_failure("127.0.0.1:9", now=time.time() - 100)
+        self.breaker.record_failure("127.0.0.1:9", now=time.time() - 99)
+        self.assertEqual(self.breaker.state("127.0.0.1:9")[0], "half-open")
+
+        response = MagicMock(status_code=200, headers={})
+        with patch("requests.Session.request", return_value=response) as mock_request:
+            self.client.get("/user", timeout=5)
+        self.assertLessEqual(mock_request.call_args.kwargs["timeout"], 1.0)
+        self.assertEqual(self.breaker.state("127.0.0.1:9")[0], "closed")
+
+    def test_half_open_probe_failure_reopens(self):
+        now = time.time()
+        self.breaker.record_failure("127.0.0.1:9", now=now - 100)
+        self.breaker.record_failure("127.0.0.1:9", now=now - 99)
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get("/user")
+        state, retry_in = self.breaker.state("127.0.0.1:9")
+        self.assertEqual(state, "open")
+        self.assertGreater(retry_in, 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cli.github_api import CircuitBreaker
+from cli.github_api import GitHubApiClient
+from cli.github_auth import token_fingerprint
+from cli.github_auth import validate_github_token
+
+
+def _response(status_code, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+class TestTokenValidationCache(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp(prefix="ghmulti-token-cache")
+        self.cache_path = Path(self.state_dir) / "token-cache.json"
+        self.breaker = CircuitBreaker(Path(self.state_dir) / "network-breaker.json")
+        self.client = GitHubApiClient(base_url="https://api.github.test", max_retries=0, breaker=self.breaker)
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def _validate(self, **kwargs):
+        return validate_github_token("secret-token", cache_path=self.cache_path, client=self.client, **kwargs)
+
+    @patch("requests.Session.request", return_value=_response(200, etag='"abc"'))
+    def test_fresh_result_is_served_without_network(self, mock_request):
+        first = self._validate(ttl_seconds=60)
+        second = self._validate(ttl_seconds=60)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(first.source, "network")
+        self.assertEqual(second.source, "cache")
+        self.assertTrue(second.valid)
+        self.assertGreaterEqual(second.age_seconds, 0)
+
+    @patch("requests.Session.request", return_value=_response(200, etag='"abc"'))
+    def test_cache_is_keyed_by_hash_not_token(self, _mock_request):
+        self._validate()
+        raw = self.cache_path.read_text(encoding="utf-8")
+        self.assertNotIn("secret-token", raw)
+        self.assertIn(token_fingerprint("secret-token"), json.loads(raw))
+
+    def test_expired_entry_revalidates_with_etag(self):
+        with patch("requests.Session.request", return_value=_response(200, etag='"abc"')):
+            self._validate()
+
+        with patch("requests.Session.request", return_value=_response(304)) as mock_request:
+            result = self._validate(ttl_seconds=0)
+
+        self.assertEqual(mock_request.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+        self.assertEqual(result.source, "revalidated")
+        self.assertTrue(result.valid)
+        self.assertEqual(result.status_code, 200)
+
+    def test_entry_age_is_reported(self):
+        self.cache_path.write_text(json.dumps({
+            token_fingerprint("secret-token"): {
+                "valid": False,
+                "message": "Token is invalid or expired.",
+                "status_code": 401,
+                "etag": None,
+                "checked_at": time.time() - 30
+            }
+        }), encoding="utf-8")
+
+        with patch("requests.Session.request") as mock_request:
+            result = self._validate(ttl_seconds=60)
+
+        mock_request.assert_not_called()
+        self.assertFalse(result.valid)
+        self.assertGreaterEqual(result.age_seconds, 30)
+
+    @patch("requests.Session.request", return_value=_response(500))
+    def test_unexpected_status_is_not_cached(self, mock_request):
+        self._validate()
+        self._validate()
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertFalse(self.cache_path.exists())
+
+    def test_open_breaker_reports_offline_without_network(self):
+        for _ in range(3):
+            self.breaker.record_failure("api.github.test")
+
+        with patch("requests.Session.request") as mock_request:
+            result = self._validate(ttl_seconds=0)
+
+        mock_request.assert_not_called()
+        self.assertIsNone(result.valid)
+        self.assertEqual(result.reason, "offline-cached")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.identity import identity
+from cli.commands.link import link_account
+from cli.commands.rename import rename_account
+from cli.commands.rule import rule
+from cli.commands.use import use_account
+from cli.config import clear_config_cache
+from cli.config import get_active_account
+from cli.config import load_config
+from cli.config import save_config
+from cli.identity import IdentityBlock
+from cli.identity import IncludeRule
+from cli.identity import parse_identity_block
+from cli.identity import read_identity_block
+from cli.identity import render_identity_block
+from cli.registry import REGISTRY_PATH_ENV
+
+
+class TestIdentityBlock(unittest.TestCase):
+    def test_render_and_parse_round_trip(self):
+        block = IdentityBlock("work", [IncludeRule("/src/oss/deep", "oss"), IncludeRule("/src/oss", "personal")])
+        parsed = parse_identity_block("[user]\n\tname = me\n" + render_identity_block(block))
+        self.assertEqual(parsed.default_account, "work")
+        # Deeper rules are rendered last so they win in git's last-value-wins order.
+        self.assertEqual(parsed.rules, [IncludeRule("/src/oss", "personal"), IncludeRule("/src/oss/deep", "oss")])
+        self.assertIsNone(parse_identity_block("[user]\n\tname = me\n"))
+
+
+    def test_directories_are_escaped_in_the_subsection(self):
+        block = IdentityBlock(None, [IncludeRule('/src/say"hi', "oss"), IncludeRule("/src/back\\slash", "work")])
+        text = render_identity_block(block)
+        self.assertIn('[includeIf "gitdir:/src/say\\"hi/"]', text)
+        self.assertIn('[includeIf "gitdir:/src/back\\\\slash/"]', text)
+        self.assertEqual(sorted(parse_identity_block(text).rules, key=lambda rule: rule.account), [
+            IncludeRule('/src/say"hi', "oss"), IncludeRule("/src/back\\slash", "work")
+        ])
+
+class TestIncludeMode(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-identity")))
+        self.gitconfig = self.root / "gitconfig"
+        self.gitconfig.write_text("[user]\n\tname = Someone Else\n", encoding="utf-8")
+        self.env_patch = patch.dict(os.environ, {
+            "GIT_CONFIG_GLOBAL": str(self.gitconfig),
+            "GIT_CONFIG_NOSYSTEM": "1",
+            "XDG_CONFIG_HOME": str(self.root / "xdg"),
+            "GHMULTI_ACCOUNT_STORE": "json",
+            REGISTRY_PATH_ENV: str(self.root / "repos.json"),
+        })
+        self.env_patch.start()
+        self.path_patch = patch("cli.config.CONFIG_PATH", self.root / ".ghmulti.json")
+        self.path_patch.start()
+        clear_config_cache()
+        save_config({
+            "accounts": [
+                {"name": "work", "username": "work_user", "gpg_key_id": "ABC"},
+                {"name": "personal", "username": "personal_user"},
+            ],
+            "active": "work",
+        })
+
+    def tearDown(self):
+        self.path_patch.stop()
+        self.env_patch.stop()
+        clear_config_cache()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _init_repo(self, path):
+        path.mkdir(parents=True)
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        return path
+
+    def _git_value(self, repo, key):
+        result = subprocess.run(["git", "config", key], cwd=repo, capture_output=True, text=True)
+        return result.stdout.strip()
+
+    def _enable(self):
+        result = self.runner.invoke(identity, ["enable", "--json"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return json.loads(result.output)
+
+    def test_enable_writes_fragments_and_default(self):
+        repo = self._init_repo(self.root / "elsewhere")
+        payload = self._enable()
+        self.assertEqual(payload["mode"], "include")
+        self.assertEqual(payload["default_account"], "work")
+        self.assertTrue((self.root / "xdg" / "ghmulti" / "identities" / "personal.gitconfig").exists())
+        self.assertEqual(self._git_value(repo, "user.email"), "work_user@users.noreply.github.com")
+        self.assertEqual(self._git_value(repo, "user.signingkey"), "ABC")
+        # Settings outside the managed block are left alone.
+        self.assertIn("name = Someone Else", self.gitconfig.read_text(encoding="utf-8"))
+
+    def test_symlinked_gitconfig_keeps_link_and_mode(self):
+        dotfiles = self.root / "dotfiles" / "gitconfig"
+        dotfiles.parent.mkdir()
+        os.replace(self.gitconfig, dotfiles)
+        os.chmod(dotfiles, 0o600)
+        self.gitconfig.symlink_to(dotfiles)
+        self._enable()
+        self.assertTrue(self.gitconfig.is_symlink())
+        self.assertEqual(os.stat(dotfiles).st_mode & 0o777, 0o600)
+        self.assertEqual(read_identity_block().default_account, "work")
+
+    def test_recursive_link_adds_one_rule_without_local_writes(self):
+        repos = [self._init_repo(self.root / "oss" / name) for name in ("one", "two")]
+        self._enable()
+        before = [(repo / ".git" / "config").read_bytes() for repo in repos]
+
+        result = self.runner.invoke(link_account, ["personal", "--recursive", str(self.root / "oss"), "--json"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        payload = json.loads(result.output)
+        self.assertEqual(payload["mode"], "include")
+        self.assertEqual(payload["rule"], {"directory": str(self.root / "oss"), "account": "personal"})
+
+        self.assertEqual([(repo / ".git" / "config").read_bytes() for repo in repos], before)
+        for repo in repos:
+            self.assertEqual(self._git_value(repo, "user.email"), "personal_user@users.noreply.github.com")
+            # The default fragment's signing key must not leak into an account that has none.
+            self.assertEqual(self._git_value(repo, "user.signingkey"), "personal_user <personal_user@users.noreply.github.com>")
+            self.assertEqual(get_active_account(repo_path=repo)["name"], "personal")
+        # Repositories cloned later under the same tree are covered too.
+        late = self._init_repo(self.root / "oss" / "late")
+        self.assertEqual(self._git_value(late, "user.name"), "personal_user")
+
+    def test_quoted_directory_matches_in_git(self):
+        repo = self._init_repo(self.root / 'say"hi' / "one")
+        self._enable()
+        result = self.runner.invoke(link_account, ["personal", "--recursive", str(self.root / 'say"hi')])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._git_value(repo, "user.name"), "personal_user")
+        self.assertEqual(read_identity_block().rules, [IncludeRule(str(self.root / 'say"hi'), "personal")])
+
+    def test_use_switches_default_without_touching_rules(self):
+        linked = self._init_repo(self.root / "oss" / "one")
+        other = self._init_repo(self.root / "other")
+        self._enable()
+        self.runner.invoke(link_account, ["personal", "--recursive", str(self.root / "oss")], catch_exceptions=False)
+
+        result = self.runner.invoke(use_account, ["personal"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._git_value(other, "user.name"), "personal_user")
+        self.runner.invoke(use_account, ["work"], catch_exceptions=False)
+        self.assertEqual(self._git_value(other, "user.name"), "work_user")
+        self.assertEqual(self._git_value(linked, "user.name"), "personal_user")
+        self.assertEqual(len(read_identity_block().rules), 1)
+
+    def test_failed_gitconfig_write_keeps_config_unchanged(self):
+        self._enable()
+        Path(str(self.gitconfig) + ".lock").write_bytes(b"")
+        result = self.runner.invoke(use_account, ["personal"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Failed to switch the default identity", result.output)
+        clear_config_cache()
+        self.assertEqual(load_config()["active"], "work")
+        self.assertEqual(read_identity_block().default_account, "work")
+
+    def test_single_link_clears_shadowing_local_values(self):
+        repo = self._init_repo(self.root / "project")
+        subprocess.run(["git", "config", "--local", "user.name", "work_user"], cwd=repo, check=True)
+        self._enable()
+        cwd = os.getcwd()
+        os.chdir(repo)
+        try:
+            result = self.runner.invoke(link_account, ["personal"], catch_exceptions=False)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._git_value(repo, "user.name"), "personal_user")
+        self.assertEqual(json.loads((repo / ".ghmulti").read_text(encoding="utf-8"))["account"], "personal")
+        self.assertEqual(read_identity_block().rules, [IncludeRule(str(repo), "personal")])
+
+    def test_rename_remaps_rules(self):
+        repo = self._init_repo(self.root / "oss" / "one")
+        self._enable()
+        self.runner.invoke(link_account, ["personal", "--recursive", str(self.root / "oss")], catch_exceptions=False)
+        result = self.runner.invoke(rename_account, ["personal", "home"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(read_identity_block().rules, [IncludeRule(str(self.root / "oss"), "home")])
+        self.assertEqual(self._git_value(repo, "user.name"), "personal_user")
+        self.assertFalse((self.root / "xdg" / "ghmulti" / "identities" / "personal.gitconfig").exists())
+
+    def test_directory_rule_becomes_include_rule(self):
+        repo = self._init_repo(self.root / "clients" / "acme" / "web")
+        self._enable()
+        result = self.runner.invoke(rule, ["add", f"{self.root / 'clients'}/**", "personal"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._git_value(repo, "user.name"), "personal_user")
+        self.runner.invoke(rule, ["remove", f"{self.root / 'clients'}/**"], catch_exceptions=False)
+        self.assertEqual(read_identity_block().rules, [])
+        self.assertEqual(self._git_value(repo, "user.name"), "work_user")
+
+    def test_deepest_of_directory_and_include_rules_wins(self):
+        deep = self._init_repo(self.root / "clients" / "acme" / "web")
+        shallow = self._init_repo(self.root / "clients" / "globex")
+        self._enable()
+        # A wildcard rule has no includeIf equivalent, so it lives only in the ghmulti config.
+        self.runner.invoke(rule, ["add", f"{self.root}/*/**", "work"], catch_exceptions=False)
+        self.runner.invoke(link_account, ["personal", "--recursive", str(self.root / "clients" / "acme")], catch_exceptions=False)
+
+        self.assertEqual(get_active_account(repo_path=deep)["name"], "personal")
+        self.assertEqual(self._git_value(deep, "user.name"), "personal_user")
+        self.assertEqual(get_active_account(repo_path=shallow)["name"], "work")
+
+    def test_disable_removes_block_and_fragments(self):
+        self._enable()
+        result = self.runner.invoke(identity, ["disable", "--json"], catch_exceptions=False)
+        self.assertEqual(json.loads(result.output), {"disabled": True})
+        self.assertEqual(self.gitconfig.read_text(encoding="utf-8"), "[user]\n\tname = Someone Else\n")
+        self.assertEqual(list((self.root / "xdg" / "ghmulti" / "identities").iterdir()), [])
+        status = json.loads(self.runner.invoke(identity, ["status", "--json"]).output)
+        self.assertEqual(status["mode"], "per-repository")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,13 @@ import json
 import subprocess
 import shutil
 from unittest.mock import patch
+import tempfile
+from pathlib import Path
 from click.testing import CliRunner
 from cli.commands.link import link_account
 from cli.commands.add import add_account
+from cli.registry import REGISTRY_PATH_ENV
+from cli.registry import RepoRegistry
 
 class TestLinkCommand(unittest.TestCase):
 
@@ -41,7 +45,9 @@ class TestLinkCommand(unittest.TestCase):
             os.remove(self.config_path)
 
     def test_link_fails_outside_git_repo(self):
-        result = self.runner.invoke(link_account, ["test_account"], catch_exceptions=False)
+        # The test directory sits inside this checkout; stop discovery from finding it.
+        with patch.dict(os.environ, {"GIT_CEILING_DIRECTORIES": os.path.dirname(os.getcwd())}):
+            result = self.runner.invoke(link_account, ["test_account"], catch_exceptions=False)
         self.assertIn("This does not appear to be a git repository", result.output)
         self.assertFalse(os.path.exists(".ghmulti"))
 
@@ -64,11 +70,99 @@ class TestLinkCommand(unittest.TestCase):
         local_ssh = subprocess.check_output(["git", "config", "--local", "core.sshCommand"]).decode().strip()
         self.assertEqual(local_ssh, f"ssh -i {os.path.expanduser('~/.ssh/id_rsa_test')}")
 
+    def test_link_from_subdirectory_links_repository_root(self):
+        subprocess.run(["git", "init"], capture_output=True)
+        os.makedirs("src/pkg")
+        os.chdir("src/pkg")
+        try:
+            result = self.runner.invoke(link_account, ["test_account"], catch_exceptions=False)
+        finally:
+            os.chdir("../..")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue(os.path.exists(".ghmulti"))
+        self.assertFalse(os.path.exists("src/pkg/.ghmulti"))
+
     def test_link_fails_with_nonexistent_account(self):
         subprocess.run(["git", "init"], capture_output=True)
         result = self.runner.invoke(link_account, ["nonexistent_account"], catch_exceptions=False)
         self.assertIn("Account 'nonexistent_account' not found", result.output)
         self.assertFalse(os.path.exists(".ghmulti"))
 
+
+class TestRecursiveLink(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-link")))
+        self.env_patch = patch.dict(os.environ, {REGISTRY_PATH_ENV: str(self.root / "repos.sqlite3")})
+        self.env_patch.start()
+        with open(self.config_path, "w") as f:
+            json.dump({
+                "accounts": [{"name": "client", "username": "client_user", "gpg_key_id": "CLIENTGPG"}],
+                "active": "client"
+            }, f, indent=2)
+        self.api = self._init_repo("client/api", "git@github.com:Acme/api.git")
+        self.web = self._init_repo("client/web", "https://github.com/acme/web.git")
+        self.fork = self._init_repo("forks/tool", "https://github.com/someone-else/tool.git")
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _init_repo(self, relative, remote_url):
+        path = self.root / relative
+        path.mkdir(parents=True)
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        subprocess.run(["git", "remote", "add", "origin", remote_url], cwd=path, check=True)
+        return path
+
+    def _git_config(self, repo, key):
+        result = subprocess.run(["git", "config", "--local", key], cwd=repo, capture_output=True, text=True)
+        return result.stdout.strip() or None
+
+    def _link(self, *args):
+        result = self.runner.invoke(
+            link_account,
+            ["client", "--recursive", str(self.root), "--json", *args],
+            catch_exceptions=False
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        return json.loads(result.output)
+
+    def test_links_repositories_matching_owner(self):
+        payload = self._link("--owner", "acme")
+
+        self.assertEqual(payload["summary"], {"updated": 2, "planned": 0, "skipped": 0, "error": 0, "filtered": 1})
+        self.assertEqual(payload["filtered"], [str(self.fork)])
+        for repo in (self.api, self.web):
+            self.assertEqual(json.loads((repo / ".ghmulti").read_text())["account"], "client")
+            self.assertEqual(self._git_config(repo, "ghmulti.linkedaccount"), "client")
+            self.assertEqual(self._git_config(repo, "user.name"), "client_user")
+            self.assertEqual(self._git_config(repo, "user.signingkey"), "CLIENTGPG")
+        self.assertFalse((self.fork / ".ghmulti").exists())
+        with RepoRegistry() as registry:
+            self.assertEqual([repo.path for repo in registry.repos_for("client")], [str(self.api), str(self.web)])
+
+    def test_relinking_is_a_no_op(self):
+        self._link()
+        with patch("subprocess.run", side_effect=AssertionError("git spawned")):
+            payload = self._link()
+        self.assertEqual(payload["summary"]["skipped"], 3)
+        self.assertEqual(payload["summary"]["updated"], 0)
+
+    def test_dry_run_changes_nothing(self):
+        payload = self._link("--dry-run")
+        self.assertEqual(payload["summary"]["planned"], 3)
+        self.assertFalse((self.api / ".ghmulti").exists())
+        self.assertIsNone(self._git_config(self.api, "user.name"))
+
+    def test_owner_requires_recursive(self):
+        result = self.runner.invoke(link_account, ["client", "--owner", "acme"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("--recursive", result.output)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
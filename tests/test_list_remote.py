@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands import list_remote as list_remote_module
+from cli.commands.list_remote import get_branch_remotes
+from cli.commands.list_remote import list_remotes
+
+
+def _git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestListRemote(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-list-remote")))
+        self.repo = self.root / "repo"
+        self.repo.mkdir()
+        _git("init", "-q", "-b", "main", cwd=self.repo)
+        _git("config", "user.name", "Test", cwd=self.repo)
+        _git("config", "user.email", "test@example.com", cwd=self.repo)
+        _git("commit", "-q", "--allow-empty", "-m", "initial", cwd=self.repo)
+        _git("remote", "add", "origin", "git@github.com:work/api.git", cwd=self.repo)
+        _git("remote", "add", "mirror", "https://example.com/work/api.git", cwd=self.repo)
+        # Fake a fetched upstream one commit behind main.
+        _git("update-ref", "refs/remotes/origin/main", "HEAD", cwd=self.repo)
+        _git("commit", "-q", "--allow-empty", "-m", "local work", cwd=self.repo)
+        _git("branch", "--set-upstream-to=origin/main", "main", cwd=self.repo)
+        # An untracked branch whose subject looks like `git branch -vv` tracking info.
+        _git("checkout", "-q", "-b", "feature/wip", cwd=self.repo)
+        _git("commit", "-q", "--allow-empty", "-m", "[WIP] not tracking anything", cwd=self.repo)
+        _git("checkout", "-q", "main", cwd=self.repo)
+        self.original_cwd = os.getcwd()
+        os.chdir(self.repo)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _events(self, *args):
+        result = self.runner.invoke(list_remotes, ["--json", *args], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return [json.loads(line) for line in result.output.splitlines()]
+
+    def test_branch_remotes_ignore_bracketed_subjects(self):
+        self.assertEqual(get_branch_remotes(), {"main": "origin"})
+
+    def test_json_streams_remotes_and_current_branch(self):
+        events = self._events()
+        self.assertEqual(events[0], {"event": "repository", "current_branch": "main"})
+        remotes = [event for event in events if event["event"] == "remote"]
+        self.assertEqual(
+            [(remote["name"], remote["type"], remote["default"]) for remote in remotes],
+            [("origin", "ssh", True), ("mirror", "https", False)]
+        )
+        self.assertEqual(events[-1], {
+            "event": "branch", "name": "main", "current": True, "remote": "origin",
+            "upstream": "refs/remotes/origin/main", "ahead": None, "behind": None
+        })
+
+    def test_ahead_behind_is_counted_only_for_branches_shown(self):
+        with patch.object(list_remote_module, "ahead_behind", wraps=list_remote_module.ahead_behind) as counted:
+            events = self._events("--ahead-behind")
+        self.assertEqual(counted.call_count, 1)
+        self.assertEqual((events[-1]["ahead"], events[-1]["behind"]), (1, 0))
+
+        branches = [event for event in self._events("--all-branches", "--ahead-behind") if event["event"] == "branch"]
+        self.assertEqual(
+            {branch["name"]: (branch["remote"], branch["ahead"]) for branch in branches},
+            {"feature/wip": (None, None), "main": ("origin", 1)}
+        )
+
+    def test_branch_pattern_limits_listing(self):
+        branches = [event["name"] for event in self._events("--branch", "feature/*") if event["event"] == "branch"]
+        self.assertEqual(branches, ["feature/wip"])
+
+    def test_text_output(self):
+        result = self.runner.invoke(list_remotes, ["--all-branches", "--ahead-behind"], catch_exceptions=False)
+        self.assertIn("• origin → git@github.com:work/api.git [🔒 SSH] ✔ current branch default", result.output)
+        self.assertIn("• main → origin (+1/-0) ← current", result.output)
+        self.assertNotIn("feature/wip", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
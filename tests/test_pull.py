@@ -12,6 +12,13 @@ from cli.commands.add import add_account
 from cli.commands.use import use_account
 from cli.commands.link import link_account
 
+# `git config --list --show-origin --show-scope -z` output for the remotes created in setUp.
+ORIGIN_CONFIG_LISTING = b"local\0file:.git/config\0remote.origin.url\nhttps://github.com/test/test.git\0"
+LINKED_CONFIG_LISTING = (
+    ORIGIN_CONFIG_LISTING
+    + b"local\0file:.git/config\0remote.origin-linked_acc.url\nhttps://github.com/linked_user/test.git\0"
+)
+
 class TestPullCommand(unittest.TestCase):
 
     def setUp(self):
@@ -62,7 +69,7 @@ class TestPullCommand(unittest.TestCase):
     @patch('subprocess.run')
     @patch('subprocess.check_output')
     def test_pull_with_global_account(self, mock_subprocess_check_output, mock_subprocess_run):
-        mock_subprocess_check_output.return_value = b"origin\norigin-linked_acc\n"
+        mock_subprocess_check_output.return_value = LINKED_CONFIG_LISTING
         result = self.runner.invoke(pull_repo, catch_exceptions=False)
 
         mock_subprocess_run.assert_any_call(
@@ -76,7 +83,7 @@ class TestPullCommand(unittest.TestCase):
     @patch('subprocess.run')
     @patch('subprocess.check_output')
     def test_pull_with_linked_account(self, mock_subprocess_check_output, mock_subprocess_run):
-        mock_subprocess_check_output.return_value = b"origin\norigin-linked_acc\n"
+        mock_subprocess_check_output.return_value = LINKED_CONFIG_LISTING
         self.runner.invoke(link_account, ["linked_acc"], catch_exceptions=False)
         result = self.runner.invoke(pull_repo, catch_exceptions=False)
 
@@ -91,7 +98,7 @@ class TestPullCommand(unittest.TestCase):
     @patch('subprocess.run')
     @patch('subprocess.check_output')
     def test_pull_with_explicit_remote(self, mock_subprocess_check_output, mock_subprocess_run):
-        mock_subprocess_check_output.return_value = b"origin\norigin-linked_acc\n"
+        mock_subprocess_check_output.return_value = LINKED_CONFIG_LISTING
         self.runner.invoke(link_account, ["linked_acc"], catch_exceptions=False)
         result = self.runner.invoke(pull_repo, ["--remote", "origin"], catch_exceptions=False)
 
@@ -106,7 +113,7 @@ class TestPullCommand(unittest.TestCase):
     @patch('subprocess.run', side_effect=subprocess.CalledProcessError(1, "git pull"))
     @patch('subprocess.check_output')
     def test_pull_failure(self, mock_subprocess_check_output, mock_subprocess_run):
-        mock_subprocess_check_output.return_value = b"origin\n"
+        mock_subprocess_check_output.return_value = ORIGIN_CONFIG_LISTING
         result = self.runner.invoke(pull_repo, catch_exceptions=False)
 
         self.assertIn("Git pull failed", result.output)
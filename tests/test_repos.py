@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.link import link_account_logic
+from cli.commands.repos import list_repos
+from cli.config import clear_linked_account
+from cli.registry import REGISTRY_PATH_ENV
+from cli.registry import RepoRegistry
+from cli.registry import record_link
+from cli.registry import registry_session
+
+
+class TestRepoRegistry(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-repos")))
+        self.env_patch = patch.dict(os.environ, {REGISTRY_PATH_ENV: str(self.root / "repos.sqlite3")})
+        self.env_patch.start()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": "work"
+                },
+                f,
+                indent=2
+            )
+        self.api = self._init_repo("api")
+        self.web = self._init_repo("web")
+        self.blog = self._init_repo("blog")
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _init_repo(self, name):
+        path = self.root / name
+        path.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        return path
+
+    def _repos(self, *args):
+        result = self.runner.invoke(list_repos, ["--json", *args], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return json.loads(result.output)
+
+    def test_link_and_unlink_update_registry(self):
+        link_account_logic("work", repo_path=str(self.api))
+        link_account_logic("work", repo_path=str(self.web))
+        link_account_logic("personal", repo_path=str(self.blog))
+
+        with RepoRegistry() as registry:
+            self.assertEqual([repo.path for repo in registry.repos_for("work")], [str(self.api), str(self.web)])
+            self.assertEqual(registry.account_for(self.blog), "personal")
+
+        clear_linked_account(repo_path=str(self.web))
+        payload = self._repos("--account", "work")
+        self.assertEqual(payload["repos"], [{"path": str(self.api), "account": "work"}])
+
+    def test_relinking_moves_repository_to_new_account(self):
+        link_account_logic("work", repo_path=str(self.api))
+        link_account_logic("personal", repo_path=str(self.api))
+        self.assertEqual(self._repos("--account", "work")["repos"], [])
+        self.assertEqual(self._repos("--account", "personal")["repos"], [{"path": str(self.api), "account": "personal"}])
+
+    def test_repair_drops_missing_and_follows_changed_links(self):
+        link_account_logic("work", repo_path=str(self.api))
+        link_account_logic("work", repo_path=str(self.web))
+        shutil.rmtree(self.api)
+        (self.web / ".ghmulti").write_text(json.dumps({"account": "personal"}), encoding="utf-8")
+
+        payload = self._repos("--repair")
+        self.assertEqual(payload["repair"]["removed"], [str(self.api)])
+        self.assertEqual(payload["repair"]["updated"], [{"path": str(self.web), "account": "personal"}])
+        self.assertEqual(payload["repos"], [{"path": str(self.web), "account": "personal"}])
+
+    def test_repair_scan_registers_unknown_links(self):
+        (self.blog / ".ghmulti").write_text(json.dumps({"account": "personal"}), encoding="utf-8")
+        payload = self._repos("--repair", "--scan", str(self.root))
+        self.assertEqual(payload["repair"]["added"], [{"path": str(self.blog), "account": "personal"}])
+        self.assertEqual(payload["repos"], [{"path": str(self.blog), "account": "personal"}])
+
+    def test_scan_requires_repair(self):
+        result = self.runner.invoke(list_repos, ["--scan", str(self.root)])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("--repair", result.output)
+
+    def test_session_shares_one_connection_and_failures_are_logged(self):
+        with patch("cli.registry.RepoRegistry", wraps=RepoRegistry) as opened:
+            with registry_session():
+                for repo in (self.api, self.web, self.blog):
+                    record_link(repo, "work")
+            self.assertEqual(opened.call_count, 1)
+        self.assertEqual(len(self._repos("--account", "work")["repos"]), 3)
+
+        with patch.dict(os.environ, {REGISTRY_PATH_ENV: str(self.api / ".git" / "HEAD" / "repos.sqlite3")}):
+            with self.assertLogs("cli.registry", level="WARNING") as logs:
+                record_link(self.web, "personal")
+        self.assertIn("Could not record", logs.output[0])
+
+    def test_registry_moves_out_of_the_cache_directory(self):
+        legacy, current = self.root / "cache" / "repos.sqlite3", self.root / "state" / "repos.sqlite3"
+        legacy.parent.mkdir()
+        with RepoRegistry(legacy) as registry:
+            registry.record(self.api, "work")
+        with patch.dict(os.environ, {REGISTRY_PATH_ENV: ""}), \
+                patch("cli.registry.REGISTRY_PATH", current), patch("cli.registry.LEGACY_REGISTRY_PATH", legacy):
+            with RepoRegistry() as registry:
+                self.assertEqual(registry.account_for(self.api), "work")
+        self.assertTrue(current.exists())
+        self.assertFalse(legacy.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
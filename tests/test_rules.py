@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.rename import rename_account
+from cli.commands.rule import rule
+from cli.commands.which import which
+from cli.config import clear_config_cache
+from cli.config import get_active_account
+from cli.config import load_config
+from cli.config import load_rule_trie
+from cli.config import save_config
+from cli.config import set_linked_account
+from cli.rules import DirectoryRule
+from cli.rules import RuleTrie
+from cli.rules import compile_pattern
+from cli.registry import REGISTRY_PATH_ENV
+
+from timing import assert_within_budget
+from timing import budget
+
+# Average budget per resolution in microseconds, checked only on opt-in (see tests/timing.py).
+MATCH_BUDGET_US = budget("GHMULTI_RULE_MATCH_BUDGET_US", 50)
+
+
+class TestRuleTrie(unittest.TestCase):
+    def test_longest_prefix_wins(self):
+        trie = RuleTrie([
+            DirectoryRule("/src/**", "personal"),
+            DirectoryRule("/src/clients/acme/**", "acme"),
+            DirectoryRule("/src/clients/*/infra/**", "ops"),
+            DirectoryRule("/src/clients/acme/infra/**", "acme-infra"),
+            DirectoryRule("/src/clients/solo", "solo"),
+        ])
+        self.assertEqual(trie.match("/src/notes").account, "personal")
+        self.assertEqual(trie.match("/src").account, "personal")
+        self.assertEqual(trie.match("/src/clients/acme/web/src").account, "acme")
+        self.assertEqual(trie.match("/src/clients/globex/infra/tf").account, "ops")
+        # A literal directory beats a wildcard at the same depth.
+        self.assertEqual(trie.match("/src/clients/acme/infra").account, "acme-infra")
+        # Rules without /** only cover the directory itself.
+        self.assertEqual(trie.match("/src/clients/solo").account, "solo")
+        self.assertEqual(trie.match("/src/clients/solo/sub").account, "personal")
+        self.assertIsNone(trie.match("/elsewhere"))
+
+    def test_patterns_are_validated(self):
+        with patch.dict(os.environ, {"HOME": "/home/me"}):
+            self.assertEqual(compile_pattern("~/work/**"), (("/", "home", "me", "work"), True))
+        for pattern in ("relative/**", "/src/ac*me/**", "/src/**/deep", ""):
+            with self.subTest(pattern=pattern), self.assertRaises(ValueError):
+                compile_pattern(pattern)
+
+    def test_match_cost_does_not_grow_with_rules(self):
+        trie = RuleTrie(DirectoryRule(f"/src/org-{index}/team-{index % 10}/**", f"bot-{index}") for index in range(10_000))
+        paths = [f"/src/org-{index}/team-{index % 10}/repo/pkg/module" for index in range(0, 10_000, 100)]
+        started = time.perf_counter()
+        for path in paths:
+            self.assertIsNotNone(trie.match(path))
+        per_match_us = (time.perf_counter() - started) * 1_000_000 / len(paths)
+        assert_within_budget(self, per_match_us, MATCH_BUDGET_US, "rule match (us)")
+
+
+class TestRuleCommands(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-rules")))
+        self.env_patch = patch.dict(os.environ, {
+            "GHMULTI_ACCOUNT_STORE": "json",
+            "GIT_CONFIG_GLOBAL": str(self.root / "gitconfig"),
+            REGISTRY_PATH_ENV: str(self.root / "repos.json"),
+        })
+        self.env_patch.start()
+        self.path_patch = patch("cli.config.CONFIG_PATH", self.root / ".ghmulti.json")
+        self.path_patch.start()
+        clear_config_cache()
+        save_config({
+            "accounts": [{"name": "acme", "username": "acme_user"}, {"name": "personal", "username": "me"}],
+            "active": "personal",
+        })
+        self.clients = self.root / "clients" / "acme"
+        (self.clients / "web" / "src").mkdir(parents=True)
+
+    def tearDown(self):
+        self.path_patch.stop()
+        self.env_patch.stop()
+        clear_config_cache()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _invoke(self, command, args):
+        result = self.runner.invoke(command, args, catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output
+
+    def test_add_list_and_remove(self):
+        pattern = f"{self.clients}/**"
+        self._invoke(rule, ["add", pattern, "personal"])
+        payload = json.loads(self._invoke(rule, ["add", pattern + "/", "acme", "--json"]))
+        self.assertTrue(payload["replaced"])
+        self.assertEqual(json.loads(self._invoke(rule, ["list", "--json"])), [{"pattern": pattern + "/", "account": "acme"}])
+
+        result = self.runner.invoke(rule, ["add", pattern, "missing"])
+        self.assertIn("Account 'missing' not found", result.output)
+        result = self.runner.invoke(rule, ["add", "clients/**", "acme"])
+        self.assertIn("must be an absolute path", result.output)
+
+        self._invoke(rule, ["remove", pattern])
+        self.assertNotIn("rules", load_config())
+        self.assertNotIn("rules", json.loads((self.root / ".ghmulti.json").read_text(encoding="utf-8")))
+
+    def test_which_reports_rule_and_link_precedence(self):
+        self._invoke(rule, ["add", f"{self.clients}/**", "acme"])
+        nested = self.clients / "web" / "src"
+        payload = json.loads(self._invoke(which, [str(nested), "--json"]))
+        self.assertEqual(payload["path"], str(nested))
+        self.assertEqual(payload["account"]["name"], "acme")
+        self.assertEqual(payload["source"], "rule")
+        self.assertEqual(payload["rule"], {"pattern": f"{self.clients}/**", "account": "acme"})
+        self.assertEqual(get_active_account(repo_path=nested)["name"], "acme")
+
+        # An explicit .ghmulti link still wins over the rule.
+        set_linked_account("personal", repo_path=nested, sync_git_config=False)
+        payload = json.loads(self._invoke(which, [str(nested), "--json"]))
+        self.assertEqual((payload["account"]["name"], payload["source"], payload["rule"]), ("personal", "linked", None))
+
+        payload = json.loads(self._invoke(which, [str(self.root), "--json"]))
+        self.assertEqual((payload["account"]["name"], payload["source"]), ("personal", "global"))
+
+    def test_subdirectories_resolve_through_the_repository_root(self):
+        repo = self.clients / "web"
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        self._invoke(rule, ["add", str(repo), "acme"])
+        payload = json.loads(self._invoke(which, [str(repo / "src"), "--json"]))
+        self.assertEqual((payload["root"], payload["source"]), (str(repo), "rule"))
+
+        set_linked_account("personal", repo_path=repo, sync_git_config=False)
+        payload = json.loads(self._invoke(which, [str(repo / "src"), "--json"]))
+        self.assertEqual((payload["account"]["name"], payload["source"]), ("personal", "linked"))
+
+    def test_rename_remaps_rules_and_trie_follows_config(self):
+        self._invoke(rule, ["add", f"{self.clients}/**", "acme"])
+        self.assertEqual(load_rule_trie().match(self.clients).account, "acme")
+        self._invoke(rename_account, ["acme", "acme-corp"])
+        self.assertEqual(load_config()["rules"], [{"pattern": f"{self.clients}/**", "account": "acme-corp"}])
+        self.assertEqual(load_rule_trie().match(self.clients).account, "acme-corp")
+        self.assertIs(load_rule_trie(), load_rule_trie())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli import scanner as scan_module
+from cli.commands.scan import scan
+from cli.scanner import scan_repositories
+
+
+class TestScanCommand(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-scan")))
+
+        self.linked = self._init_repo("work/api")
+        (self.linked / ".ghmulti").write_text(json.dumps({"account": "work"}), encoding="utf-8")
+        self.legacy = self._init_repo("personal/blog")
+        subprocess.run(["git", "config", "ghmulti.linkedAccount", "personal"], cwd=self.legacy, check=True)
+        self.plain = self._init_repo("plain")
+        # Checkouts inside pruned directories are not reported.
+        self._init_repo("plain/node_modules/dep")
+        self._init_repo("vendor/lib")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _init_repo(self, relative):
+        path = self.root / relative
+        path.mkdir(parents=True)
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        return path
+
+    def test_json_streams_one_repository_per_line(self):
+        result = self.runner.invoke(scan, [str(self.root), "--json"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0)
+        records = {record["path"]: record for record in map(json.loads, result.output.splitlines())}
+
+        self.assertEqual(set(records), {str(self.linked), str(self.legacy), str(self.plain)})
+        self.assertEqual(records[str(self.linked)]["account"], "work")
+        self.assertEqual(records[str(self.linked)]["linked_account"], "work")
+        self.assertEqual(records[str(self.legacy)]["linked_account_from_git_config"], "personal")
+        self.assertIsNone(records[str(self.legacy)]["linked_account"])
+        self.assertIsNone(records[str(self.plain)]["account"])
+
+    def test_linked_only_and_text_output(self):
+        result = self.runner.invoke(scan, [str(self.root), "--linked-only"], catch_exceptions=False)
+        self.assertIn("work/api → 'work'", result.output)
+        self.assertIn("personal/blog → 'personal' (git config only)", result.output)
+        self.assertNotIn("plain", result.output)
+
+    def test_max_depth_limits_descent(self):
+        found = {repository.path for repository in scan_repositories(self.root, max_depth=1)}
+        self.assertEqual(found, {str(self.plain)})
+
+    def test_unexpected_failure_is_reported_and_scan_finishes(self):
+        real_describe = scan_module.describe_repository
+
+        def describe(path):
+            if Path(path) == self.legacy:
+                raise RuntimeError("odd config")
+            return real_describe(path)
+
+        found = []
+        with patch("cli.scanner.describe_repository", side_effect=describe):
+            scanner = threading.Thread(target=lambda: found.extend(scan_repositories(self.root)), daemon=True)
+            scanner.start()
+            scanner.join(timeout=10)
+        self.assertFalse(scanner.is_alive(), "scan never finished")
+        errors = {repository.path: repository.error for repository in found if repository.error}
+        self.assertEqual(list(errors), [str(self.legacy)])
+        self.assertEqual(errors[str(self.legacy)], "RuntimeError: odd config")
+        self.assertEqual({repository.path for repository in found if not repository.error}, {str(self.linked), str(self.plain)})
+
+    def test_does_not_spawn_git(self):
+        with patch("subprocess.Popen", side_effect=AssertionError("git spawned")):
+            found = list(scan_repositories(self.root))
+        self.assertEqual(len(found), 3)
+
+    def test_large_tree_scans_quickly(self):
+        for index in range(100):
+            for child in range(100):
+                (self.root / "bulk" / f"d{index}" / f"c{child}").mkdir(parents=True)
+        started = time.perf_counter()
+        found = list(scan_repositories(self.root))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(found), 3)
+        self.assertLess(elapsed, float(os.environ.get("GHMULTI_SCAN_BUDGET_SECONDS", "1.0")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.list import list_accounts
+from cli.commands.serve import serve
+from cli.commands.status import build_status_payload
+from cli.daemon import DaemonService
+from cli.daemon import query_daemon
+from cli.ipc import RpcError
+from cli.ipc import call
+from cli.ipc import create_server
+from cli.ipc import supports_unix_sockets
+
+
+@unittest.skipUnless(supports_unix_sockets(), "Unix domain sockets are not available")
+class TestServeDaemon(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.socket_dir = tempfile.mkdtemp(prefix="ghm")
+        self.socket_path = Path(self.socket_dir) / "daemon.sock"
+        self.repo_dir = os.path.realpath(tempfile.mkdtemp(prefix="ghm-repo"))
+        subprocess.run(["git", "init"], cwd=self.repo_dir, capture_output=True, check=False)
+        self._write_config("work")
+
+        self.keyring_patch = patch("keyring.get_password", return_value="dummy_token")
+        self.keyring_patch.start()
+
+        self.service = DaemonService()
+        self.server = create_server(self.socket_path, self.service.handlers())
+        self.service.stop_callback = self.server.request_shutdown
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+        self.keyring_patch.stop()
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _write_config(self, active):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": active
+                },
+                f,
+                indent=2
+            )
+
+    def test_status_matches_direct_payload(self):
+        result = call(self.socket_path, "status", {"cwd": self.repo_dir, "skip_token_check": True})
+        self.assertEqual(result, build_status_payload(repo_path=self.repo_dir, skip_token_check=True))
+
+    def test_repeated_status_is_served_from_cache(self):
+        params = {"cwd": self.repo_dir, "skip_token_check": True}
+        call(self.socket_path, "status", params)
+        call(self.socket_path, "status", params)
+        self.assertEqual(self.service.cache_misses, 1)
+        self.assertEqual(self.service.cache_hits, 1)
+
+    def test_config_change_invalidates_cache(self):
+        first = call(self.socket_path, "list")
+        self.assertEqual(first["active"], "work")
+
+        time.sleep(0.01)
+        self._write_config("personal")
+        second = call(self.socket_path, "list")
+        self.assertEqual(second["active"], "personal")
+
+    def test_project_link_change_invalidates_whoami(self):
+        first = call(self.socket_path, "whoami", {"cwd": self.repo_dir})
+        self.assertEqual(first["source"], "global")
+
+        with open(os.path.join(self.repo_dir, ".ghmulti"), "w", encoding="utf-8") as f:
+            json.dump({"account": "personal"}, f)
+        second = call(self.socket_path, "whoami", {"cwd": self.repo_dir})
+        self.assertEqual(second["account"]["name"], "personal")
+        self.assertEqual(second["source"], "linked")
+
+    def test_unknown_method_returns_error(self):
+        with self.assertRaises(RpcError):
+            call(self.socket_path, "nope")
+
+    def test_cli_list_uses_daemon_when_socket_available(self):
+        with patch.dict(os.environ, {"GHMULTI_SOCKET": str(self.socket_path)}):
+            with patch("cli.commands.list.load_config") as mock_load_config:
+                result = self.runner.invoke(list_accounts, ["--json"], catch_exceptions=False)
+        mock_load_config.assert_not_called()
+        self.assertEqual(json.loads(result.output)["active"], "work")
+
+    def test_query_daemon_returns_none_without_socket(self):
+        missing = Path(self.socket_dir) / "missing.sock"
+        with patch.dict(os.environ, {"GHMULTI_SOCKET": str(missing)}):
+            self.assertIsNone(query_daemon("list"))
+
+
+@unittest.skipUnless(supports_unix_sockets(), "Unix domain sockets are not available")
+class TestSocketDirectory(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix="ghm"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_only_a_created_directory_is_tightened(self):
+        os.chmod(self.root, 0o755)
+        server = create_server(self.root / "daemon.sock", {})
+        server.server_close()
+        self.assertEqual(self.root.stat().st_mode & 0o777, 0o755)
+
+        server = create_server(self.root / "private" / "daemon.sock", {})
+        server.server_close()
+        self.assertEqual((self.root / "private").stat().st_mode & 0o777, 0o700)
+
+    def test_unusable_socket_path_is_reported(self):
+        (self.root / "file").write_text("", encoding="utf-8")
+        result = CliRunner().invoke(serve, ["--socket", str(self.root / "file" / "daemon.sock")])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Error:", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from timing import assert_within_budget
+from timing import budget
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = {"inquirer", "keyring", "requests"}
+# Checked only on opt-in (see tests/timing.py); the heavy-module check always runs.
+IMPORT_BUDGET_MS = budget("GHMULTI_IMPORT_BUDGET_MS", 250)
+
+
+def _profile_imports(*args: str) -> tuple[set[str], float]:
+    env = {**os.environ, "GHMULTI_NO_DAEMON": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ghmulti", *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    modules: set[str] = set()
+    cost_us = 0
+    seen_entrypoint = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        modules.add(module)
+        is_root = not name[1:].startswith(" ")
+        # Only count imports triggered by ghmulti itself, not interpreter/site startup.
+        if is_root and seen_entrypoint:
+            cost_us += int(cumulative)
+        if is_root and module == "ghmulti":
+            seen_entrypoint = True
+    return modules, cost_us / 1000
+
+
+class TestStartupImportBudget(unittest.TestCase):
+    def _assert_lightweight(self, *args: str) -> None:
+        modules, cost_ms = _profile_imports(*args)
+        self.assertIn("cli.commands.__main__", modules)
+        self.assertFalse(HEAVY_MODULES & modules, f"heavy modules imported: {sorted(HEAVY_MODULES & modules)}")
+        assert_within_budget(self, cost_ms, IMPORT_BUDGET_MS, "import cost (ms)")
+
+    def test_help_import_budget(self):
+        self._assert_lightweight("--help")
+
+    def test_list_json_import_budget(self):
+        self._assert_lightweight("list", "--json")
+
+    def test_which_json_import_budget(self):
+        self._assert_lightweight("which", "--json")
+
+    def test_list_json_does_not_import_unrelated_commands(self):
+        modules, _ = _profile_imports("list", "--json")
+        self.assertIn("cli.config", modules)
+        # git_utils/github_auth are only needed by repository and token commands.
+        self.assertNotIn("cli.git_utils", modules)
+        self.assertNotIn("cli.github_auth", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
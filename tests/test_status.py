@@ -2,12 +2,16 @@ import json
 import os
 import shutil
 import subprocess
+import time
 import unittest
 from unittest.mock import patch
 
 from click.testing import CliRunner
 
 from cli.commands.status import status
+from cli.config import clear_config_cache
+from cli.config import config_parse_count
+from cli.github_auth import TokenValidationResult
 
 
 class TestStatusCommand(unittest.TestCase):
@@ -89,6 +93,28 @@ class TestStatusCommand(unittest.TestCase):
         payload = json.loads(result.output)
         self.assertTrue(any("does not match" in warning for warning in payload["warnings"]))
 
+    def test_status_parses_config_once(self):
+        clear_config_cache()
+        before = config_parse_count()
+        result = self.runner.invoke(status, ["--json", "--skip-token-check"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(config_parse_count() - before, 1)
+
+    def test_status_json_spawns_no_git_process(self):
+        git_commands = []
+        real_popen = subprocess.Popen
+
+        def tracking_popen(args, *popen_args, **popen_kwargs):
+            if args and args[0] == "git":
+                git_commands.append(args)
+            return real_popen(args, *popen_args, **popen_kwargs)
+
+        with patch("subprocess.Popen", side_effect=tracking_popen):
+            result = self.runner.invoke(status, ["--json", "--skip-token-check"], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(git_commands, [])
+        self.assertEqual(json.loads(result.output)["local_git"]["user_name"], "global_user")
+
     def test_status_text_output(self):
         result = self.runner.invoke(status, ["--skip-token-check"], catch_exceptions=False)
         self.assertEqual(result.exit_code, 0)
@@ -97,5 +123,86 @@ class TestStatusCommand(unittest.TestCase):
         self.assertIn("Effective active account", result.output)
 
 
+class TestStatusAllAccounts(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [{"name": f"acct{index}", "username": f"user{index}"} for index in range(6)],
+                    "active": "acct0"
+                },
+                f,
+                indent=2
+            )
+        self.keyring_patch = patch("keyring.get_password", side_effect=lambda _service, username: (
+            None if username == "user5" else f"token-{username}"
+        ))
+        self.keyring_patch.start()
+
+    def tearDown(self):
+        self.keyring_patch.stop()
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    @staticmethod
+    def _slow_validation(delays):
+        def validate(token, **_kwargs):
+            time.sleep(delays.get(token, 0.2))
+            return TokenValidationResult(
+                valid=True,
+                message="Token is valid.",
+                status_code=200,
+                source="network",
+                latency_ms=200.0,
+                rate_limit_limit=5000,
+                rate_limit_remaining=4999
+            )
+        return validate
+
+    def test_all_accounts_validates_concurrently(self):
+        with patch("cli.commands.status.validate_github_token", side_effect=self._slow_validation({})) as mock_validate:
+            started = time.monotonic()
+            result = self.runner.invoke(status, ["--all-accounts", "--json"], catch_exceptions=False)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(result.exit_code, 0)
+        payload = json.loads(result.output)
+        self.assertEqual([entry["account"] for entry in payload], [f"acct{index}" for index in range(6)])
+        self.assertEqual(mock_validate.call_count, 5)
+        # Five 200 ms validations run side by side, not back to back.
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(payload[0]["status_code"], 200)
+        self.assertEqual(payload[0]["rate_limit"]["remaining"], 4999)
+        self.assertFalse(payload[5]["present"])
+        self.assertIsNone(payload[5]["valid"])
+
+    def test_all_accounts_respects_deadline(self):
+        delays = {"token-user1": 2.0}
+        with patch("cli.commands.status.validate_github_token", side_effect=self._slow_validation(delays)):
+            started = time.monotonic()
+            result = self.runner.invoke(
+                status,
+                ["--all-accounts", "--json", "--deadline", "0.5"],
+                catch_exceptions=False
+            )
+            elapsed = time.monotonic() - started
+
+        payload = json.loads(result.output)
+        self.assertLess(elapsed, 1.5)
+        self.assertTrue(payload[0]["valid"])
+        self.assertIsNone(payload[1]["valid"])
+        self.assertTrue(payload[1]["present"])
+        self.assertIn("deadline", payload[1]["message"])
+
+    def test_all_accounts_rejects_non_positive_deadline(self):
+        for value in ("0", "-1"):
+            with self.subTest(deadline=value):
+                result = self.runner.invoke(status, ["--all-accounts", "--deadline", value])
+                self.assertEqual(result.exit_code, 2)
+                self.assertIn("--deadline", result.output)
+
+
 if __name__ == "__main__":
     unittest.main()
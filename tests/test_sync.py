@@ -0,0 +1,202 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from cli.commands.link import link_account_logic
+from cli.commands.sync import sync
+from cli.registry import REGISTRY_PATH_ENV
+from cli.sync import SyncTarget
+from cli.sync import parse_bytes_received
+from cli.sync import plan_sync
+from cli.sync import sync_repositories
+
+
+class TestSyncCommand(unittest.TestCase):
+    def setUp(self):
+        self.runner = CliRunner()
+        self.config_path = os.path.expanduser("~/.ghmulti.json")
+        self.root = Path(os.path.realpath(tempfile.mkdtemp(prefix="ghmulti-sync")))
+        self.env_patch = patch.dict(os.environ, {REGISTRY_PATH_ENV: str(self.root / "repos.sqlite3")})
+        self.env_patch.start()
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "accounts": [
+                        {"name": "work", "username": "work_user"},
+                        {"name": "personal", "username": "personal_user"},
+                    ],
+                    "active": "work"
+                },
+                f,
+                indent=2
+            )
+
+        self.upstream = self.root / "upstream.git"
+        self._git("init", "-q", "--bare", str(self.upstream))
+        seed = self._clone("seed")
+        self._commit(seed, "first")
+        self._git("push", "-q", "origin", "HEAD", cwd=seed)
+        self.api = self._clone("api")
+        self.web = self._clone("web")
+        link_account_logic("work", repo_path=str(self.api))
+        link_account_logic("personal", repo_path=str(self.web))
+        # New upstream work that the clones have not fetched yet.
+        self._commit(seed, "second")
+        self._git("push", "-q", "origin", "HEAD", cwd=seed)
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.config_path):
+            os.remove(self.config_path)
+
+    def _git(self, *args, cwd=None):
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    def _clone(self, name):
+        path = self.root / name
+        self._git("clone", "-q", str(self.upstream), str(path))
+        self._git("config", "user.name", "tester", cwd=path)
+        self._git("config", "user.email", "tester@example.com", cwd=path)
+        return path
+
+    def _commit(self, repo, message):
+        (repo / f"{message}.txt").write_text(message, encoding="utf-8")
+        self._git("add", ".", cwd=repo)
+        self._git("commit", "-q", "-m", message, cwd=repo)
+
+    def _head(self, repo, ref="HEAD"):
+        return subprocess.check_output(["git", "rev-parse", ref], cwd=repo, text=True).strip()
+
+    def _sync(self, *args, **kwargs):
+        result = self.runner.invoke(sync, ["--json", *args], catch_exceptions=False, **kwargs)
+        return result, [json.loads(line) for line in result.output.splitlines()]
+
+    @patch("keyring.get_password", return_value=None)
+    def test_fetches_registered_repositories_and_streams_ndjson(self, _mock_keyring):
+        result, events = self._sync()
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        repositories = {event["path"]: event for event in events if event["event"] == "repository"}
+        self.assertEqual(set(repositories), {str(self.api), str(self.web)})
+        self.assertEqual(repositories[str(self.api)]["account"], "work")
+        self.assertEqual(repositories[str(self.web)]["account"], "personal")
+        for event in repositories.values():
+            self.assertEqual(event["status"], "ok")
+            self.assertEqual(event["host"], "local")
+            self.assertGreaterEqual(event["duration_ms"], 0)
+            self.assertGreater(event["bytes_received"], 0)
+        self.assertEqual(events[-1]["event"], "summary")
+        self.assertEqual(events[-1]["ok"], 2)
+        # Fetch only: the working branch stays where it was.
+        self.assertNotEqual(self._head(self.api), self._head(self.api, "origin/HEAD"))
+
+    @patch("keyring.get_password", return_value=None)
+    def test_pull_fast_forwards_repositories_read_from_stdin(self, _mock_keyring):
+        result, events = self._sync("--pull", "--stdin", input=f"{self.api}\n\n")
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual([event["path"] for event in events if event["event"] == "repository"], [str(self.api)])
+        self.assertEqual(self._head(self.api), self._head(self.upstream))
+        self.assertNotEqual(self._head(self.web), self._head(self.upstream))
+
+    @patch("keyring.get_password", return_value=None)
+    def test_account_filter_and_failure_exit_code(self, _mock_keyring):
+        shutil.rmtree(self.upstream)
+        result, events = self._sync("--account", "personal")
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual([event["path"] for event in events if event["event"] == "repository"], [str(self.web)])
+        self.assertEqual(events[0]["status"], "error")
+        self.assertTrue(events[0]["error"])
+        self.assertEqual(events[-1]["error"], 1)
+
+    def test_ssh_remotes_use_the_account_key_without_prompting(self):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "accounts": [
+                    {"name": "work", "username": "work_user", "ssh_key_path": "/keys/id work"},
+                    {"name": "personal", "username": "personal_user"},
+                ],
+                "active": "work"
+            }, f)
+        for repo in (self.api, self.web):
+            self._git("remote", "set-url", "origin", f"git@github.com:acme/{repo.name}.git", cwd=repo)
+        self._git("config", "core.sshCommand", "my-ssh-wrapper", cwd=self.web)
+
+        with patch.dict(os.environ, {"GIT_SSH_COMMAND": ""}):
+            api, web = plan_sync([str(self.api), str(self.web)])
+        self.assertEqual(api.ssh_command, "ssh -o BatchMode=yes -i '/keys/id work' -o IdentitiesOnly=yes")
+        # No account key: the repository's own ssh command is kept.
+        self.assertIsNone(web.ssh_command)
+
+
+class TestSyncConcurrency(unittest.TestCase):
+    def test_per_host_cap_is_respected(self):
+        active: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def fake_run(args, cwd, **kwargs):
+            host = cwd.split("/")[0]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        targets = [
+            SyncTarget(f"{host}/{index}", None, None, "origin", None, host)
+            for host in ("github.com", "ghe.example.com")
+            for index in range(6)
+        ]
+        with patch("cli.sync.subprocess.run", side_effect=fake_run):
+            results = list(sync_repositories(targets, workers=8, per_host=2))
+
+        self.assertEqual(len(results), 12)
+        self.assertEqual(peak, {"github.com": 2, "ghe.example.com": 2})
+
+    def test_token_is_only_sent_to_github_hosts(self):
+        passwords: dict[str, str] = {}
+
+        def fake_run(args, cwd, env, **kwargs):
+            passwords[cwd] = env.get("GHMULTI_GIT_PASSWORD", "none")
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        targets = [
+            SyncTarget("api", "work", "work_user", "origin", "https://github.com/work/api.git", "github.com"),
+            SyncTarget("lab", "work", "work_user", "origin", "https://gitlab.example.com/work/lab.git", "gitlab.example.com"),
+        ]
+        looked_up: list[str] = []
+
+        def token_for(username):
+            looked_up.append(username)
+            return "gh-token"
+
+        with patch("cli.sync.subprocess.run", side_effect=fake_run):
+            list(sync_repositories(targets, token_for=token_for))
+
+        self.assertEqual(passwords, {"api": "gh-token", "lab": "none"})
+        self.assertEqual(looked_up, ["work_user"])
+
+    def test_parse_bytes_received(self):
+        progress = (
+            "remote: Counting objects: 100% (3/3), done.\n"
+            "Receiving objects:  50% (1/2)\rReceiving objects: 100% (2/2), 1.50 KiB | 1.50 MiB/s, done.\n"
+        )
+        self.assertEqual(parse_bytes_received(progress), 1536)
+        self.assertEqual(parse_bytes_received(""), 0)
+        self.assertIsNone(parse_bytes_received("Receiving objects: 100% (2/2), done.\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
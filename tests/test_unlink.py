@@ -3,6 +3,7 @@ import os
 import shutil
 import subprocess
 import unittest
+from unittest.mock import patch
 
 from click.testing import CliRunner
 
@@ -59,9 +60,11 @@ class TestUnlinkCommand(unittest.TestCase):
     def test_unlink_non_git_repo_fails(self):
         non_git_dir = "temp_non_git_dir"
         os.makedirs(non_git_dir, exist_ok=True)
-        os.chdir(non_git_dir)
-        result = self.runner.invoke(unlink_account)
-        os.chdir("..")
+        # Without a ceiling, discovery would find the repository this directory sits in.
+        with patch.dict(os.environ, {"GIT_CEILING_DIRECTORIES": os.getcwd()}):
+            os.chdir(non_git_dir)
+            result = self.runner.invoke(unlink_account)
+            os.chdir("..")
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("does not appear to be a git repository", result.output)
 
@@ -8,6 +8,8 @@ from click.testing import CliRunner
 
 from cli.commands.use import use_account
 from cli.commands.add import add_account
+from cli.git_utils import GitConfigEntry
+from cli.git_utils import GitConfigSnapshot
 
 class TestUseCommand(unittest.TestCase):
 
@@ -58,9 +60,13 @@ class TestUseCommand(unittest.TestCase):
         self.assertIn("Switched global active account to: test_account_1", result.output)
         self.assertEqual(result.exit_code, 0)
 
+    @patch('cli.commands.use.GitConfigSnapshot.load', return_value=GitConfigSnapshot([
+        GitConfigEntry("global", "file:~/.gitconfig", "user.signingkey", "GPG1"),
+        GitConfigEntry("global", "file:~/.gitconfig", "core.sshcommand", "ssh -i ~/.ssh/id_rsa_user1"),
+    ]))
     @patch('subprocess.run')
-    def test_use_account_unsets_optional_configs(self, mock_subprocess_run):
-        # First, set test_account_1 as active to ensure optional configs are set
+    def test_use_account_unsets_optional_configs(self, mock_subprocess_run, mock_snapshot_load):
+        # test_account_1 left GPG/SSH settings in the global config (see the snapshot patch above)
         self.runner.invoke(use_account, ["test_account_1"], catch_exceptions=False)
 
         # Then switch to test_account_2 which has no GPG or SSH key
@@ -0,0 +1,22 @@
+"""Wall-clock budgets for the scale tests, enforced only when GHMULTI_TIMING_TESTS=1.
+
+Timings depend on the machine, so the default suite checks correctness only.
+Each budget can still be overridden through its own environment variable.
+"""
+import os
+import unittest
+
+TIMING_TESTS_ENV = "GHMULTI_TIMING_TESTS"
+
+
+def budget(env_name: str, default: float) -> float:
+    return float(os.environ.get(env_name, default))
+
+
+def timing_enabled() -> bool:
+    return os.environ.get(TIMING_TESTS_ENV, "") not in ("", "0")
+
+
+def assert_within_budget(case: unittest.TestCase, measured: float, limit: float, label: str) -> None:
+    if timing_enabled():
+        case.assertLess(measured, limit, f"{label} took {measured:.3f}, budget {limit:.3f}")
@@ -4,12 +4,15 @@ exports.activate = activate;
 exports.deactivate = deactivate;
 const cp = require("child_process");
 const fs = require("fs");
+const net = require("net");
+const os = require("os");
 const path = require("path");
 const vscode = require("vscode");
 let statusBarItem;
 let outputChannel;
 let cachedGhMultiCommand;
 let isTestMode = false;
+const DAEMON_TIMEOUT_MS = 500;
 function activate(context) {
     isTestMode = context.extensionMode === vscode.ExtensionMode.Test;
     statusBarItem = vscode.window.createStatusBarItem(vscode.StatusBarAlignment.Left, 100);
@@ -35,9 +38,9 @@ function activate(context) {
     checkAndPromptForLink();
 }
 function deactivate() { }
-function updateStatusBar() {
+async function updateStatusBar() {
     const preferredFolder = getPreferredWorkspaceFolder();
-    const accountInfo = getActiveAccountInfo(preferredFolder?.uri.fsPath);
+    const accountInfo = await getActiveAccountInfo(preferredFolder?.uri.fsPath);
     if (!accountInfo) {
         statusBarItem.text = '$(account) ghmulti';
         statusBarItem.tooltip = 'ghmulti: no active account. Click to add, switch, or link an account.';
@@ -53,10 +56,13 @@ function updateStatusBar() {
     statusBarItem.command = 'ghmulti-vscode.manage';
     statusBarItem.show();
 }
-function getActiveAccountInfo(workspaceFolderPath) {
+async function getActiveAccountInfo(workspaceFolderPath) {
     const options = workspaceFolderPath ? { cwd: workspaceFolderPath } : {};
     try {
-        const jsonResult = tryParseJson(runGhMulti(['status', '--json', '--skip-token-check'], options));
+        const jsonResult = await queryDaemon('status', {
+            cwd: workspaceFolderPath,
+            skip_token_check: true
+        }) ?? tryParseJson(runGhMulti(['status', '--json', '--skip-token-check'], options));
         if (jsonResult?.linked_account) {
             return { name: jsonResult.linked_account, isLinked: true };
         }
@@ -116,9 +122,10 @@ function getLinkedAccountFromProjectConfig(workspaceFolderPath) {
     }
     return undefined;
 }
-function getAccounts() {
+async function getAccounts() {
     try {
-        const jsonResult = tryParseJson(runGhMulti(['list', '--json']));
+        const jsonResult = await queryDaemon('list')
+            ?? tryParseJson(runGhMulti(['list', '--json']));
         if (jsonResult?.accounts?.length) {
             return jsonResult.accounts
                 .map(account => account.name?.trim())
@@ -227,7 +234,7 @@ async function addAccountFlow() {
     }
 }
 async function switchAccountFlow() {
-    const accounts = getAccounts();
+    const accounts = await getAccounts();
     if (accounts.length === 0) {
         vscode.window.showWarningMessage('No ghmulti accounts found. Add one first.');
         return;
@@ -260,7 +267,7 @@ async function linkAccountInFolder(workspaceFolder, preferredAccountName) {
         vscode.window.showWarningMessage(`'${workspaceFolder.name}' is not a git repository.`);
         return;
     }
-    const accounts = getAccounts();
+    const accounts = await getAccounts();
     if (accounts.length === 0) {
         vscode.window.showWarningMessage('No ghmulti accounts found. Add one first.');
         return;
@@ -319,9 +326,16 @@ async function showStatus() {
     const workspaceFolder = await selectWorkspaceFolder('Select repository to show status', true);
     const options = workspaceFolder ? { cwd: workspaceFolder.uri.fsPath } : {};
     try {
-        const result = runGhMultiWithResult(['status', '--json', '--skip-token-check'], options);
-        const raw = result.stdout || result.stderr;
-        const parsed = tryParseJson(raw);
+        let raw = '';
+        let parsed = await queryDaemon('status', {
+            cwd: workspaceFolder?.uri.fsPath,
+            skip_token_check: true
+        });
+        if (!parsed) {
+            const result = runGhMultiWithResult(['status', '--json', '--skip-token-check'], options);
+            raw = result.stdout || result.stderr;
+            parsed = tryParseJson(raw);
+        }
         outputChannel.appendLine('=== ghmulti status ===');
         if (workspaceFolder) {
             outputChannel.appendLine(`Workspace: ${workspaceFolder.name} (${workspaceFolder.uri.fsPath})`);
@@ -358,10 +372,21 @@ async function showStatus() {
     }
 }
 async function runDoctor() {
+    const workspaceFolder = await selectWorkspaceFolder('Select repository to run doctor in', true);
+    const options = workspaceFolder ? { cwd: workspaceFolder.uri.fsPath } : {};
     try {
-        const result = runGhMultiWithResult(['doctor', '--json']);
-        const raw = result.stdout || result.stderr;
-        const parsed = tryParseJson(raw);
+        let raw = '';
+        let exitCode = 0;
+        let parsed = await queryDaemon('doctor', { cwd: workspaceFolder?.uri.fsPath });
+        if (parsed) {
+            exitCode = parsed.ok === false ? 1 : 0;
+        }
+        else {
+            const result = runGhMultiWithResult(['doctor', '--json'], options);
+            raw = result.stdout || result.stderr;
+            exitCode = result.exitCode;
+            parsed = tryParseJson(raw);
+        }
         outputChannel.appendLine('=== ghmulti doctor ===');
         if (parsed?.checks?.length) {
             for (const check of parsed.checks) {
@@ -381,7 +406,7 @@ async function runDoctor() {
         outputChannel.appendLine(raw || 'No doctor output was returned.');
         outputChannel.appendLine('');
         outputChannel.show(true);
-        if (result.exitCode === 0) {
+        if (exitCode === 0) {
             vscode.window.showInformationMessage('ghmulti doctor completed.');
         }
         else {
@@ -518,6 +543,53 @@ async function promptRequired(prompt) {
     }
     return trimmed;
 }
+function getDaemonSocketPath() {
+    const override = process.env.GHMULTI_SOCKET;
+    if (override) {
+        return override;
+    }
+    const runtimeDir = process.env.XDG_RUNTIME_DIR;
+    if (runtimeDir) {
+        return path.join(runtimeDir, 'ghmulti', 'daemon.sock');
+    }
+    const cacheHome = process.env.XDG_CACHE_HOME || path.join(os.homedir(), '.cache');
+    return path.join(cacheHome, 'ghmulti', 'daemon.sock');
+}
+// Ask a running `ghmulti serve` daemon; resolves undefined so callers can fall back to spawning the CLI.
+function queryDaemon(method, params = {}) {
+    const socketPath = getDaemonSocketPath();
+    if (process.platform === 'win32' || !fs.existsSync(socketPath)) {
+        return Promise.resolve(undefined);
+    }
+    return new Promise(resolve => {
+        let buffer = '';
+        let settled = false;
+        const client = net.createConnection(socketPath);
+        const finish = (value) => {
+            if (settled) {
+                return;
+            }
+            settled = true;
+            client.destroy();
+            resolve(value);
+        };
+        client.setTimeout(DAEMON_TIMEOUT_MS, () => finish(undefined));
+        client.on('connect', () => {
+            client.write(`${JSON.stringify({ jsonrpc: '2.0', id: 1, method, params })}\n`);
+        });
+        client.on('data', chunk => {
+            buffer += chunk.toString('utf8');
+            const newlineIndex = buffer.indexOf('\n');
+            if (newlineIndex < 0) {
+                return;
+            }
+            const response = tryParseJson(buffer.slice(0, newlineIndex));
+            finish(response && !response.error ? response.result : undefined);
+        });
+        client.on('error', () => finish(undefined));
+        client.on('close', () => finish(undefined));
+    });
+}
 function runGhMulti(args, options = {}) {
     const command = getGhMultiCommand();
     if (!command) {
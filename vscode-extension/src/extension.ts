@@ -1,5 +1,7 @@
 import * as cp from 'child_process';
 import * as fs from 'fs';
+import * as net from 'net';
+import * as os from 'os';
 import * as path from 'path';
 import * as vscode from 'vscode';
 
@@ -8,6 +10,8 @@ let outputChannel: vscode.OutputChannel;
 let cachedGhMultiCommand: GhmultiCommand | null | undefined;
 let isTestMode = false;
 
+const DAEMON_TIMEOUT_MS = 500;
+
 type GhmultiCommand = { executable: string; baseArgs: string[] };
 type GhmultiListResponse = { accounts?: Array<{ name?: string | null }> };
 type GhmultiStatusResponse = {
@@ -27,6 +31,10 @@ type GhmultiUnlinkResponse = {
     unlinked?: boolean;
     reset_local_git?: boolean;
 };
+type GhmultiRpcResponse<T> = {
+    result?: T;
+    error?: { code?: number; message?: string } | null;
+};
 type GhmultiRunResult = {
     stdout: string;
     stderr: string;
@@ -73,9 +81,9 @@ export function activate(context: vscode.ExtensionContext) {
 
 export function deactivate() {}
 
-function updateStatusBar(): void {
+async function updateStatusBar(): Promise<void> {
     const preferredFolder = getPreferredWorkspaceFolder();
-    const accountInfo = getActiveAccountInfo(preferredFolder?.uri.fsPath);
+    const accountInfo = await getActiveAccountInfo(preferredFolder?.uri.fsPath);
     if (!accountInfo) {
         statusBarItem.text = '$(account) ghmulti';
         statusBarItem.tooltip = 'ghmulti: no active account. Click to add, switch, or link an account.';
@@ -93,10 +101,13 @@ function updateStatusBar(): void {
     statusBarItem.show();
 }
 
-function getActiveAccountInfo(workspaceFolderPath?: string): ActiveAccountInfo | undefined {
+async function getActiveAccountInfo(workspaceFolderPath?: string): Promise<ActiveAccountInfo | undefined> {
     const options = workspaceFolderPath ? { cwd: workspaceFolderPath } : {};
     try {
-        const jsonResult = tryParseJson<GhmultiStatusResponse>(
+        const jsonResult = await queryDaemon<GhmultiStatusResponse>('status', {
+            cwd: workspaceFolderPath,
+            skip_token_check: true
+        }) ?? tryParseJson<GhmultiStatusResponse>(
             runGhMulti(['status', '--json', '--skip-token-check'], options)
         );
         if (jsonResult?.linked_account) {
@@ -159,9 +170,10 @@ function getLinkedAccountFromProjectConfig(workspaceFolderPath: string): string
     return undefined;
 }
 
-function getAccounts(): string[] {
+async function getAccounts(): Promise<string[]> {
     try {
-        const jsonResult = tryParseJson<GhmultiListResponse>(runGhMulti(['list', '--json']));
+        const jsonResult = await queryDaemon<GhmultiListResponse>('list')
+            ?? tryParseJson<GhmultiListResponse>(runGhMulti(['list', '--json']));
         if (jsonResult?.accounts?.length) {
             return jsonResult.accounts
                 .map(account => account.name?.trim())
@@ -282,7 +294,7 @@ async function addAccountFlow(): Promise<void> {
 }
 
 async function switchAccountFlow(): Promise<void> {
-    const accounts = getAccounts();
+    const accounts = await getAccounts();
     if (accounts.length === 0) {
         vscode.window.showWarningMessage('No ghmulti accounts found. Add one first.');
         return;
@@ -318,7 +330,7 @@ async function linkAccountInFolder(workspaceFolder: vscode.WorkspaceFolder, pref
         return;
     }
 
-    const accounts = getAccounts();
+    const accounts = await getAccounts();
     if (accounts.length === 0) {
         vscode.window.showWarningMessage('No ghmulti accounts found. Add one first.');
         return;
@@ -385,9 +397,16 @@ async function showStatus(): Promise<void> {
     const workspaceFolder = await selectWorkspaceFolder('Select repository to show status', true);
     const options = workspaceFolder ? { cwd: workspaceFolder.uri.fsPath } : {};
     try {
-        const result = runGhMultiWithResult(['status', '--json', '--skip-token-check'], options);
-        const raw = result.stdout || result.stderr;
-        const parsed = tryParseJson<GhmultiStatusResponse>(raw);
+        let raw = '';
+        let parsed = await queryDaemon<GhmultiStatusResponse>('status', {
+            cwd: workspaceFolder?.uri.fsPath,
+            skip_token_check: true
+        });
+        if (!parsed) {
+            const result = runGhMultiWithResult(['status', '--json', '--skip-token-check'], options);
+            raw = result.stdout || result.stderr;
+            parsed = tryParseJson<GhmultiStatusResponse>(raw);
+        }
 
         outputChannel.appendLine('=== ghmulti status ===');
         if (workspaceFolder) {
@@ -426,10 +445,20 @@ async function showStatus(): Promise<void> {
 }
 
 async function runDoctor(): Promise<void> {
+    const workspaceFolder = await selectWorkspaceFolder('Select repository to run doctor in', true);
+    const options = workspaceFolder ? { cwd: workspaceFolder.uri.fsPath } : {};
     try {
-        const result = runGhMultiWithResult(['doctor', '--json']);
-        const raw = result.stdout || result.stderr;
-        const parsed = tryParseJson<GhmultiDoctorResponse>(raw);
+        let raw = '';
+        let exitCode = 0;
+        let parsed = await queryDaemon<GhmultiDoctorResponse>('doctor', { cwd: workspaceFolder?.uri.fsPath });
+        if (parsed) {
+            exitCode = parsed.ok === false ? 1 : 0;
+        } else {
+            const result = runGhMultiWithResult(['doctor', '--json'], options);
+            raw = result.stdout || result.stderr;
+            exitCode = result.exitCode;
+            parsed = tryParseJson<GhmultiDoctorResponse>(raw);
+        }
 
         outputChannel.appendLine('=== ghmulti doctor ===');
         if (parsed?.checks?.length) {
@@ -450,7 +479,7 @@ async function runDoctor(): Promise<void> {
         outputChannel.appendLine(raw || 'No doctor output was returned.');
         outputChannel.appendLine('');
         outputChannel.show(true);
-        if (result.exitCode === 0) {
+        if (exitCode === 0) {
             vscode.window.showInformationMessage('ghmulti doctor completed.');
         } else {
             vscode.window.showWarningMessage('ghmulti doctor failed. See ghmulti output channel.');
@@ -616,6 +645,57 @@ async function promptRequired(prompt: string): Promise<string | undefined> {
     return trimmed;
 }
 
+function getDaemonSocketPath(): string {
+    const override = process.env.GHMULTI_SOCKET;
+    if (override) {
+        return override;
+    }
+    const runtimeDir = process.env.XDG_RUNTIME_DIR;
+    if (runtimeDir) {
+        return path.join(runtimeDir, 'ghmulti', 'daemon.sock');
+    }
+    const cacheHome = process.env.XDG_CACHE_HOME || path.join(os.homedir(), '.cache');
+    return path.join(cacheHome, 'ghmulti', 'daemon.sock');
+}
+
+// Ask a running `ghmulti serve` daemon; resolves undefined so callers can fall back to spawning the CLI.
+function queryDaemon<T>(method: string, params: Record<string, unknown> = {}): Promise<T | undefined> {
+    const socketPath = getDaemonSocketPath();
+    if (process.platform === 'win32' || !fs.existsSync(socketPath)) {
+        return Promise.resolve(undefined);
+    }
+
+    return new Promise(resolve => {
+        let buffer = '';
+        let settled = false;
+        const client = net.createConnection(socketPath);
+        const finish = (value: T | undefined) => {
+            if (settled) {
+                return;
+            }
+            settled = true;
+            client.destroy();
+            resolve(value);
+        };
+
+        client.setTimeout(DAEMON_TIMEOUT_MS, () => finish(undefined));
+        client.on('connect', () => {
+            client.write(`${JSON.stringify({ jsonrpc: '2.0', id: 1, method, params })}\n`);
+        });
+        client.on('data', chunk => {
+            buffer += chunk.toString('utf8');
+            const newlineIndex = buffer.indexOf('\n');
+            if (newlineIndex < 0) {
+                return;
+            }
+            const response = tryParseJson<GhmultiRpcResponse<T>>(buffer.slice(0, newlineIndex));
+            finish(response && !response.error ? response.result : undefined);
+        });
+        client.on('error', () => finish(undefined));
+        client.on('close', () => finish(undefined));
+    });
+}
+
 function runGhMulti(args: string[], options: cp.ExecFileSyncOptions = {}): string {
     const command = getGhMultiCommand();
     if (!command) {